@@ -0,0 +1,18 @@
+"""
+GoogleIt Benchmarks
+
+Benchmarks of the GoogleIt pipeline, run from the repository root as modules. The package lives in `src`, so install it
+first with `pip install -e .`, or put `src` on the path with `PYTHONPATH=src python -m benchmarks.e2e`.
+
+Usage:
+    - `python -m benchmarks.preprocess`: Throughput of `Preprocessor`, with and without its memo cache.
+    - `python -m benchmarks.e2e`: Latency of every pipeline stage, throughput and peak memory of whole queries, run
+      offline against local stand-ins.
+
+Stand-ins:
+    - `benchmarks.server.FakeWeb`: A local search engine and web of static pages, served through an HTTP proxy.
+    - `benchmarks.fakes.FakePalm2Model`, `benchmarks.fakes.FakeGeminiModel`: Models answering deterministically
+      without the genai API.
+
+Each benchmark prints a JSON report to standard output.
+"""
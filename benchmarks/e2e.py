@@ -0,0 +1,263 @@
+"""
+End-to-End Benchmark
+
+Runs the whole `GoogleIt` pipeline offline, against the fake search engine and web of `benchmarks.server` and the fake
+models of `benchmarks.fakes`, and reports the latency of every stage, the throughput and the peak memory.
+
+Sources are read in "html" mode, since the "pdf" mode needs a browser, and text is preprocessed with a fixed list of
+stopwords and a regular expression tokenizer, so neither the network nor the NLTK data are needed.
+
+Scenarios:
+    - `single`: The queries are answered one after the other with `get`.
+    - `batch`: The queries are answered together with `get_many`.
+    - `concurrent`: `--users` threads share one `GoogleIt` instance and split the queries between them.
+    - `document`: Like `single`, with a generated PDF document of `--pdf-pages` pages passed to every `get`.
+    - `burst`: Every query is asked by `--users` threads at once, as when a topic trends, one query after the other.
+
+Usage:
+    Run from the repository root, with the package installed (`pip install -e .`) or with `PYTHONPATH=src`:
+    ```
+    python -m benchmarks.e2e
+    PYTHONPATH=src python -m benchmarks.e2e --scenario single
+    python -m benchmarks.e2e --scenario concurrent --users 8 --queries 40 --web-latency 0.05 --model-latency 0.5
+    python -m benchmarks.e2e --scenario single --slow-sites 0.05 --hedge 2
+    python -m benchmarks.e2e --scenario single --failing-sites 0.2 --queries 200
+    python -m benchmarks.e2e --scenario burst --users 16 --web-latency 0.05 --model-latency 0.5
+    ```
+
+The report holds, for each scenario, the settings, the number of queries answered and failed queries, the wall time,
+the queries per second, the requests served by the fake web and those answered with a paywall, the model calls, the
+counters of hedged fetches, of the domain health registry (see `GoogleIt.health`) and of the coalesced calls (see
+`GoogleIt.coalesce`), the peak resident memory of the process, and the count, mean, p50, p95, p99 and max duration in seconds of every stage (see `GoogleIt.instrumentation`).
+The `query` stage is the latency of a whole query. The peak memory is a high-water mark of the process, so run one
+scenario per process to compare it.
+"""
+
+
+import argparse
+import contextlib
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from GoogleIt.googleit import GoogleIt
+from GoogleIt.http_client import HttpClient
+from GoogleIt.instrumentation import StatsAggregator
+from GoogleIt.preprocessing import Preprocessor
+
+from benchmarks.fakes import FakeGeminiModel, FakePalm2Model
+from benchmarks.preprocess import build_corpus
+from benchmarks.server import FakeWeb
+
+
+SCENARIOS = ("single", "batch", "concurrent", "document", "burst")
+
+TOPICS = [
+    "photosynthesis", "chlorophyll", "carbon dioxide", "glucose", "green plants", "light energy", "oxygen",
+    "chemical energy", "plant cells", "the light-dependent reaction", "the Calvin cycle", "leaves", "red light",
+    "blue light", "bacteria", "life on Earth", "water in plants", "energy in cells", "Dr. Smith's research",
+    "rates of photosynthesis",
+]
+
+STOP_WORDS = frozenset(
+    "a about above after again against all am an and any are as at be because been before being below between both "
+    "but by can did do does doing down during each few for from further had has have having he her here hers him his "
+    "how i if in into is it its itself just me more most my no nor not now of off on once only or other our out over "
+    "own same she should so some such than that the their them then there these they this those through to too "
+    "under until up very was we were what when where which while who whom why will with you your".split()
+)
+
+_WORD = re.compile(r"\w+")
+
+
+class RegexPreprocessor(Preprocessor):
+    """A `Preprocessor` that splits words with a regular expression instead of `nltk.word_tokenize`."""
+
+    def tokenize(self, text: str) -> list[str]:
+        return _WORD.findall(text.lower())
+
+
+def build_queries(count: int) -> list[str]:
+    """Builds `count` questions about the topics of the corpus. Questions repeat after `2 * len(TOPICS)`."""
+    templates = ["How does {} work?", "Why is {} important?"]
+    questions = [template.format(topic) for template in templates for topic in TOPICS]
+    return [questions[index % len(questions)] for index in range(count)]
+
+
+def build_pdf(path: str, pages: int, paragraphs_per_page: int = 12) -> None:
+    """Writes a PDF document of `pages` pages of text from the corpus. Requires PyMuPDF, installed with pdf2docx."""
+    try:
+        import pymupdf
+    except ImportError:
+        # PyMuPDF before 1.24 only has the fitz name
+        import fitz as pymupdf
+
+    texts = build_corpus(pages * paragraphs_per_page, seed=pages)
+    document = pymupdf.open()
+    for page_number in range(pages):
+        page = document.new_page()
+        text = "\n\n".join(texts[page_number * paragraphs_per_page:(page_number + 1) * paragraphs_per_page])
+        page.insert_textbox(pymupdf.Rect(50, 50, 545, 790), text, fontsize=9)
+    document.save(path)
+    document.close()
+
+
+def peak_rss_megabytes() -> float | None:
+    """Returns the peak resident memory of the process in megabytes, or None where it is not available."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def run_scenario(scenario: str, google_it: GoogleIt, queries: list[str], urls_count: int, users: int,
+                 pdf_path: str | None) -> tuple[int, int, float]:
+    """Answers the queries as the scenario says and returns the number of answers, of failed queries and the wall time."""
+    def answer(query: str) -> str | Exception:
+        try:
+            return google_it.get(query, pdf_path=pdf_path, urls_count=urls_count)
+        except Exception as error:
+            return error
+
+    start = time.perf_counter()
+    if scenario == "batch":
+        answers = google_it.get_many(queries, urls_count=urls_count)
+    elif scenario == "concurrent":
+        with ThreadPoolExecutor(max_workers=users) as executor:
+            answers = list(executor.map(answer, queries))
+    elif scenario == "burst":
+        with ThreadPoolExecutor(max_workers=users) as executor:
+            answers = [response for query in queries for response in executor.map(answer, [query] * users)]
+    else:
+        answers = [answer(query) for query in queries]
+    elapsed = time.perf_counter() - start
+
+    return len(answers), sum(isinstance(response, Exception) for response in answers), elapsed
+
+
+def run(scenario: str, args: argparse.Namespace, workspace: str) -> dict:
+    """Runs a scenario on a fresh fake web, model and `GoogleIt` instance, and reports it."""
+    queries = build_queries(args.queries)
+    pdf_path = None
+    if scenario == "document":
+        pdf_path = os.path.join(workspace, f"document-{args.pdf_pages}.pdf")
+        if not os.path.exists(pdf_path):
+            build_pdf(pdf_path, args.pdf_pages)
+
+    model_class = FakeGeminiModel if args.model == "GeminiPro" else FakePalm2Model
+    model = model_class(latency=args.model_latency, strategy=args.generation)
+    stats = StatsAggregator()
+
+    with FakeWeb(sites=args.sites, paragraphs=args.paragraphs, latency=args.web_latency, slow_sites=args.slow_sites,
+                 slow_latency=args.slow_latency, failing_sites=args.failing_sites) as web:
+        google_it = GoogleIt(
+            api_key="unused",
+            model=model,
+            extraction="html",
+            workspace_root=workspace,
+            preprocessor=RegexPreprocessor(stop_words=STOP_WORDS),
+            http_client=HttpClient(proxy=web.proxy_url, retries=0),
+            search_url=web.search_url,
+            hooks=[stats],
+            hedge=args.hedge,
+        )
+
+        # Warm-up queries are left out of the report
+        run_scenario(scenario, google_it, build_queries(args.warmup), args.urls, args.users, pdf_path)
+        stats.reset()
+        web.requests = web.failed_requests = model.calls = 0
+        warmup_hedging = google_it.hedge_stats()
+        warmup_health = google_it.domain_health.stats()
+        warmup_coalescing = google_it.single_flight.stats()
+
+        answered, errors, elapsed = run_scenario(scenario, google_it, queries, args.urls, args.users, pdf_path)
+        google_it.http_client.close()
+
+    hedging = {key: value - warmup_hedging[key] for key, value in google_it.hedge_stats().items() if key != "win_rate"}
+    hedging["win_rate"] = hedging["fetches_won_by_hedges"] / hedging["fetches"] if hedging["fetches"] else 0.0
+    health = {key: value - warmup_health[key] if key != "open" else value
+              for key, value in google_it.domain_health.stats().items()}
+    coalescing = {key: value - warmup_coalescing[key]
+                  for key, value in google_it.single_flight.stats().items() if key != "shared_rate"}
+    callers = coalescing["calls"] + coalescing["shared"]
+    coalescing["shared_rate"] = coalescing["shared"] / callers if callers else 0.0
+
+    return {
+        "scenario": scenario,
+        "settings": {
+            "queries": len(queries), "users": args.users if scenario in ("concurrent", "burst") else 1, "urls": args.urls,
+            "pdf_pages": args.pdf_pages if scenario == "document" else 0, "paragraphs": args.paragraphs,
+            "model": args.model, "generation": args.generation, "model_latency": args.model_latency,
+            "web_latency": args.web_latency, "slow_sites": args.slow_sites, "slow_latency": args.slow_latency,
+            "hedge": args.hedge, "failing_sites": args.failing_sites,
+        },
+        "answered": answered,
+        "errors": errors,
+        "seconds": round(elapsed, 4),
+        "queries_per_second": round(answered / elapsed, 3) if elapsed else None,
+        "web_requests": web.requests,
+        "failed_requests": web.failed_requests,
+        "model_calls": model.calls,
+        "hedging": hedging,
+        "domain_health": health,
+        "coalescing": coalescing,
+        "peak_rss_mb": peak_rss_megabytes(),
+        "stages": {
+            name: {key: round(value, 6) if isinstance(value, float) else value for key, value in summary.items()}
+            for name, summary in stats.report().items()
+        },
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scenario", choices=SCENARIOS + ("all",), default="all",
+                        help="The scenario to run (default: all of them, one after the other).")
+    parser.add_argument("--queries", type=int, default=20, help="The number of queries (default: 20).")
+    parser.add_argument("--warmup", type=int, default=2, help="The number of unmeasured queries first (default: 2).")
+    parser.add_argument("--users", type=int, default=4, help="The threads of the concurrent and burst scenarios (default: 4).")
+    parser.add_argument("--urls", type=int, default=5, help="The sources read per query (default: 5).")
+    parser.add_argument("--sites", type=int, default=200, help="The number of fake sites (default: 200).")
+    parser.add_argument("--paragraphs", type=int, default=40, help="The paragraphs of every page (default: 40).")
+    parser.add_argument("--pdf-pages", type=int, default=20,
+                        help="The pages of the PDF document of the document scenario (default: 20).")
+    parser.add_argument("--model", choices=("Palm2", "GeminiPro"), default="Palm2",
+                        help="The model to fake (default: Palm2).")
+    parser.add_argument("--generation", choices=("redraft", "single", "auto"), default="redraft",
+                        help="The generation strategy (default: redraft).")
+    parser.add_argument("--model-latency", type=float, default=0.0,
+                        help="The seconds every model call takes (default: 0).")
+    parser.add_argument("--web-latency", type=float, default=0.0,
+                        help="The seconds every search and page request takes (default: 0).")
+    parser.add_argument("--slow-sites", type=float, default=0.0,
+                        help="The share of sites that answer after --slow-latency (default: 0).")
+    parser.add_argument("--slow-latency", type=float, default=2.0,
+                        help="The seconds every page of a slow site takes (default: 2).")
+    parser.add_argument("--failing-sites", type=float, default=0.0,
+                        help="The share of sites that serve a paywall page instead of their article (default: 0).")
+    parser.add_argument("--hedge", type=int, default=0,
+                        help="The extra sources read per query, of which the slowest are dropped (default: 0).")
+    args = parser.parse_args(argv)
+
+    # pdf2docx logs every page it converts
+    logging.disable(logging.INFO)
+    scenarios = SCENARIOS if args.scenario == "all" else (args.scenario,)
+    # Libraries print notices to standard output, which is reserved for the report
+    with tempfile.TemporaryDirectory(prefix="googleit-bench-") as workspace, contextlib.redirect_stdout(sys.stderr):
+        report = [run(scenario, args, workspace) for scenario in scenarios]
+
+    json.dump(report if len(report) > 1 else report[0], sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Fake Language Models
+
+Stand-ins for `Palm2Model` and `GeminiModel` that answer without the genai API, for benchmarks and offline runs.
+
+The fakes keep everything of the wrappers except the remote call: prompts, generation strategies, response caches and
+spans work as usual. An answer is built from the prompt alone, by repeating the question and the first words of the
+passage, so the same prompt always gets the same answer, and a redraft returns the passage it was given. An optional
+latency simulates the time of a remote call.
+
+Usage:
+    ```python
+    from benchmarks.fakes import FakePalm2Model
+
+    google_it = GoogleIt(api_key="unused", model=FakePalm2Model(latency=0.5))
+    ```
+
+Classes:
+    - `FakePalm2Model(latency: float = 0.0, answer_words: int = 60, cache: ResponseCache | None = None, strategy: str = "redraft")`
+    - `FakeGeminiModel(latency: float = 0.0, answer_words: int = 60, cache: ResponseCache | None = None, strategy: str = "redraft")`
+"""
+
+
+import asyncio
+import re
+import threading
+import time
+from types import SimpleNamespace
+from typing import Iterator
+
+from GoogleIt.models import GeminiModel, Palm2Model, ResponseCache, response_cache_key
+
+
+_PROMPT = re.compile(r"QUESTION: '(.*?)'\s*PASSAGE: '(.*)'\s*ANSWER:", re.DOTALL)
+
+
+class _FakeBackend:
+    """
+    Replaces the remote calls of a model wrapper with a deterministic local answer.
+
+    Attributes:
+        latency: The time in seconds every call takes.
+        answer_words: The maximum number of words of the passage repeated in an answer.
+        calls: The number of calls that were not answered from the response cache.
+    """
+
+    def __init__(self, latency: float = 0.0, answer_words: int = 60, cache: ResponseCache | None = None,
+                 strategy: str = "redraft") -> None:
+        """
+        Initializes the fake model.
+
+        Parameters:
+            latency (float): The time in seconds every call takes (default is 0).
+            answer_words (int): The maximum number of words of the passage repeated in an answer (default is 60).
+            cache (ResponseCache | None): A cache of generated responses (optional).
+            strategy (str): The generation strategy, one of "redraft", "single" or "auto" (default is "redraft").
+        """
+        super().__init__(cache=cache, strategy=strategy)
+        self.latency = latency
+        self.answer_words = answer_words
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def init(self, api_key: str) -> None:
+        """Stands in for the remote model. The API key is ignored."""
+        self.model = SimpleNamespace(name="models/fake-text", model_name="fake-pro")
+
+    def complete(self, prompt: str) -> str:
+        """Returns the answer to a prompt: the passage itself for a redraft, otherwise the question and the passage."""
+        match = _PROMPT.search(prompt)
+        if match is None:
+            return " ".join(prompt.split()[:self.answer_words])
+
+        question, passage = match.group(1).strip(), " ".join(match.group(2).split()[:self.answer_words])
+        if prompt.startswith("The following passage"):
+            return passage
+        return f"{question} {passage}".strip()
+
+    def _generate(self, prompt: str) -> str:
+        key, cached = self._lookup(prompt)
+        if cached is not None:
+            return cached
+
+        time.sleep(self.latency)
+        return self._answer(key, prompt)
+
+    async def _agenerate(self, prompt: str) -> str:
+        key, cached = self._lookup(prompt)
+        if cached is not None:
+            return cached
+
+        await asyncio.sleep(self.latency)
+        return self._answer(key, prompt)
+
+    def _stream(self, prompt: str) -> Iterator[str]:
+        response = self._generate(prompt)
+        for position, word in enumerate(response.split(" ")):
+            yield word if position == 0 else " " + word
+
+    def _lookup(self, prompt: str) -> tuple[str, str | None]:
+        key = response_cache_key(self.model.name, prompt, self._generation_config())
+        return key, self.cache.get(key) if self.cache is not None else None
+
+    def _answer(self, key: str, prompt: str) -> str:
+        with self._lock:
+            self.calls += 1
+        response = self.complete(prompt)
+        if self.cache is not None:
+            self.cache.set(key, response)
+        return response
+
+
+class FakePalm2Model(_FakeBackend, Palm2Model):
+    """A `Palm2Model` answering locally. See `_FakeBackend`."""
+
+
+class FakeGeminiModel(_FakeBackend, GeminiModel):
+    """A `GeminiModel` answering locally, with the context budget of Gemini. See `_FakeBackend`."""
@@ -0,0 +1,102 @@
+"""
+Preprocessing Benchmark
+
+Measures the throughput of `Preprocessor`, which runs `nltk.word_tokenize` exactly like `GoogleIt.preprocess_text` did
+before `Preprocessor` existed, with its memo cache disabled and with every text of the corpus already cached, as when
+several queries read the same pages. The NLTK stopwords and Punkt data must be installed, or downloadable.
+
+Usage:
+    Run from the repository root, with the package installed (`pip install -e .`) or with `PYTHONPATH=src`:
+    ```
+    python -m benchmarks.preprocess
+    python -m benchmarks.preprocess --corpus paragraphs.txt --repeat 5
+    ```
+
+The report lists, for each configuration, the texts and megabytes processed per second.
+"""
+
+
+import argparse
+import json
+import random
+import sys
+import time
+
+from GoogleIt.preprocessing import Preprocessor
+
+
+PARAGRAPHS = [
+    "Photosynthesis is the process by which green plants (and some bacteria) convert light energy into chemical energy.",
+    "During this process, carbon dioxide and water are converted into glucose and oxygen; it's essential for life on Earth!",
+    "Scientists in the U.S. and Europe measured rates 3.5 times higher in 2023 -- a surprising result, wasn't it?",
+    "\"Chlorophyll absorbs mostly blue and red light,\" said Dr. Smith. The reaction happens in two stages: light-dependent and light-independent.",
+    "I can't say; you don't know. We'll see, they're sure, and I'd guess we've won. Cannot, gonna, wanna, gotta, lemme, gimme.",
+    "Prices rose 1,000 percent (from $2.50 to $25.00) between Jan. 3 and Feb. 14, e.g. in St. Louis and Washington, D.C.",
+    "The 'quoted' words and “smart quotes” – plus «guillemets» — and `backticks` appear in scraped pages... Really?!",
+    "Chapter 2. The second chapter starts here. Section 4.1 covers e-mail, URLs like https://example.com/a?b=c, and 10:30 a.m.",
+    "O'Neill's rock'n'roll band played 'til dawn, y'all; more'n enough for Mr. and Mrs. Jones, Inc. & Co. Ltd.",
+    "A. B. Smith wrote vol. 3, p. 12. Item a. comes before item b. and both are listed.\nNew line here.\n\nNew paragraph.",
+]
+
+
+def build_corpus(size: int, seed: int = 0) -> list[str]:
+    """Builds a corpus of `size` texts made of shuffled sentences of `PARAGRAPHS`, like the chunks of a scraped page."""
+    rng = random.Random(seed)
+    sentences = [sentence for paragraph in PARAGRAPHS for sentence in paragraph.split(". ")]
+
+    corpus = list(PARAGRAPHS)
+    while len(corpus) < size:
+        picked = rng.sample(sentences, rng.randint(1, 8))
+        corpus.append(". ".join(picked))
+
+    return corpus[:size]
+
+
+def measure(preprocessor: Preprocessor, corpus: list[str], repeat: int) -> dict:
+    """Preprocesses the corpus `repeat` times and returns the throughput."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        preprocessor.preprocess_many(corpus)
+    elapsed = time.perf_counter() - start
+
+    megabytes = sum(len(text.encode("utf-8")) for text in corpus) * repeat / 1e6
+    return {
+        "seconds": round(elapsed, 4),
+        "texts_per_second": round(len(corpus) * repeat / elapsed, 1),
+        "megabytes_per_second": round(megabytes / elapsed, 3),
+    }
+
+
+def run(corpus: list[str], repeat: int) -> dict:
+    """Measures the throughput of the pipeline on the corpus, without and with its memo cache."""
+    uncached = Preprocessor(cache_size=0)
+    cached = Preprocessor(stop_words=uncached.stop_words, cache_size=len(corpus))
+
+    cached.preprocess_many(corpus)
+
+    return {
+        "texts": len(corpus),
+        "preprocessor": measure(uncached, corpus, repeat),
+        "preprocessor_cached": measure(cached, corpus, repeat),
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--corpus", help="A text file with one text per line (default: a generated corpus).")
+    parser.add_argument("--size", type=int, default=2000, help="The size of the generated corpus (default: 2000).")
+    parser.add_argument("--repeat", type=int, default=3, help="The number of passes over the corpus (default: 3).")
+    args = parser.parse_args(argv)
+
+    if args.corpus:
+        with open(args.corpus, encoding="utf-8") as file:
+            corpus = [line.strip() for line in file if line.strip()]
+    else:
+        corpus = build_corpus(args.size)
+
+    json.dump(run(corpus, args.repeat), sys.stdout, indent=2)
+    print()
+
+
+if __name__ == "__main__":
+    main()
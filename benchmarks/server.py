@@ -0,0 +1,215 @@
+"""
+Fake Search Engine and Web
+
+A local HTTP server standing in for Google search and the pages it finds, for benchmarks and offline runs.
+
+The server is an HTTP proxy: `GoogleIt` sends every request through it with `HttpClient(proxy=web.proxy_url)`, and the
+server answers for two kinds of hosts, none of which exist on the network:
+    - `search.test`: a result page in the format of Google, with "/url?q=" links to `sites` fake sites. The results of
+      a query are picked from a hash of the query, so a query always finds the same sites and different queries
+      share some.
+    - `www.site-<n>.test`: a static article of `paragraphs` paragraphs, with a menu and a footer to strip. The text is
+      built from the sentences of `benchmarks.preprocess.PARAGRAPHS` and only depends on `n`. A share of the sites,
+      set by `failing_sites`, serve a short paywall page instead.
+
+Usage:
+    ```python
+    from benchmarks.server import FakeWeb
+
+    with FakeWeb(latency=0.05) as web:
+        google_it = GoogleIt(api_key="unused", model=FakePalm2Model(), extraction="html",
+                             http_client=HttpClient(proxy=web.proxy_url), search_url=web.search_url)
+        print(google_it.get("How does photosynthesis work?"))
+    ```
+
+Classes:
+    - `FakeWeb(sites: int = 200, paragraphs: int = 40, latency: float = 0.0, slow_sites: float = 0.0, slow_latency: float = 2.0, failing_sites: float = 0.0)`:
+        - Methods:
+            - `start(self) -> FakeWeb`: Starts serving on a free port of 127.0.0.1, in a background thread.
+            - `stop(self) -> None`: Stops the server.
+            - `page(self, site: int) -> str`: Returns the HTML of a site.
+            - `search_page(self, query: str, num: int) -> str`: Returns the result page of a query.
+            - `is_slow(self, site: int) -> bool`: Whether a site answers after `slow_latency`.
+            - `is_failing(self, site: int) -> bool`: Whether a site serves a paywall page.
+"""
+
+
+import hashlib
+import html
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from benchmarks.preprocess import build_corpus
+
+
+SEARCH_HOST = "search.test"
+
+
+class FakeWeb:
+    """
+    A local search engine and web of static pages, served through an HTTP proxy.
+
+    Attributes:
+        sites: The number of fake sites.
+        paragraphs: The number of paragraphs of every page.
+        latency: The time in seconds every response is delayed by.
+        slow_sites: The share of sites that answer after `slow_latency` instead of `latency`.
+        slow_latency: The time in seconds the pages of slow sites are delayed by.
+        failing_sites: The share of sites that serve a paywall page instead of their article.
+        requests: The number of requests served.
+        failed_requests: The number of requests answered with a paywall page.
+        proxy_url: The URL of the proxy, set by `start`.
+        search_url: The search URL template to pass to `GoogleIt`.
+    """
+
+    def __init__(self, sites: int = 200, paragraphs: int = 40, latency: float = 0.0, slow_sites: float = 0.0,
+                 slow_latency: float = 2.0, failing_sites: float = 0.0) -> None:
+        """
+        Initializes the server. Call `start`, or use it as a context manager, to serve.
+
+        Parameters:
+            sites (int): The number of fake sites (default is 200).
+            paragraphs (int): The number of paragraphs of every page (default is 40).
+            latency (float): The time in seconds every response is delayed by (default is 0).
+            slow_sites (float): The share of sites, picked from a hash of their number, that answer after
+                `slow_latency`, like the few slow sites that set the tail latency of real queries (default is 0).
+            slow_latency (float): The time in seconds the pages of slow sites are delayed by (default is 2).
+            failing_sites (float): The share of sites, picked from a hash of their number, that serve a short paywall
+                page instead of their article, like the sources a query reads without getting any content (default is 0).
+        """
+        self.sites = sites
+        self.paragraphs = paragraphs
+        self.latency = latency
+        self.slow_sites = slow_sites
+        self.slow_latency = slow_latency
+        self.failing_sites = failing_sites
+        self.requests = 0
+        self.failed_requests = 0
+        self.proxy_url = None
+        self.search_url = f"http://{SEARCH_HOST}/search?q={{query}}&num={{num}}"
+        self._server = None
+        self._lock = threading.Lock()
+        self._pages: dict[int, str] = {}
+
+    def start(self) -> "FakeWeb":
+        """Starts serving on a free port of 127.0.0.1, in a background thread."""
+        handler = type("Handler", (_Handler,), {"web": self})
+        self._server = _Server(("127.0.0.1", 0), handler)
+        self._server.daemon_threads = True
+        self.proxy_url = f"http://127.0.0.1:{self._server.server_address[1]}"
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeWeb":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def search_page(self, query: str, num: int) -> str:
+        """Returns the result page of a query, with `num` results picked from a hash of the query."""
+        seed = int(hashlib.sha1(query.lower().encode("utf-8")).hexdigest()[:8], 16)
+        picked = random.Random(seed).sample(range(self.sites), min(num, self.sites))
+
+        results = "\n".join(
+            f'<div class="g"><a href="/url?q=http://www.site-{site}.test/article&amp;sa=U&amp;ved={site}">'
+            f"<h3>Result {site}</h3></a></div>"
+            for site in picked
+        )
+        return (f"<html><head><title>{html.escape(query)} - Search</title></head><body>"
+                f'<a href="/webhp">Home</a>{results}</body></html>')
+
+    def page(self, site: int) -> str:
+        """Returns the HTML of a site. Pages are built on first use and kept."""
+        cached = self._pages.get(site)
+        if cached is not None:
+            return cached
+
+        texts = build_corpus(self.paragraphs, seed=site)
+        random.Random(site).shuffle(texts)
+
+        body = "\n".join(f"<p>{html.escape(text)}</p>" for text in texts)
+        page = (f"<html><head><title>Site {site}</title><script>var site = {site};</script></head><body>"
+                f'<nav><a href="/">Home</a> <a href="/about">About</a></nav>'
+                f"<article><h1>Article {site}</h1>{body}</article>"
+                f"<footer><p>Copyright site {site}. All rights reserved, no part may be copied.</p></footer>"
+                f"</body></html>")
+        self._pages[site] = page
+        return page
+
+    def respond(self, url: str) -> tuple[int, str]:
+        """Returns the status and HTML of a requested URL."""
+        with self._lock:
+            self.requests += 1
+
+        parts = urlsplit(url)
+        host = parts.hostname or ""
+        site = host[len("www.site-"):-len(".test")] if host.startswith("www.site-") and host.endswith(".test") else ""
+        site = int(site) if site.isdigit() and int(site) < self.sites else None
+
+        latency = self.slow_latency if site is not None and self.is_slow(site) else self.latency
+        if latency:
+            time.sleep(latency)
+
+        if host == SEARCH_HOST and parts.path == "/search":
+            query = parse_qs(parts.query)
+            return 200, self.search_page(query.get("q", [""])[0], int(query.get("num", ["10"])[0]))
+
+        if site is not None and self.is_failing(site):
+            with self._lock:
+                self.failed_requests += 1
+            return 200, (f"<html><head><title>Site {site}</title></head><body>"
+                         f"<p>Subscribe to keep reading this article.</p></body></html>")
+
+        if site is not None:
+            return 200, self.page(site)
+
+        return 404, "<html><body><p>Not found.</p></body></html>"
+
+    def is_slow(self, site: int) -> bool:
+        """Whether a site answers after `slow_latency`."""
+        return random.Random(f"slow-{site}").random() < self.slow_sites
+
+    def is_failing(self, site: int) -> bool:
+        """Whether a site serves a paywall page."""
+        return random.Random(f"failing-{site}").random() < self.failing_sites
+
+
+class _Server(ThreadingHTTPServer):
+    """Drops connections that clients close early, such as the requests of sources cancelled by a hedged fetch."""
+
+    def handle_error(self, request, client_address) -> None:
+        if not isinstance(sys.exc_info()[1], ConnectionError):
+            super().handle_error(request, client_address)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """Answers proxied requests, whose path is the absolute URL, and direct ones, using the Host header."""
+
+    protocol_version = "HTTP/1.1"
+    web: FakeWeb
+
+    def do_GET(self) -> None:
+        url = self.path if self.path.startswith("http") else f"http://{self.headers.get('Host', '')}{self.path}"
+        status, text = self.web.respond(url)
+        body = text.encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args) -> None:
+        pass
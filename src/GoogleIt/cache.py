@@ -0,0 +1,454 @@
+"""
+GoogleIt Cache Module
+
+This module provides caches that let `GoogleIt` skip work it has already done for earlier queries.
+
+Usage:
+    - Import the module: `from GoogleIt.cache import ContentCache, SearchCache`
+    - Pass a cache instance to `GoogleIt`.
+
+Example:
+    ```python
+    cache = ContentCache(ttl=6 * 3600, max_bytes=64 * 1024 * 1024, directory=".googleit-cache")
+    google_it = GoogleIt(api_key='your_api_key_here', content_cache=cache, search_cache=SearchCache(ttl=600))
+    google_it.get(query="How does photosynthesis work?")
+    print(cache.stats())
+    ```
+
+Functions:
+    - `normalize_query(query: str) -> str`:
+        Normalizes a search query so that queries differing only in case, punctuation or spacing share a cache key.
+
+Classes:
+    - `CacheEntry`:
+        - A cached value with the time it was stored, its time to live and the HTTP validators of its source.
+    - `ContentCache(ttl: float = 3600, max_bytes: int = 32 MiB, directory: str | None = None, max_disk_bytes: int = 256 MiB)`:
+        - Caches the extracted paragraphs of each source URL, so cache hits skip the browser, PDF and DOCX pipeline.
+        - Entries are keyed by URL and extraction mode, since each mode extracts different paragraphs from a page.
+        - Entries expire after `ttl` seconds. Expired entries that carry an ETag or Last-Modified header are
+          revalidated with a conditional request instead of being fetched again.
+        - Least recently used entries are evicted once the cache grows past `max_bytes` in memory or
+          `max_disk_bytes` on disk.
+        - Methods:
+            - `lookup(self, url: str, mode: str = "") -> CacheEntry | None`: Returns the entry of a URL, fresh or expired, and counts a hit or a miss.
+            - `store(self, url: str, paragraphs: list[str], etag: str | None = None, last_modified: str | None = None, mode: str = "") -> None`: Stores the paragraphs of a URL.
+            - `revalidated(self, url: str, mode: str = "") -> CacheEntry | None`: Marks an expired entry as fresh again after its source answered 304 Not Modified.
+            - `stats(self) -> dict`: Returns the hit, miss, revalidation and eviction counters.
+    - `SearchCache(ttl: float = 900, max_bytes: int = 4 MiB, directory: str | None = None, max_disk_bytes: int = 32 MiB)`:
+        - Caches the URLs and domains found for each (normalized query, urls_count) pair, so repeated and
+          near-duplicate queries skip the search request and the parse of the result page.
+        - Methods:
+            - `get(self, query: str, urls_count: int) -> tuple[list[str], list[str]] | None`: Returns the cached search results and counts a hit or a miss.
+            - `put(self, query: str, urls_count: int, urls: list[str], domains: list[str]) -> None`: Stores the search results of a query.
+            - `stats(self) -> dict`: Returns the hit, miss and eviction counters.
+
+Note:
+    Every cache is thread-safe, so one instance can be shared by concurrent requests and by several `GoogleIt` instances.
+"""
+
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+
+
+# A directory over its budget is trimmed to this share of it, so that the next writes do not trim it again
+_DISK_TRIM_RATIO = 0.9
+
+
+def normalize_query(query: str) -> str:
+    """
+    Normalizes a search query for use as a cache key.
+
+    The query is case folded, sentence punctuation and quotes are dropped and runs of whitespace are collapsed,
+    so that "How does photosynthesis work?" and "how does  photosynthesis work" share a key. Symbols that change
+    the meaning of a search, such as the ones in "C++" and "C#" or a decimal point, are kept.
+
+    Parameters:
+        query (str): The search query.
+
+    Returns:
+        str: The normalized query.
+    """
+    query = re.sub("['\u2019`]", "", query.casefold())
+    query = re.sub(r"[?!,;:\"()\[\]{}]|(?<!\d)\.|\.(?!\d)", " ", query)
+    return " ".join(query.split())
+
+
+class CacheEntry:
+    """
+    A cached value together with its freshness information.
+
+    Attributes:
+        value: The cached value. It must be JSON serializable to be persisted on disk.
+        stored_at: The UNIX time at which the value was stored or last revalidated.
+        ttl: The number of seconds the value stays fresh.
+        etag: The ETag header of the source, if any.
+        last_modified: The Last-Modified header of the source, if any.
+    """
+
+    def __init__(self, value, ttl: float, stored_at: float | None = None,
+                 etag: str | None = None, last_modified: str | None = None) -> None:
+        self.value = value
+        self.ttl = ttl
+        self.stored_at = time.time() if stored_at is None else stored_at
+        self.etag = etag
+        self.last_modified = last_modified
+
+    @property
+    def fresh(self) -> bool:
+        """Whether the entry is younger than its time to live."""
+        return time.time() - self.stored_at < self.ttl
+
+    def validators(self) -> dict:
+        """The conditional request headers that revalidate the entry with its source."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def to_dict(self) -> dict:
+        return {
+            "value": self.value,
+            "ttl": self.ttl,
+            "stored_at": self.stored_at,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "CacheEntry":
+        return cls(**data)
+
+
+class _LRUStore:
+    """
+    A thread-safe least recently used map of `CacheEntry` objects with a memory budget in bytes.
+
+    When a directory is given, every entry is also written there as a JSON file, so the cache survives restarts.
+    Entries missing from memory are loaded back from disk on access, and the least recently used files are
+    removed once the directory grows past its own budget. The size of the directory is measured once, then kept
+    up to date on every write, so the directory is only scanned again when it has to be trimmed.
+    """
+
+    def __init__(self, max_bytes: int, directory: str | None = None, max_disk_bytes: int | None = None) -> None:
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()
+        self._sizes: dict = {}
+        self._size = 0
+        self._lock = threading.Lock()
+        # The bytes of the entry files, measured on the first write
+        self._disk_size = None
+        self._disk_lock = threading.Lock()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._load(key)
+        if entry is not None:
+            self._remember(key, entry, self._encoded_size(entry))
+        return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        encoded = json.dumps(entry.to_dict())
+        self._remember(key, entry, len(encoded))
+
+        if self.directory is not None:
+            path = self._path(key)
+            temporary_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                file.write(encoded)
+            try:
+                replaced = os.path.getsize(path)
+            except OSError:
+                replaced = 0
+            os.replace(temporary_path, path)
+            self._grow_disk(len(encoded) - replaced)
+
+    def _remember(self, key: str, entry: CacheEntry, size: int) -> None:
+        with self._lock:
+            self._size -= self._sizes.pop(key, 0)
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._size += size
+
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                evicted, _ = self._entries.popitem(last=False)
+                self._size -= self._sizes.pop(evicted)
+                self.evictions += 1
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def _load(self, key: str) -> CacheEntry | None:
+        if self.directory is None:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as file:
+                entry = CacheEntry.from_dict(json.load(file))
+        except (OSError, ValueError, TypeError):
+            return None
+
+        # Mark the file as recently used for disk eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def _encoded_size(self, entry: CacheEntry) -> int:
+        return len(json.dumps(entry.to_dict()))
+
+    def _grow_disk(self, written: int) -> None:
+        """Adds the bytes of a write to the size of the directory, and trims the directory once it is over budget."""
+        if self.max_disk_bytes is None:
+            return
+
+        with self._disk_lock:
+            if self._disk_size is None:
+                self._trim_disk()
+            else:
+                self._disk_size += written
+                if self._disk_size > self.max_disk_bytes:
+                    self._trim_disk()
+
+    def _trim_disk(self) -> None:
+        """Measures the directory and removes its least recently used files down to `_DISK_TRIM_RATIO` of its budget."""
+        files = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".json"):
+                continue
+            try:
+                status = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            files.append((status.st_mtime, status.st_size, name))
+
+        total = sum(size for _, size, _ in files)
+        if total <= self.max_disk_bytes:
+            self._disk_size = total
+            return
+
+        for _, size, name in sorted(files):
+            if total <= self.max_disk_bytes * _DISK_TRIM_RATIO:
+                break
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            total -= size
+
+        self._disk_size = total
+
+
+class ContentCache:
+    """
+    Cache of the paragraphs extracted from each source URL.
+
+    Attributes:
+        ttl: The number of seconds an entry stays fresh.
+        hits: The number of lookups answered by a fresh entry.
+        misses: The number of lookups that found no entry or an expired one.
+        revalidations: The number of expired entries renewed after a 304 Not Modified response.
+    """
+
+    def __init__(self, ttl: float = 3600, max_bytes: int = 32 * 1024 * 1024, directory: str | None = None,
+                 max_disk_bytes: int = 256 * 1024 * 1024) -> None:
+        """
+        Initializes the cache.
+
+        Parameters:
+            ttl (float): The number of seconds an entry stays fresh (default is 3600).
+            max_bytes (int): The memory budget of the cache in bytes (default is 32 MiB).
+            directory (str | None): A directory to persist entries in, so they survive restarts (optional).
+            max_disk_bytes (int): The disk budget of the persisted entries in bytes (default is 256 MiB).
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.revalidations = 0
+        self._store = _LRUStore(max_bytes=max_bytes, directory=directory, max_disk_bytes=max_disk_bytes)
+        self._lock = threading.Lock()
+
+    def _key(self, url: str, mode: str) -> str:
+        return f"{mode}:{url}" if mode else url
+
+    def lookup(self, url: str, mode: str = "") -> CacheEntry | None:
+        """
+        Returns the entry of a URL, which may be expired, and counts a hit when it is fresh or a miss otherwise.
+
+        Parameters:
+            url (str): The source URL.
+            mode (str): The extraction mode the paragraphs were read with, such as "pdf" or "html" (default is "").
+
+        Returns:
+            CacheEntry | None: The entry, or None if the URL is not cached for this mode.
+        """
+        entry = self._store.get(self._key(url, mode))
+
+        with self._lock:
+            if entry is not None and entry.fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        return entry
+
+    def store(self, url: str, paragraphs: list[str], etag: str | None = None, last_modified: str | None = None,
+              mode: str = "") -> None:
+        """
+        Stores the paragraphs of a URL.
+
+        Parameters:
+            url (str): The source URL.
+            paragraphs (list[str]): The paragraphs extracted from the source.
+            etag (str | None): The ETag header of the response, if any.
+            last_modified (str | None): The Last-Modified header of the response, if any.
+            mode (str): The extraction mode the paragraphs were read with, such as "pdf" or "html" (default is "").
+        """
+        self._store.put(self._key(url, mode), CacheEntry(paragraphs, ttl=self.ttl, etag=etag, last_modified=last_modified))
+
+    def revalidated(self, url: str, mode: str = "") -> CacheEntry | None:
+        """
+        Marks the entry of a URL as fresh again, after its source answered 304 Not Modified.
+
+        Parameters:
+            url (str): The source URL.
+            mode (str): The extraction mode the paragraphs were read with, such as "pdf" or "html" (default is "").
+
+        Returns:
+            CacheEntry | None: The renewed entry, or None if it was evicted in the meantime.
+        """
+        key = self._key(url, mode)
+        entry = self._store.get(key)
+        if entry is None:
+            return None
+
+        renewed = CacheEntry(entry.value, ttl=self.ttl, etag=entry.etag, last_modified=entry.last_modified)
+        self._store.put(key, renewed)
+
+        with self._lock:
+            self.revalidations += 1
+
+        return renewed
+
+    def stats(self) -> dict:
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            dict: The hits, misses, revalidations, evictions and hit rate of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "revalidations": self.revalidations,
+                "evictions": self._store.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+class SearchCache:
+    """
+    Cache of the search results of each query.
+
+    Attributes:
+        ttl: The number of seconds an entry stays fresh.
+        hits: The number of lookups answered by a fresh entry.
+        misses: The number of lookups that found no entry or an expired one.
+    """
+
+    def __init__(self, ttl: float = 900, max_bytes: int = 4 * 1024 * 1024, directory: str | None = None,
+                 max_disk_bytes: int = 32 * 1024 * 1024) -> None:
+        """
+        Initializes the cache.
+
+        Parameters:
+            ttl (float): The number of seconds an entry stays fresh (default is 900).
+            max_bytes (int): The memory budget of the cache in bytes (default is 4 MiB).
+            directory (str | None): A directory to persist entries in, so they survive restarts (optional).
+            max_disk_bytes (int): The disk budget of the persisted entries in bytes (default is 32 MiB).
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._store = _LRUStore(max_bytes=max_bytes, directory=directory, max_disk_bytes=max_disk_bytes)
+        self._lock = threading.Lock()
+
+    def _key(self, query: str, urls_count: int) -> str:
+        return f"{urls_count}:{normalize_query(query)}"
+
+    def get(self, query: str, urls_count: int) -> tuple[list[str], list[str]] | None:
+        """
+        Returns the cached search results of a query and counts a hit or a miss.
+
+        Parameters:
+            query (str): The search query.
+            urls_count (int): The number of URLs requested.
+
+        Returns:
+            tuple[list[str], list[str]] | None: The URLs and domain names, or None if there is no fresh entry.
+        """
+        entry = self._store.get(self._key(query, urls_count))
+        fresh = entry is not None and entry.fresh
+
+        with self._lock:
+            if fresh:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+        if not fresh:
+            return None
+
+        urls, domains = entry.value
+        return list(urls), list(domains)
+
+    def put(self, query: str, urls_count: int, urls: list[str], domains: list[str]) -> None:
+        """
+        Stores the search results of a query.
+
+        Parameters:
+            query (str): The search query.
+            urls_count (int): The number of URLs requested.
+            urls (list[str]): The URLs found.
+            domains (list[str]): The domain name of each URL.
+        """
+        self._store.put(self._key(query, urls_count), CacheEntry([list(urls), list(domains)], ttl=self.ttl))
+
+    def stats(self) -> dict:
+        """
+        Returns the counters of the cache.
+
+        Returns:
+            dict: The hits, misses, evictions and hit rate of the cache.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self._store.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
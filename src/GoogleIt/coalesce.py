@@ -0,0 +1,217 @@
+"""
+GoogleIt Coalesce Module
+
+This module lets concurrent identical requests share one execution. When a topic trends, many users ask the same
+question within seconds: with single-flight coalescing, the first request runs the search, the page reads and the model
+calls, and the requests that arrive while it is in flight wait for it and receive its answer, or its exception.
+
+`GoogleIt` coalesces at two levels with a `SingleFlight`:
+    - `get` and `aget`: requests with the same normalized query (see `cache.normalize_query`), the same PDF document
+      content and the same `urls_count` share one pipeline execution.
+    - `read_source` and `aread_source`: concurrent reads of the same URL, whether from one batch of `get_many` or from
+      different queries, share one download or rendering. A shared read renders pages in a temporary workspace of its
+      own, so it never depends on the caller that started it.
+
+Only calls that overlap in time are coalesced: once a call returns, the next identical one runs again. Use the caches
+of the `cache` module to reuse finished work.
+
+When the call fails, each waiter raises a copy of its exception, chained to the original, so that waiters in different
+threads do not extend the traceback of one shared exception object.
+
+Usage:
+    - Import the module: `from GoogleIt.coalesce import SingleFlight`
+    - Pass a `SingleFlight` to `GoogleIt`, or let it create one.
+
+Example:
+    ```python
+    google_it = GoogleIt(api_key='your_api_key_here')
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        answers = list(executor.map(google_it.get, ["How does photosynthesis work?"] * 8))
+    print(google_it.single_flight.stats())  # {'calls': 6, 'shared': 7, ...}
+    ```
+
+Functions:
+    - `file_digest(path: str) -> str`:
+        Returns the SHA-256 digest of the content of a file.
+
+Classes:
+    - `SingleFlight()`:
+        - Runs one call per key at a time, and hands its outcome to every concurrent caller with the same key.
+        - Methods:
+            - `do(self, key: Hashable, function: Callable, *args, **kwargs)`: Calls `function`, or waits for the call in flight with the same key, and returns its result.
+            - `ado(self, key: Hashable, function: Callable[..., Awaitable], *args, **kwargs)`: Asynchronous version of `do`, for coroutine functions.
+            - `in_flight(self) -> int`: Returns the number of calls in flight.
+            - `stats(self) -> dict`: Returns the number of calls run and of callers that shared another call.
+
+Note:
+    A `SingleFlight` is thread-safe. Share one only between `GoogleIt` instances with the same model and settings,
+    since callers receive the result of whichever instance started the call. Async calls are coalesced per event loop.
+    `stream` is not coalesced, but its source reads are.
+"""
+
+
+import asyncio
+import hashlib
+import threading
+from typing import Awaitable, Callable, Hashable
+
+
+def file_digest(path: str) -> str:
+    """
+    Returns the SHA-256 digest of the content of a file, read in blocks of 1 MiB.
+
+    Parameters:
+        path (str): The path to the file.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _copy_error(error: BaseException) -> BaseException:
+    """
+    Returns a copy of an exception without its traceback, for one caller to raise. The copy is made without calling
+    `__init__`, whose signature may differ from the arguments of the exception; the original is returned when even
+    that fails.
+    """
+    try:
+        copied = type(error).__new__(type(error), *error.args)
+        copied.args = error.args
+        copied.__dict__.update(error.__dict__)
+    except Exception:
+        return error
+    return copied
+
+
+class _Call:
+    """A call in flight, with the outcome its waiters receive."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Runs one call per key at a time, and hands its outcome to every concurrent caller with the same key.
+
+    The first caller of a key runs the function in its own thread. Callers arriving while it runs block until it
+    finishes, then return its result or raise its exception. In async code, the call runs as a task that its callers
+    await together; it is cancelled only when all of them are.
+    """
+
+    def __init__(self) -> None:
+        """Initializes an empty set of calls in flight."""
+        self._calls: dict[Hashable, _Call] = {}
+        self._tasks: dict[tuple, list] = {}
+        self._stats = {"calls": 0, "shared": 0}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, function: Callable, *args, **kwargs):
+        """
+        Calls `function(*args, **kwargs)`, unless a call with the same key is in flight, in which case waits for it.
+
+        Parameters:
+            key (Hashable): The key identifying identical calls.
+            function (Callable): The function to call.
+            *args, **kwargs: The arguments of the function.
+
+        Returns:
+            The result of the call.
+
+        Raises:
+            Exception: The exception raised by the call, or a copy of it for callers that waited.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["calls"] += 1
+            else:
+                self._stats["shared"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise _copy_error(call.error) from call.error
+            return call.result
+
+        try:
+            call.result = function(*args, **kwargs)
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    async def ado(self, key: Hashable, function: Callable[..., Awaitable], *args, **kwargs):
+        """
+        Asynchronous version of `do`: awaits `function(*args, **kwargs)`, or the call in flight with the same key in
+        the running event loop.
+
+        Parameters:
+            key (Hashable): The key identifying identical calls.
+            function (Callable[..., Awaitable]): The coroutine function to call.
+            *args, **kwargs: The arguments of the function.
+
+        Returns:
+            The result of the call.
+
+        Raises:
+            Exception: A copy of the exception raised by the call.
+        """
+        task_key = (asyncio.get_running_loop(), key)
+
+        with self._lock:
+            entry = self._tasks.get(task_key)
+            if entry is None:
+                task = asyncio.ensure_future(function(*args, **kwargs))
+                entry = self._tasks[task_key] = [task, 0]
+                task.add_done_callback(lambda _: self._forget(task_key, entry))
+                self._stats["calls"] += 1
+            else:
+                self._stats["shared"] += 1
+            entry[1] += 1
+
+        task = entry[0]
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.done() and entry[1] == 1:
+                # The last caller gave up: nobody is waiting for the call anymore
+                task.cancel()
+            raise
+        except Exception as error:
+            raise _copy_error(error) from error
+        finally:
+            entry[1] -= 1
+
+    def in_flight(self) -> int:
+        """Returns the number of calls in flight."""
+        with self._lock:
+            return len(self._calls) + len(self._tasks)
+
+    def stats(self) -> dict:
+        """Returns the number of calls run, of callers that shared another call, and the share of callers that did."""
+        with self._lock:
+            stats = dict(self._stats)
+        total = stats["calls"] + stats["shared"]
+        stats["shared_rate"] = stats["shared"] / total if total else 0.0
+        return stats
+
+    def _forget(self, task_key: tuple, entry: list) -> None:
+        with self._lock:
+            if self._tasks.get(task_key) is entry:
+                del self._tasks[task_key]
@@ -0,0 +1,127 @@
+"""
+GoogleIt Context Module
+
+This module packs the chunks of the sources into the context sent to the language model, within a token budget.
+
+Instead of concatenating chunks and cutting the result at a fixed number of characters, `pack_context` estimates the
+tokens of every chunk, takes the chunks in order of relevance and keeps each one that still fits in the budget. The
+kept chunks are joined in their original order, so the context reads like the sources. A chunk larger than the whole
+budget is shortened at a sentence boundary rather than mid-sentence.
+
+`GoogleIt` ranks the chunks by their BM25 score for the query, from the `retrieval.ChunkIndex` of the chunks kept in
+its `index_cache`.
+
+Usage:
+    - Import the module: `from GoogleIt.context import pack_context`
+    - Call `pack_context` with the chunks, the token budget of the model and a relevance score per chunk, such as the
+      BM25 scores of a `retrieval.ChunkIndex`.
+
+Example:
+    ```python
+    scores = google_it.index_cache.get_or_build(chunks, google_it.preprocessor).scores(query)
+    context = pack_context(chunks, token_budget=google_it.context_tokens, scores=scores)
+    ```
+
+Functions:
+    - `estimate_tokens(text: str) -> int`:
+        Estimates the number of tokens of a text, at about four characters per token.
+    - `truncate_to_tokens(text: str, max_tokens: int) -> str`:
+        Shortens a text to at most `max_tokens` tokens, cutting at the last sentence or word boundary that fits.
+    - `pack_context(chunks: list[str], token_budget: int, scores: Sequence[float] | None = None, separator: str = " ") -> str`:
+        Joins the most relevant chunks that fit in `token_budget` tokens.
+"""
+
+
+from typing import Sequence
+
+
+CHARS_PER_TOKEN = 4
+
+_SENTENCE_ENDS = (". ", "! ", "? ", "\n")
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimates the number of tokens of a text.
+
+    The language models use subword tokenizers averaging about four characters of English text per token, which is
+    close enough to budget a prompt without the tokenizer itself.
+
+    Parameters:
+        text (str): The text to measure.
+
+    Returns:
+        int: The estimated number of tokens.
+    """
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """
+    Shortens a text to at most `max_tokens` estimated tokens.
+
+    The text is cut after the last sentence that fits, or at the last word boundary when not even one sentence fits.
+
+    Parameters:
+        text (str): The text to shorten.
+        max_tokens (int): The maximum number of tokens.
+
+    Returns:
+        str: The text, shortened if needed.
+    """
+    limit = max_tokens * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+
+    cut = text[:limit]
+    sentence_end = max(cut.rfind(end) for end in _SENTENCE_ENDS)
+    if sentence_end > 0:
+        return cut[:sentence_end + 1].rstrip()
+
+    word_end = cut.rfind(" ")
+    return cut[:word_end] if word_end > 0 else cut
+
+
+def pack_context(chunks: list[str], token_budget: int, scores: Sequence[float] | None = None,
+                 separator: str = " ") -> str:
+    """
+    Joins the most relevant chunks that fit in a token budget.
+
+    Chunks are considered from the highest score to the lowest (in their original order when `scores` is None), and
+    every chunk that still fits in the remaining budget is kept. Chunks larger than the whole budget are first
+    shortened with `truncate_to_tokens`. Empty chunks are skipped.
+
+    Parameters:
+        chunks (list[str]): The candidate chunks.
+        token_budget (int): The maximum number of estimated tokens of the context.
+        scores (Sequence[float] | None): The relevance score of each chunk (optional).
+        separator (str): The string placed between chunks (default is " ").
+
+    Returns:
+        str: The kept chunks, in their original order.
+    """
+    if scores is None:
+        order = range(len(chunks))
+    else:
+        order = sorted(range(len(chunks)), key=lambda index: scores[index], reverse=True)
+
+    separator_tokens = estimate_tokens(separator)
+    kept: dict[int, str] = {}
+    used = 0
+
+    for index in order:
+        chunk = chunks[index]
+        if not chunk.strip():
+            continue
+
+        if estimate_tokens(chunk) > token_budget:
+            chunk = truncate_to_tokens(chunk, token_budget)
+
+        cost = estimate_tokens(chunk) + (separator_tokens if kept else 0)
+        if used + cost > token_budget:
+            continue
+
+        kept[index] = chunk
+        used += cost
+
+    return separator.join(kept[index] for index in sorted(kept))
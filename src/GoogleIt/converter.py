@@ -3,6 +3,16 @@ GoogleIt Converter Module
 
 This module provides functionality to convert HTML files or websites into PDF format using Selenium.
 
+Pages are loaded with Chrome's "eager" page load strategy, which returns as soon as the DOM content has loaded. The
+requests the page still makes are then followed through the DevTools network events of the performance log, and the
+page is rendered once the network is idle (at most `MAX_INFLIGHT_REQUESTS` requests in flight for `idle_time`
+seconds), or when `timeout` expires, whichever comes first. Fast pages are rendered within milliseconds of settling.
+
+Requests the text of a page does not need are blocked with the DevTools command `Network.setBlockedURLs`, following
+a `BlockingPolicy`: by default images, fonts and media, and the domains of common ad and tracking networks. Blocked
+requests fail instantly instead of downloading, or hanging on a slow third party. `convert` returns the `PageStats`
+of the page, with the requests made, the bytes downloaded and the requests blocked.
+
 Usage:
     - Import the module: `from GoogleIt import converter`
     - Call the `convert` function with appropriate parameters.
@@ -12,18 +22,51 @@ Example:
     converter.convert(source='https://example.com', target='output.pdf', timeout=5)
     ```
 
+    Reusing warm browser sessions across conversions:
+    ```python
+    with converter.BrowserPool(size=3, max_pages=50) as pool:
+        converter.convert(source='https://example.com', target='output.pdf', pool=pool)
+    ```
+
+    Blocking stylesheets and an extra domain as well, and reading the statistics of the page:
+    ```python
+    policy = converter.BlockingPolicy(extensions=converter.BLOCKED_EXTENSIONS + ("css",),
+                                      domains=converter.BLOCKED_DOMAINS + ("cdn.example.net",))
+    stats = converter.convert(source='https://example.com', target='output.pdf', blocking=policy)
+    print(stats.blocked_requests, stats.estimated_bytes_saved)
+    ```
+
 Functions:
-    - `convert(source: str, target: str, timeout: int = 2, print_options: dict = {}) -> None`:
+    - `convert(source: str, target: str, timeout: int = 2, print_options: dict = {}, pool: BrowserPool | None = None, page_load_timeout: float | None = None, idle_time: float = 0.5, blocking: BlockingPolicy | None = None) -> PageStats`:
         Converts a given HTML file or website into PDF.
 
         Parameters:
             - `source` (str): Source HTML file or website link.
             - `target` (str): Target location to save the PDF.
-            - `timeout` (int, optional): Timeout in seconds. Default is set to 2 seconds.
+            - `timeout` (int, optional): Maximum time in seconds to wait for the network to go idle once the DOM content has loaded. The page is rendered when it expires. Default is set to 2 seconds.
             - `print_options` (dict, optional): Options for PDF printing. Refer to https://vanilla.aslushnikov.com/?Page.printToPDF for available options.
+            - `pool` (BrowserPool, optional): Pool of warm browser sessions to render in. A new browser is launched when omitted.
+            - `page_load_timeout` (float, optional): Maximum time in seconds to wait for the DOM content to load before giving up.
+            - `idle_time` (float, optional): How long in seconds the network must stay idle for the page to count as settled. Default is 0.5 seconds.
+            - `blocking` (BlockingPolicy, optional): The requests to block. `DEFAULT_BLOCKING` is used when omitted; `BlockingPolicy(extensions=(), domains=())` blocks nothing.
+
+        Returns:
+            - PageStats: The requests made, bytes downloaded and requests blocked while loading the page.
 
         Raises:
             - Exception: If an error occurs during PDF conversion.
+            - TimeoutException: If the DOM content does not load within `page_load_timeout`.
+
+Classes:
+    - `BrowserPool(size: int = 2, max_pages: int = 50)`:
+        Keeps up to `size` headless Chrome sessions alive and hands out a fresh tab per conversion.
+        A session is recycled after rendering `max_pages` pages or when it crashes.
+    - `BlockingPolicy(extensions: tuple[str, ...] = BLOCKED_EXTENSIONS, domains: tuple[str, ...] = BLOCKED_DOMAINS, patterns: tuple[str, ...] = ())`:
+        The requests to block: URLs with the given file extensions, URLs of the given domains and their subdomains,
+        and URLs matching extra `Network.setBlockedURLs` wildcard patterns.
+    - `PageStats(url: str)`:
+        The requests made, bytes downloaded and requests blocked (by resource type) while loading a page, with
+        `estimated_bytes_saved`, an estimate of the bytes the blocked requests would have downloaded.
 
 Note:
     This module relies on the Selenium library and requires a compatible WebDriver (e.g., ChromeDriver) to be installed.
@@ -32,14 +75,106 @@ Note:
 
 
 import json
+import time
 import base64
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
 
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.common.exceptions import TimeoutException
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support.expected_conditions import staleness_of
-from selenium.webdriver.common.by import By
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+
+# The number of requests a page may keep in flight and still count as idle, for beacons and long polling
+MAX_INFLIGHT_REQUESTS = 2
+
+# How often the performance log is drained while waiting for the page to settle
+POLL_INTERVAL = 0.05
+
+# Images, fonts and media: the text of a page renders the same without them
+BLOCKED_EXTENSIONS = (
+    "png", "jpg", "jpeg", "gif", "webp", "avif", "bmp", "ico", "svg",
+    "woff", "woff2", "ttf", "otf", "eot",
+    "mp4", "webm", "ogg", "mp3", "wav", "m4a", "mov", "avi",
+)
+
+# Ad, analytics and tracking networks, whose scripts add requests and often stall the page load
+BLOCKED_DOMAINS = (
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "google-analytics.com",
+    "googletagmanager.com", "googletagservices.com", "adservice.google.com", "amazon-adsystem.com", "adnxs.com",
+    "adsrvr.org", "criteo.com", "criteo.net", "taboola.com", "outbrain.com", "pubmatic.com", "rubiconproject.com",
+    "openx.net", "casalemedia.com", "moatads.com", "scorecardresearch.com", "quantserve.com", "facebook.net",
+    "hotjar.com", "segment.io", "chartbeat.com", "nr-data.net", "optimizely.com",
+)
+
+# Typical transfer size in bytes of one response of each DevTools resource type, used to estimate the bytes saved by
+# blocked requests, which never report a size
+TYPICAL_BYTES = {
+    "Image": 25_000,
+    "Font": 30_000,
+    "Media": 500_000,
+    "Script": 20_000,
+    "Stylesheet": 10_000,
+    "Other": 5_000,
+}
+
+
+@dataclass(frozen=True)
+class BlockingPolicy:
+    """
+    The requests blocked while loading a page.
+
+    Attributes:
+    - extensions: The file extensions, without the dot, of the URLs to block.
+    - domains: The domains to block, along with their subdomains.
+    - patterns: Extra URL patterns in the wildcard syntax of `Network.setBlockedURLs`.
+    """
+
+    extensions: tuple[str, ...] = BLOCKED_EXTENSIONS
+    domains: tuple[str, ...] = BLOCKED_DOMAINS
+    patterns: tuple[str, ...] = ()
+
+    def url_patterns(self) -> list[str]:
+        """Returns the `Network.setBlockedURLs` patterns of the policy."""
+        patterns = []
+        for extension in self.extensions:
+            patterns += [f"*.{extension}", f"*.{extension}?*"]
+        for domain in self.domains:
+            patterns += [f"*://{domain}/*", f"*://*.{domain}/*"]
+        return patterns + list(self.patterns)
+
+
+DEFAULT_BLOCKING = BlockingPolicy()
+
+
+@dataclass
+class PageStats:
+    """
+    What loading a page cost.
+
+    Attributes:
+    - url: The URL of the page.
+    - requests: The number of requests the page made, blocked ones included.
+    - bytes_downloaded: The bytes received over the network for the requests that completed.
+    - blocked_requests: The number of requests blocked by the policy.
+    - blocked_by_type: The number of blocked requests of each DevTools resource type, such as "Image" or "Script".
+    - settled: Whether the network went idle before the timeout.
+    """
+
+    url: str
+    requests: int = 0
+    bytes_downloaded: int = 0
+    blocked_requests: int = 0
+    blocked_by_type: dict = field(default_factory=dict)
+    settled: bool = False
+
+    @property
+    def estimated_bytes_saved(self) -> int:
+        """An estimate of the bytes the blocked requests would have downloaded, from `TYPICAL_BYTES`."""
+        return sum(
+            TYPICAL_BYTES.get(kind, TYPICAL_BYTES["Other"]) * count for kind, count in self.blocked_by_type.items()
+        )
 
 
 def convert(
@@ -47,25 +182,37 @@ def convert(
     target: str,
     timeout: int = 2,
     print_options: dict = {},
-):
+    pool: "BrowserPool | None" = None,
+    page_load_timeout: float | None = None,
+    idle_time: float = 0.5,
+    blocking: BlockingPolicy | None = None,
+) -> PageStats:
     """
     Convert a given html file or website into PDF
 
     :param str source: source html file or website link
     :param str target: target location to save the PDF
-    :param int timeout: timeout in seconds. Default value is set to 2 seconds
+    :param int timeout: maximum time in seconds to wait for the network to go idle once the DOM content has loaded. Default value is set to 2 seconds
     :param bool compress: whether PDF is compressed or not. Default value is False
     :param int power: power of the compression. Default value is 0. This can be 0: default, 1: prepress, 2: printer, 3: ebook, 4: screen
     :param dict print_options: options for the printing of the PDF. This can be any of the params in here:https://vanilla.aslushnikov.com/?Page.printToPDF
+    :param BrowserPool pool: pool of warm browser sessions to render in. A new browser is launched when omitted
+    :param float page_load_timeout: maximum time in seconds to wait for the DOM content to load. Selenium's default is used when omitted
+    :param float idle_time: how long in seconds the network must stay idle for the page to count as settled. Default value is 0.5 seconds
+    :param BlockingPolicy blocking: the requests to block. DEFAULT_BLOCKING is used when omitted
+    :return: the requests made, bytes downloaded and requests blocked while loading the page
     """
 
-    result = __get_pdf_from_html(
-        source, timeout, print_options)
+    result, stats = __get_pdf_from_html(
+        source, timeout, print_options, pool, page_load_timeout, idle_time,
+        blocking if blocking is not None else DEFAULT_BLOCKING)
 
 
     with open(target, "wb") as file:
         file.write(result)
 
+    return stats
+
 
 
 def __send_devtools(driver, cmd, params={}):
@@ -80,40 +227,263 @@ def __send_devtools(driver, cmd, params={}):
     return response.get("value")
 
 
-def __get_pdf_from_html(
-    path: str, timeout: int, print_options: dict
-):
+def _create_driver():
     webdriver_options = Options()
     webdriver_prefs = {}
-    driver = None
 
     webdriver_options.add_argument("--headless")
     webdriver_options.add_argument("--disable-gpu")
     webdriver_options.add_argument("--no-sandbox")
     webdriver_options.add_argument("--disable-dev-shm-usage")
     webdriver_options.experimental_options["prefs"] = webdriver_prefs
+    # Return from `get` at DOMContentLoaded and follow the remaining requests through the performance log
+    webdriver_options.page_load_strategy = "eager"
+    webdriver_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
 
     webdriver_prefs["profile.default_content_settings"] = {"images": 2}
 
-    driver = webdriver.Chrome(options=webdriver_options)
+    return webdriver.Chrome(options=webdriver_options)
 
-    driver.get(path)
 
+class BrowserPool:
+    """
+    Pool of warm headless Chrome sessions shared across conversions.
+
+    Sessions are started lazily (or upfront with `warm`) and kept alive between conversions.
+    Every conversion gets a fresh tab which is closed afterwards, so pages never share a tab.
+    A session is quit and replaced after it has rendered `max_pages` pages, or as soon as it
+    raises a WebDriverException.
+
+    The pool is thread-safe; at most `size` sessions exist at any time and callers block
+    until one is free.
+    """
+
+    def __init__(self, size: int = 2, max_pages: int = 50) -> None:
+        """
+        Initialize the pool.
+
+        Parameters:
+        - size (int): The maximum number of browser sessions kept alive (default is 2).
+        - max_pages (int): The number of pages a session renders before it is recycled (default is 50).
+        """
+        if size < 1:
+            raise ValueError("`size` must be at least 1.")
+
+        self.size = size
+        self.max_pages = max_pages
+        self._idle: list = []
+        self._pages: dict = {}
+        self._available = threading.Condition()
+        self._created = 0
+        self._closed = False
+
+    def __enter__(self) -> "BrowserPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def warm(self) -> None:
+        """Start every session of the pool upfront instead of on first use."""
+        drivers = []
+        with self._available:
+            missing = self.size - self._created
+
+        for _ in range(missing):
+            drivers.append(self._acquire())
+
+        for driver in drivers:
+            self._release_idle(driver)
+
+    @contextmanager
+    def tab(self):
+        """
+        Borrow a session, open a fresh tab in it and yield the driver switched to that tab.
+
+        The tab is closed and the session returned to the pool when the block exits.
+        """
+        driver = self._acquire()
+        healthy = True
+        try:
+            driver.switch_to.new_window("tab")
+            yield driver
+        except TimeoutException:
+            # A slow page is not a broken session
+            raise
+        except WebDriverException:
+            healthy = False
+            raise
+        finally:
+            self._release(driver, healthy)
+
+    def close(self) -> None:
+        """Quit every idle session. Sessions still in use are quit when they are released."""
+        with self._available:
+            self._closed = True
+            drivers, self._idle = self._idle, []
+            self._available.notify_all()
+
+        for driver in drivers:
+            self._discard(driver)
+
+    def _acquire(self):
+        with self._available:
+            while True:
+                if self._closed:
+                    raise RuntimeError("The browser pool is closed.")
+                if self._idle:
+                    return self._idle.pop()
+                if self._created < self.size:
+                    self._created += 1
+                    break
+                self._available.wait()
+
+        try:
+            driver = _create_driver()
+        except Exception:
+            with self._available:
+                self._created -= 1
+                self._available.notify()
+            raise
+
+        self._pages[driver] = 0
+        return driver
+
+    def _release(self, driver, healthy: bool) -> None:
+        if healthy:
+            try:
+                driver.close()
+                driver.switch_to.window(driver.window_handles[0])
+            except WebDriverException:
+                healthy = False
+
+        self._pages[driver] = self._pages.get(driver, 0) + 1
+
+        if not healthy or self._pages[driver] >= self.max_pages:
+            self._discard(driver)
+        else:
+            self._release_idle(driver)
+
+    def _release_idle(self, driver) -> None:
+        with self._available:
+            if not self._closed:
+                self._idle.append(driver)
+                self._available.notify()
+                return
+
+        self._discard(driver)
+
+    def _discard(self, driver) -> None:
+        self._pages.pop(driver, None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+        with self._available:
+            self._created -= 1
+            self._available.notify()
+
+
+def __get_pdf_from_html(
+    path: str, timeout: int, print_options: dict, pool: "BrowserPool | None" = None,
+    page_load_timeout: float | None = None, idle_time: float = 0.5, blocking: BlockingPolicy = DEFAULT_BLOCKING
+):
+    if pool is not None:
+        with pool.tab() as driver:
+            return __print_page(driver, path, timeout, print_options, page_load_timeout, idle_time, blocking)
+
+    driver = _create_driver()
     try:
-        element = driver.find_element(by=By.TAG_NAME, value="body")
-        element.send_keys('Ctrl+A')
-        WebDriverWait(driver, timeout).until(
-            staleness_of(element)
-        )
-    except TimeoutException:
-        calculated_print_options = {
-            "landscape": False,
-            "displayHeaderFooter": False,
-            "printBackground": True,
-            "preferCSSPageSize": True,
-        }
-        calculated_print_options.update(print_options)
-        result = __send_devtools(
-            driver, "Page.printToPDF", calculated_print_options)
+        return __print_page(driver, path, timeout, print_options, page_load_timeout, idle_time, blocking)
+    finally:
         driver.quit()
-        return base64.b64decode(result["data"])
\ No newline at end of file
+
+
+def __print_page(driver, path: str, timeout: int, print_options: dict, page_load_timeout: float | None,
+                 idle_time: float, blocking: BlockingPolicy):
+    # Pooled sessions keep their settings between pages, so always set the limit
+    driver.set_page_load_timeout(page_load_timeout if page_load_timeout is not None else 300)
+
+    __send_devtools(driver, "Network.enable")
+    __send_devtools(driver, "Network.setBlockedURLs", {"urls": blocking.url_patterns()})
+
+    # Drop the events of the previous page of a pooled session
+    _drain_performance_log(driver)
+    stats = PageStats(url=path)
+    driver.get(path)
+    stats.settled = _wait_until_settled(driver, timeout, idle_time, stats)
+
+    calculated_print_options = {
+        "landscape": False,
+        "displayHeaderFooter": False,
+        "printBackground": True,
+        "preferCSSPageSize": True,
+    }
+    calculated_print_options.update(print_options)
+    result = __send_devtools(
+        driver, "Page.printToPDF", calculated_print_options)
+    return base64.b64decode(result["data"]), stats
+
+
+def _drain_performance_log(driver) -> list | None:
+    """Returns the DevTools messages logged since the last call, or None if the driver has no performance log."""
+    try:
+        entries = driver.get_log("performance")
+    except WebDriverException:
+        return None
+    return [json.loads(entry["message"])["message"] for entry in entries]
+
+
+def _wait_until_settled(driver, timeout: float, idle_time: float, stats: PageStats | None = None) -> bool:
+    """
+    Wait until the network of the page is idle, or until `timeout` seconds have passed.
+
+    A request is in flight from its `Network.requestWillBeSent` event until its `Network.loadingFinished` or
+    `Network.loadingFailed` event. The page is settled once at most `MAX_INFLIGHT_REQUESTS` requests have been in
+    flight for `idle_time` seconds. Drivers without a performance log wait for `document.readyState` instead.
+    The requests seen are counted in `stats`.
+
+    Returns True if the page settled, False if the wait timed out.
+    """
+    deadline = time.monotonic() + timeout
+    inflight = set()
+    last_activity = time.monotonic()
+
+    while True:
+        messages = _drain_performance_log(driver)
+        if messages is None:
+            settled = driver.execute_script("return document.readyState") == "complete"
+        else:
+            for message in messages:
+                method, params = message.get("method"), message.get("params", {})
+                if method == "Network.requestWillBeSent":
+                    inflight.add(params.get("requestId"))
+                    last_activity = time.monotonic()
+                elif method in ("Network.loadingFinished", "Network.loadingFailed"):
+                    inflight.discard(params.get("requestId"))
+                    last_activity = time.monotonic()
+
+                if stats is not None:
+                    _record(stats, method, params)
+
+            settled = len(inflight) <= MAX_INFLIGHT_REQUESTS and time.monotonic() - last_activity >= idle_time
+
+        if settled:
+            return True
+        if time.monotonic() >= deadline:
+            return False
+
+        time.sleep(POLL_INTERVAL)
+
+
+def _record(stats: PageStats, method: str, params: dict) -> None:
+    """Counts a DevTools network event in the statistics of the page."""
+    if method == "Network.requestWillBeSent":
+        stats.requests += 1
+    elif method == "Network.loadingFinished":
+        stats.bytes_downloaded += int(params.get("encodedDataLength", 0))
+    elif method == "Network.loadingFailed" and params.get("blockedReason"):
+        kind = params.get("type", "Other")
+        stats.blocked_requests += 1
+        stats.blocked_by_type[kind] = stats.blocked_by_type.get(kind, 0) + 1
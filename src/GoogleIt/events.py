@@ -0,0 +1,101 @@
+"""
+GoogleIt Events Module
+
+This module provides the events yielded by `GoogleIt.stream`, one for every step of answering a query.
+
+A query first finds its source URLs, then reads each source, then keeps the parts relevant to the question, and
+finally streams the answer from the model. `GoogleIt.stream` reports each of these steps as soon as it happens, so a
+user interface can show progress, and the first words of the answer, long before the full answer is ready.
+
+Usage:
+    - Import the module: `from GoogleIt.events import AnswerToken, AnswerDone`
+    - Iterate over `GoogleIt.stream` and dispatch on the type of each event.
+
+Example:
+    ```python
+    for event in google_it.stream(query="How does photosynthesis work?"):
+        if isinstance(event, SourceReady):
+            print(f"Read {event.url}")
+        elif isinstance(event, AnswerToken):
+            print(event.text, end="", flush=True)
+    ```
+
+Classes:
+    - `UrlsFound(urls: list[str], domains: list[str])`: The search returned the source URLs.
+    - `SourceReady(url: str, domain: str, paragraphs: list[str])`: A source was read. Sources are reported in the
+      order they finish, and sources that fail or miss the deadline are not reported.
+    - `RelevanceFiltered(sources: int, context_length: int)`: The model context was built from the sources that were read.
+    - `AnswerToken(text: str)`: The next piece of the answer.
+    - `AnswerDone(answer: str)`: The answer is complete. `answer` is the concatenation of every `AnswerToken`.
+"""
+
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class UrlsFound:
+    """
+    The search returned the source URLs.
+
+    Attributes:
+        urls: The URLs of the sources that will be read.
+        domains: The domain name of each URL.
+    """
+
+    urls: list[str]
+    domains: list[str]
+
+
+@dataclass(frozen=True)
+class SourceReady:
+    """
+    A source was read.
+
+    Attributes:
+        url: The URL of the source.
+        domain: The domain name of the source.
+        paragraphs: The paragraphs read from the source.
+    """
+
+    url: str
+    domain: str
+    paragraphs: list[str]
+
+
+@dataclass(frozen=True)
+class RelevanceFiltered:
+    """
+    The model context was built from the sources that were read.
+
+    Attributes:
+        sources: The number of sources read before the deadline.
+        context_length: The length in characters of the context sent to the model.
+    """
+
+    sources: int
+    context_length: int
+
+
+@dataclass(frozen=True)
+class AnswerToken:
+    """
+    The next piece of the answer, as produced by the model's streaming endpoint.
+
+    Attributes:
+        text: The text of the piece.
+    """
+
+    text: str
+
+
+@dataclass(frozen=True)
+class AnswerDone:
+    """
+    The answer is complete.
+
+    Attributes:
+        answer: The full answer.
+    """
+
+    answer: str
@@ -0,0 +1,293 @@
+"""
+GoogleIt Fetcher Module
+
+This module decides, for each source, whether a plain HTTP download is enough or the page must be rendered in a browser.
+`GoogleIt` uses it when created with `extraction="tiered"`.
+
+A tiered fetch downloads the page with the pooled HTTP client and extracts its paragraphs from the HTML. Only when
+`needs_rendering` finds that the download did not carry the content, because the body is empty, the page is a
+JavaScript shell or the server refused the request, is the page rendered in the browser. Sites known to render their
+content in the browser, listed in `SPA_DOMAINS`, go to the browser directly.
+
+`TieredFetcher` also learns from every escalation: a host whose pages repeatedly needed the browser is sent there
+directly, and a host whose thin pages gained nothing from rendering stops being escalated. The decisions are kept per
+host and, when a path is given, saved to a JSON file so that they carry over to the next run. The file is written when
+the decision of a host changes, not on every fetch; call `save` before exiting to keep the latest counts as well.
+
+Usage:
+    - Import the module: `from GoogleIt.fetcher import TieredFetcher`
+    - Create `GoogleIt` with `extraction="tiered"`, and optionally a `TieredFetcher` with a path to persist it.
+
+Example:
+    ```python
+    fetcher = TieredFetcher(path=".googleit-fetcher.json")
+    google_it = GoogleIt(api_key='your_api_key_here', extraction="tiered", fetcher=fetcher)
+    google_it.get(query="How does photosynthesis work?")
+    print(fetcher.stats())  # {'http': 4, 'escalated': 1, 'browser': 0, ...}
+    ```
+
+Functions:
+    - `host_of(url: str) -> str`:
+        Returns the host name of a URL, lowercased and without a leading "www.".
+    - `count_words(paragraphs: list[str]) -> int`:
+        Returns the number of words of a list of paragraphs.
+    - `needs_rendering(html: str, paragraphs: list[str], min_words: int = MIN_WORDS) -> str | None`:
+        Returns why a downloaded page must be rendered in a browser ("empty", "script_shell" or "thin"), or None when its paragraphs can be used.
+
+Classes:
+    - `TieredFetcher(path: str | None = None, spa_domains: Iterable[str] = SPA_DOMAINS, min_words: int = MIN_WORDS, min_samples: int = 2, ttl: float = 7 days)`:
+        - The per-host fetch decisions of the tiered extraction.
+        - Methods:
+            - `prefers_browser(self, url: str) -> bool`: Whether the page should be rendered without trying HTTP first.
+            - `needs_rendering(self, url: str, html: str, paragraphs: list[str]) -> str | None`: Whether a downloaded page should be rendered, given what was learned about its host.
+            - `record(self, url: str, outcome: str) -> None`: Learns the outcome of a tiered fetch: "http", "rendered" or "unhelpful". Saves the decisions when the one of the host changes.
+            - `save(self) -> None`: Writes the decisions to the JSON file.
+            - `stats(self) -> dict`: Returns the number of sources read over HTTP, escalated and rendered directly, and the share that skipped the browser.
+"""
+
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Iterable
+from urllib.parse import urlsplit
+
+
+# Sites that build their pages in the browser, so their HTML never carries the content
+SPA_DOMAINS = frozenset({
+    "twitter.com", "x.com", "instagram.com", "facebook.com", "threads.net", "tiktok.com", "linkedin.com",
+    "pinterest.com", "quora.com",
+})
+
+# The number of words of extracted paragraphs below which a page is considered to lack its content
+MIN_WORDS = 80
+
+# Statuses with which servers turn away clients that do not run JavaScript
+BLOCKED_STATUSES = (401, 403)
+
+OUTCOMES = ("http", "rendered", "unhelpful")
+
+# An empty mount point of a client-side framework, e.g. <div id="root"></div>
+_EMPTY_MOUNT = re.compile(r"<div[^>]+id=[\"'](root|app|__nuxt|___gatsby|svelte)[\"'][^>]*>\s*</div>", re.IGNORECASE)
+
+_JAVASCRIPT_REQUIRED = re.compile(r"(enable|requires?|turn on)\s+javascript|javascript\s+is\s+(disabled|required)",
+                                  re.IGNORECASE)
+
+_SCRIPT_TAG = re.compile(r"<script\b", re.IGNORECASE)
+
+
+def host_of(url: str) -> str:
+    """
+    Returns the host name of a URL, lowercased and without a leading "www.".
+
+    Parameters:
+        url (str): The URL.
+
+    Returns:
+        str: The host name, or an empty string when the URL has none.
+    """
+    host = urlsplit(url).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+
+def count_words(paragraphs: list[str]) -> int:
+    """Returns the number of words of a list of paragraphs."""
+    return sum(len(paragraph.split()) for paragraph in paragraphs)
+
+
+def needs_rendering(html: str, paragraphs: list[str], min_words: int = MIN_WORDS) -> str | None:
+    """
+    Decides whether a downloaded page must be rendered in a browser to get its content.
+
+    Parameters:
+        html (str): The downloaded HTML.
+        paragraphs (list[str]): The paragraphs extracted from the HTML.
+        min_words (int): The number of words of paragraphs that is enough content (default is `MIN_WORDS`).
+
+    Returns:
+        str | None: None when the paragraphs can be used. Otherwise the reason: "empty" for an empty body,
+        "script_shell" for a page built by JavaScript, and "thin" for any other page with too little text.
+    """
+    if not html.strip():
+        return "empty"
+
+    if count_words(paragraphs) >= min_words:
+        return None
+
+    if _EMPTY_MOUNT.search(html) or _JAVASCRIPT_REQUIRED.search(html) or len(_SCRIPT_TAG.findall(html)) >= 10:
+        return "script_shell"
+    return "thin"
+
+
+class TieredFetcher:
+    """
+    The per-host fetch decisions of the tiered extraction, learned from the outcome of every escalation.
+
+    For each host it counts the pages that were read over HTTP ("http"), the pages that needed the browser
+    ("rendered"), and the escalated pages that the browser did not improve ("unhelpful"). Once a host has
+    `min_samples` rendered pages and more of them than the others, its pages are rendered directly. Once it has
+    `min_samples` unhelpful escalations and no rendered page, its pages are no longer escalated. Counts older than
+    `ttl` are forgotten, so decisions are re-learned when sites change.
+
+    Instances are thread-safe and meant to be shared.
+
+    Attributes:
+        path: The JSON file the decisions are saved to, or None to keep them in memory.
+        spa_domains: The hosts, and their subdomains, that are always rendered.
+        min_words: The number of words of paragraphs that is enough content.
+        min_samples: The number of consistent outcomes after which a host gets a fixed decision.
+        ttl: The time in seconds after which the counts of a host are forgotten.
+    """
+
+    def __init__(self, path: str | None = None, spa_domains: Iterable[str] = SPA_DOMAINS, min_words: int = MIN_WORDS,
+                 min_samples: int = 2, ttl: float = 7 * 24 * 3600) -> None:
+        """
+        Initializes the fetcher, loading the decisions saved at `path` if there are any.
+
+        Parameters:
+            path (str | None): The JSON file to save the decisions to (default is None, in memory only).
+            spa_domains (Iterable[str]): The hosts that are always rendered (default is `SPA_DOMAINS`).
+            min_words (int): The number of words of paragraphs that is enough content (default is `MIN_WORDS`).
+            min_samples (int): The number of consistent outcomes after which a host gets a fixed decision (default is 2).
+            ttl (float): The time in seconds after which the counts of a host are forgotten (default is 7 days).
+        """
+        self.path = path
+        self.spa_domains = frozenset(spa_domains)
+        self.min_words = min_words
+        self.min_samples = min_samples
+        self.ttl = ttl
+        self._hosts: dict[str, dict] = {}
+        self._stats = {"http": 0, "escalated": 0, "browser": 0, "unhelpful": 0}
+        self._lock = threading.Lock()
+
+        if path is not None:
+            self._load()
+
+    def prefers_browser(self, url: str) -> bool:
+        """
+        Whether a page should be rendered without trying HTTP first: its host is a known SPA domain, or its pages
+        needed the browser before. Counts the page as rendered directly when it should.
+
+        Parameters:
+            url (str): The URL of the page.
+
+        Returns:
+            bool: True to render the page directly.
+        """
+        host = host_of(url)
+        if any(host == domain or host.endswith("." + domain) for domain in self.spa_domains):
+            preferred = True
+        else:
+            with self._lock:
+                preferred = self._decision(self._counts(host))[0]
+
+        if preferred:
+            with self._lock:
+                self._stats["browser"] += 1
+        return preferred
+
+    def needs_rendering(self, url: str, html: str, paragraphs: list[str]) -> str | None:
+        """
+        Decides whether a downloaded page should be rendered, with `needs_rendering`, unless rendering the pages
+        of its host gained nothing before.
+
+        Parameters:
+            url (str): The URL of the page.
+            html (str): The downloaded HTML.
+            paragraphs (list[str]): The paragraphs extracted from the HTML.
+
+        Returns:
+            str | None: The reason to render the page, or None to use its paragraphs.
+        """
+        with self._lock:
+            skips_browser = self._decision(self._counts(host_of(url)))[1]
+        if skips_browser:
+            return None
+        return needs_rendering(html, paragraphs, self.min_words)
+
+    def record(self, url: str, outcome: str) -> None:
+        """
+        Learns the outcome of a tiered fetch. When a path is set, the decisions are saved if the one of the host
+        changed: to render its pages directly, to stop escalating them, or neither.
+
+        Parameters:
+            url (str): The URL of the page.
+            outcome (str): "http" when the downloaded page was used as is, "rendered" when it was escalated and
+                rendering got more content, or "unhelpful" when it was escalated and rendering did not help.
+
+        Raises:
+            ValueError: If an invalid value for `outcome` is provided.
+        """
+        if outcome not in OUTCOMES:
+            raise ValueError("Invalid value for `outcome`. Available outcomes are: [http, rendered, unhelpful]")
+
+        with self._lock:
+            host = host_of(url)
+            counts = self._counts(host)
+            decision = self._decision(counts)
+            if counts is None:
+                counts = self._hosts[host] = {name: 0 for name in OUTCOMES}
+            counts[outcome] += 1
+            counts["updated"] = time.time()
+            changed = self._decision(counts) != decision
+
+            self._stats["http" if outcome == "http" else "escalated"] += 1
+            if outcome == "unhelpful":
+                self._stats["unhelpful"] += 1
+
+        if self.path is not None and changed:
+            self.save()
+
+    def save(self) -> None:
+        """Writes the decisions to the JSON file at `path`, replacing it atomically."""
+        with self._lock:
+            encoded = json.dumps(self._hosts)
+            temporary_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                file.write(encoded)
+            os.replace(temporary_path, self.path)
+
+    def stats(self) -> dict:
+        """
+        Returns the number of sources read over HTTP, escalated to the browser after a download, of which unhelpful,
+        and rendered directly, with the share of sources that skipped the browser and the number of known hosts.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["hosts"] = len(self._hosts)
+
+        total = stats["http"] + stats["escalated"] + stats["browser"]
+        stats["http_share"] = stats["http"] / total if total else 0.0
+        return stats
+
+    def _counts(self, host: str) -> dict | None:
+        """Returns the counts of a host, forgetting them when they are older than `ttl`. Call with the lock held."""
+        counts = self._hosts.get(host)
+        if counts is not None and time.time() - counts["updated"] > self.ttl:
+            del self._hosts[host]
+            return None
+        return counts
+
+    def _decision(self, counts: dict | None) -> tuple[bool, bool]:
+        """Returns whether the counts of a host render its pages directly, and whether they stop escalating them."""
+        if counts is None:
+            return False, False
+        renders = counts["rendered"] >= self.min_samples and counts["rendered"] > counts["http"] + counts["unhelpful"]
+        skips = counts["unhelpful"] >= self.min_samples and counts["rendered"] == 0
+        return renders, skips
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                hosts = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if isinstance(hosts, dict):
+            self._hosts = {
+                host: counts for host, counts in hosts.items()
+                if isinstance(counts, dict) and all(isinstance(counts.get(key), (int, float))
+                                                    for key in OUTCOMES + ("updated",))
+            }
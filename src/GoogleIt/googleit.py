@@ -3,6 +3,11 @@ GoogleIt Module
 
 This module provides the `GoogleIt` class, which encapsulates functionality for performing queries, retrieving top URLs from Google search results, downloading content from URLs, preprocessing text, extracting domain names from URLs, combining PDF files, and extracting relevant content based on cosine similarity.
 
+Sources are read in one of three ways, selected with the `extraction` argument of `GoogleIt`:
+    - "pdf" (default): every page is rendered to PDF in a browser, converted to DOCX, and its paragraphs are read back.
+    - "html": every page is downloaded and its readable paragraphs are extracted straight from the HTML, skipping the browser, PDF and DOCX steps.
+    - "tiered": every page is downloaded as in "html", and only the pages whose HTML lacks their content, such as JavaScript-only shells, are rendered as in "pdf". The per-host decisions of the `fetcher.TieredFetcher` are learned across queries.
+
 Usage:
     - Import the module: `from GoogleIt.googleit import GoogleIt`
     - Create an instance of the `GoogleIt` class with a valid API key.
@@ -16,47 +21,161 @@ response = google_it.get(query=query, urls_count=5)
 print(response)
 ```
 
+Caching the paragraphs of each source and the search results across queries:
+```python
+from GoogleIt.cache import ContentCache, SearchCache
+from GoogleIt.events import UrlsFound, SourceReady, RelevanceFiltered, AnswerToken, AnswerDone
+from GoogleIt.models import MemoryResponseCache
+
+google_it = GoogleIt(api_key='your_api_key_here',
+                     content_cache=ContentCache(ttl=3600, directory=".googleit-cache"),
+                     search_cache=SearchCache(ttl=600),
+                     response_cache=MemoryResponseCache(max_entries=1024))
+```
+
+Answering with a single model call, redrafting only answers that fail a local readability check:
+```python
+google_it = GoogleIt(api_key='your_api_key_here', generation="auto")
+```
+
+Answering a batch of related queries, fetching the pages they share only once:
+```python
+answers = google_it.get_many(["What is photosynthesis?", "Why are leaves green?"], urls_count=5)
+```
+
+Streaming the progress and the answer as they are produced:
+```python
+from GoogleIt.events import AnswerToken
+
+for event in google_it.stream(query=query):
+    if isinstance(event, AnswerToken):
+        print(event.text, end="", flush=True)
+```
+
+Reading sources over HTTP and rendering only the pages that need a browser:
+```python
+from GoogleIt.fetcher import TieredFetcher
+
+google_it = GoogleIt(api_key='your_api_key_here', extraction="tiered", fetcher=TieredFetcher(path=".googleit-fetcher.json"))
+```
+
+Bounding the latency of a query by its fastest sources, reading 2 extra search results and keeping the first 5 to answer:
+```python
+google_it = GoogleIt(api_key='your_api_key_here', hedge=2)
+response = google_it.get(query=query, urls_count=5)
+print(google_it.hedge_stats())
+```
+
+Skipping the domains that keep failing, timing out or serving paywalls, and remembering them across runs:
+```python
+from GoogleIt.health import DomainHealth
+
+google_it = GoogleIt(api_key='your_api_key_here', domain_health=DomainHealth(path=".googleit-health.json"))
+```
+
+Concurrent identical queries, such as a burst of users asking about a trending topic, share one execution:
+```python
+with ThreadPoolExecutor(max_workers=8) as executor:
+    answers = list(executor.map(google_it.get, ["How does photosynthesis work?"] * 8))
+print(google_it.single_flight.stats())
+```
+
+Async usage (requires `pip install GoogleIt[async]`):
+```python
+response = await google_it.aget(query=query, urls_count=5)
+```
+
 Classes:
     - `GoogleIt`:
         - A class that provides functionality for querying, retrieving URLs, downloading content, preprocessing text, and more.
         - Methods:
-            - `__init__(self, api_key: str, model: str = "Palm2") -> None`: Initializes the `GoogleIt` instance with the provided API key and a specified language model.
-            - `save_url_to_pdf(self, url: str, pdf_path: str) -> None`: Downloads content from a URL and saves it as a PDF file.
-            - `preprocess_text(self, text: str) -> str`: Preprocesses text by converting it to lowercase, tokenizing, and removing stopwords and punctuation.
+            - `__init__(self, api_key: str, model: str | Palm2Model | GeminiModel = "Palm2", browser_pool: converter.BrowserPool | None = None, max_workers: int = 5, page_timeout: float | None = 15, deadline: float | None = 30, extraction: str = "pdf", workspace_root: str | None = None, content_cache: ContentCache | None = None, search_cache: SearchCache | None = None, response_cache: ResponseCache | None = None, generation: str = "redraft", preprocessor: Preprocessor | None = None, context_tokens: int | None = None, index_cache: IndexCache | None = None, http_client: HttpClient | None = None, blocking: converter.BlockingPolicy | None = None, hooks: Iterable[Callable[[Span], None]] | None = None, search_url: str = SEARCH_URL, fetcher: TieredFetcher | None = None, hedge: int = 0, domain_health: DomainHealth | None = None, single_flight: SingleFlight | None = None) -> None`: Initializes the `GoogleIt` instance with the provided API key, a specified language model or model instance, an optional pool of browser sessions, the limits of the fetch stage, the way sources are read, where request workspaces are created, optional caches of source paragraphs, search results and model responses, the generation strategy of the answers, the text preprocessing pipeline, the token budget of the model context, the cache of chunk indexes, the HTTP client, the requests blocked while rendering pages, the instrumentation hooks, the search endpoint, the fetch decisions of the tiered extraction, the number of hedged sources, the health registry of the source domains and the coalescing of identical concurrent requests.
+            - `save_url_to_pdf(self, url: str, pdf_path: str) -> converter.PageStats`: Downloads content from a URL and saves it as a PDF file, returning the requests made and blocked while loading it.
+            - `fetch_sources(self, urls: list[str], domains: list[str], folder_path: str) -> list[str]`: Concurrently saves the given URLs as PDF files and returns the files that finished before the deadline.
+            - `read_url(self, url: str) -> list[str]`: Downloads a URL and extracts its readable paragraphs from the HTML.
+            - `render_url(self, url: str, domain: str, workspace: Workspace | None = None) -> list[str]`: Renders a URL to PDF in a browser and reads its paragraphs back through DOCX.
+            - `read_source(self, url: str, domain: str) -> list[str]`: Reads the paragraphs of a source with the configured extraction mode, using the content cache when one is set.
+            - `fetch_paragraphs(self, urls: list[str], domains: list[str], keep: int | None = None) -> list[str]`: Concurrently reads the given sources and returns the paragraphs of those that finished before the deadline, or of the first `keep` to return paragraphs.
+            - `hedge_stats(self) -> dict`: Returns the counters of the hedged fetches: fetches, candidates, kept sources, hedge wins and the share of fetches won by hedges.
+            - `preprocess_text(self, text: str) -> str`: Preprocesses text by converting it to lowercase, tokenizing, and removing stopwords and punctuation, with the instance's `Preprocessor`.
             - `get_domain_name(self, url: str) -> str`: Extracts the domain name from a given URL.
             - `get_top_urls(self, query: str, urls_count: int = 5) -> Tuple[list[str], list[str]]`: Retrieves top URLs from Google search results based on a given query.
-            - `combine_pdf(self, folder_path: str) -> str`: Combines multiple PDF files into a single merged PDF.
+            - `parse_search_results(self, content: bytes | str, urls_count: int = 5) -> Tuple[list[str], list[str]]`: Extracts the top result URLs from a search result page.
+            - `combine_pdf(self, folder_path: str, pdf_files: list[str] | None = None, workspace: Workspace | None = None) -> str`: Combines multiple PDF files into a single merged PDF.
             - `extract_relevant_content(self, input_text: str, main_document: str, threshold: float = 0.2) -> str`: Extracts relevant content from the input text based on cosine similarity.
-            - `with_document(self, query: str, google_doc: str, pdf_path: str) -> str`: Processes a query using a provided PDF document and a Google document.
+            - `score_relevance(self, chunks: list[str], main_document: str) -> numpy.ndarray`: Computes the cosine similarity of every chunk with the main document in one pass.
+            - `extract_relevant_chunks(self, chunks: list[str], main_document: str, threshold: float = 0.2) -> list[str]`: Keeps the chunks whose similarity with the main document reaches the threshold.
+            - `retrieve_chunks(self, query: str, chunks: list[str], k: int = 5) -> list[str]`: Retrieves the `k` chunks that best match a query, ranked with a BM25 index that is cached for follow-up queries on the same chunks.
+            - `with_document(self, query: str, google_doc: str, pdf_path: str, workspace: Workspace | None = None) -> str`: Processes a query using a provided PDF document and a Google document.
             - `without_document(self, query: str, paragraphs: list[str]) -> str`: Processes a query without a provided PDF document.
             - `get(self, query: str, pdf_path: str | None = None, urls_count: int = 5) -> str`: Main function to retrieve information based on a query, optionally using a PDF document.
+            - `get_many(self, queries: list[str], pdf_path: str | None = None, urls_count: int = 5, model_workers: int = 2) -> list[str | Exception]`: Answers many queries at once: searches run concurrently, URLs shared by several queries are fetched once, model calls run at most `model_workers` at a time, and a failing query returns its exception without affecting the others.
+            - `stream(self, query: str, pdf_path: str | None = None, urls_count: int = 5) -> Iterator[event]`: Streaming version of `get`, yielding the typed events of the `events` module as each step completes and the answer as it is generated.
+            - `aget(self, query: str, pdf_path: str | None = None, urls_count: int = 5) -> str`: Asynchronous version of `get`, built on aiohttp and the models' async API.
+            - `aget_top_urls`, `aread_url`, `aread_source`, `afetch_paragraphs`: Asynchronous versions of `get_top_urls`, `read_url`, `read_source` and `fetch_paragraphs`.
 
 Attributes:
     - `model` (GoogleIt attribute): An instance of the model class for natural language processing.
+    - `browser_pool` (GoogleIt attribute): The `converter.BrowserPool` used to render pages, or None to launch a browser per page.
+    - `max_workers`, `page_timeout`, `deadline` (GoogleIt attributes): The worker count, per-URL page load limit and overall deadline of the fetch stage.
+    - `extraction` (GoogleIt attribute): How sources are read, either "pdf", "html" or "tiered".
+    - `workspace_root` (GoogleIt attribute): The directory in which each request creates its private `Workspace`, or None for the system temporary directory.
+    - `content_cache` (GoogleIt attribute): The `cache.ContentCache` holding the paragraphs of previously read sources, or None.
+    - `search_cache` (GoogleIt attribute): The `cache.SearchCache` holding the results of previous searches, or None.
+    - `preprocessor` (GoogleIt attribute): The `preprocessing.Preprocessor` that normalizes text before relevance scoring.
+    - `context_tokens` (GoogleIt attribute): The token budget of the context sent to the model; the chunks that best match the query, ranked with BM25, are packed into it with `context.pack_context`.
+    - `index_cache` (GoogleIt attribute): The `retrieval.IndexCache` holding the BM25 indexes of recently seen chunks.
+    - `http_client` (GoogleIt attribute): The `http_client.HttpClient` through which every search request and page download is sent.
+    - `blocking` (GoogleIt attribute): The `converter.BlockingPolicy` applied while rendering pages, or None for `converter.DEFAULT_BLOCKING`.
+    - `tracer` (GoogleIt attribute): The `instrumentation.Tracer` timing every pipeline stage; the model shares it. Hooks registered on it receive a `Span` per stage.
+    - `search_url` (GoogleIt attribute): The template of the search request, with `{query}` and `{num}` placeholders. Point it at another endpoint serving Google-style result pages, such as the fake search server of the benchmarks.
+    - `fetcher` (GoogleIt attribute): The `fetcher.TieredFetcher` deciding which sources are rendered in "tiered" extraction mode.
+    - `hedge` (GoogleIt attribute): The number of extra search results read by `get`, `aget` and `stream`; the first `urls_count` sources to return paragraphs are kept and the rest are cancelled.
+    - `domain_health` (GoogleIt attribute): The `health.DomainHealth` recording the latency, failures and content yield of every source read; search results from domains whose circuit is open are skipped and degraded domains are ranked last.
+    - `single_flight` (GoogleIt attribute): The `coalesce.SingleFlight` through which concurrent identical queries of `get` and `aget`, and concurrent reads of the same URL, share one execution.
 
 Note:
+    Every page rendered and every PDF document converted by `get` keeps its intermediate files in its own `Workspace`, so one `GoogleIt` instance can serve many requests in parallel.
+    Renders still running at the `deadline` are abandoned, not interrupted: each keeps its tab of the `browser_pool`, or the browser it launched when there is no pool, until its page has loaded, which takes at most `page_timeout` plus the few seconds a page is given to settle. A burst of slow pages can keep the pool busy that long after the deadline, so keep `page_timeout` well below `deadline`.
+    In "pdf" mode, `get` renders and converts each source on its own, so that each can be cached and dropped at the deadline separately; `fetch_sources` and `combine_pdf` remain available to save the sources as PDF files and merge them, but `get` no longer uses them.
     This module requires the `Palm2Model` class and `GeminiModel` from the `models` module for natural language processing.
+    Importing this module has no side effects. Heavy dependencies are imported on first use, and the NLTK stopwords are
+    loaded from the local NLTK data directories by `resources.ensure_nltk_resource`, downloaded only if missing.
 """
 
 
+import asyncio
+import contextvars
 import os
 import re
-import shutil
-from PyPDF2 import PdfMerger
-from bs4 import BeautifulSoup
-import requests
-from GoogleIt import converter
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from GoogleIt.models import Palm2Model, GeminiModel
-from GoogleIt.text_processor import extract_text_from_pdf, get_chunks
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-
-# Download necessary NLTK resources
-nltk.download('stopwords')
-nltk.download('punkt')
+import threading
+import time
+from contextlib import closing
+from concurrent.futures import ThreadPoolExecutor, as_completed, TimeoutError as FuturesTimeoutError
+from typing import TYPE_CHECKING, Callable, Iterable, Iterator
+from urllib.parse import quote_plus
+from GoogleIt.models import Palm2Model, GeminiModel, ResponseCache
+from GoogleIt.preprocessing import Preprocessor
+from GoogleIt.cache import ContentCache, SearchCache, normalize_query
+from GoogleIt.coalesce import SingleFlight, file_digest
+from GoogleIt.context import estimate_tokens, pack_context
+from GoogleIt.fetcher import BLOCKED_STATUSES, TieredFetcher, count_words, host_of
+from GoogleIt.health import DomainHealth
+from GoogleIt.http_client import HttpClient
+from GoogleIt.instrumentation import Span, Tracer
+from GoogleIt.retrieval import IndexCache
+from GoogleIt.events import UrlsFound, SourceReady, RelevanceFiltered, AnswerToken, AnswerDone
+from GoogleIt.text_processor import extract_paragraphs_from_html, extract_text_from_pdf, get_chunks
+from GoogleIt.workspace import Workspace
+
+if TYPE_CHECKING:
+    import numpy as np
+    from GoogleIt import converter
+
+SEARCH_URL = "https://www.google.com/search?q={query}&num={num}"
+
+# NLTK, scikit-learn, Selenium, PyPDF2, BeautifulSoup, numpy and aiohttp are imported on first use: together they
+# take seconds to import, and most processes only need some of them.
 
 class GoogleIt:
     """
@@ -64,54 +183,626 @@ class GoogleIt:
 
     Attributes:
         model: An instance of the underlying language model (Palm2Model or GeminiModel).
+        browser_pool: The pool of browser sessions used to render pages, or None to launch a browser per page.
+        max_workers: The number of URLs fetched concurrently.
+        page_timeout: The maximum time in seconds a single page may take to load.
+        deadline: The overall time in seconds the fetch stage waits for sources before moving on.
+        extraction: How sources are read, either "pdf" (render and convert), "html" (extract from the HTML) or "tiered"
+            (extract from the HTML, rendering only the pages that need it).
+        workspace_root: The directory in which each request creates its private workspace, or None for the system temporary directory.
+        content_cache: The cache of the paragraphs of previously read sources, or None.
+        search_cache: The cache of the results of previous searches, or None.
+        preprocessor: The pipeline that normalizes text before relevance scoring.
+        context_tokens: The token budget of the context sent to the model.
+        index_cache: The cache of the BM25 indexes of recently seen chunks.
+        http_client: The pooled HTTP client used for all search requests and page downloads.
+        blocking: The requests blocked while pages are rendered, or None for the converter's default policy.
+        tracer: The `instrumentation.Tracer` timing the pipeline stages. Register hooks on it to receive the spans.
+        search_url: The template of the search request.
+        fetcher: The per-host fetch decisions of the "tiered" extraction mode.
+        hedge: The number of extra search results read by each query, of which the slowest are dropped.
+        domain_health: The per-domain health of the sources, deciding which search results are read.
+        single_flight: The coalescing of concurrent identical queries and source reads.
 
     Methods:
         __init__: Initializes the GoogleIt instance with the provided API key and model.
         save_url_to_pdf: Downloads content from a URL and saves it as a PDF file.
+        fetch_sources: Concurrently saves URLs as PDF files, keeping only those that finish before the deadline. Not used by `get`.
+        read_url: Downloads a URL and extracts its readable paragraphs from the HTML.
+        render_url: Renders a URL to PDF and reads its paragraphs back through DOCX.
+        read_source: Reads the paragraphs of a source with the configured extraction mode and the content cache.
+        fetch_paragraphs: Concurrently reads sources, keeping only those that finish before the deadline.
+        hedge_stats: Returns how often hedged fetches kept a hedge.
         preprocess_text: Preprocesses text by converting it to lowercase, tokenizing, and removing stopwords and punctuation.
         get_domain_name: Extracts the domain name from a given URL.
         get_top_urls: Retrieves top URLs from Google search results based on a given query.
-        combine_pdf: Combines multiple PDF files into a single merged PDF.
+        parse_search_results: Extracts the top result URLs from a search result page.
+        combine_pdf: Combines multiple PDF files into a single merged PDF. Not used by `get`.
         extract_relevant_content: Extracts relevant content from the input text based on cosine similarity with the main document.
+        score_relevance: Computes the cosine similarity of many chunks with the main document in one pass.
+        extract_relevant_chunks: Keeps the chunks whose similarity with the main document reaches a threshold.
+        retrieve_chunks: Retrieves the chunks that best match a query with a cached BM25 index.
         with_document: Processes a query using a provided PDF document and a Google document.
         without_document: Processes a query without a provided PDF document.
         get: Main function to retrieve information based on a query, optionally using a PDF document.
+        get_many: Answers many queries at once, fetching the sources they share only once.
+        stream: Streaming version of `get`, yielding typed events as each step completes.
+        aget: Asynchronous version of `get`.
     """
 
-    def __init__(self, api_key: str, model: str = "Palm2") -> None:
+    def __init__(
+        self,
+        api_key: str,
+        model: "str | Palm2Model | GeminiModel" = "Palm2",
+        browser_pool: "converter.BrowserPool | None" = None,
+        max_workers: int = 5,
+        page_timeout: float | None = 15,
+        deadline: float | None = 30,
+        extraction: str = "pdf",
+        workspace_root: str | None = None,
+        content_cache: ContentCache | None = None,
+        search_cache: SearchCache | None = None,
+        response_cache: ResponseCache | None = None,
+        generation: str = "redraft",
+        preprocessor: Preprocessor | None = None,
+        context_tokens: int | None = None,
+        index_cache: IndexCache | None = None,
+        http_client: HttpClient | None = None,
+        blocking: "converter.BlockingPolicy | None" = None,
+        hooks: Iterable[Callable[[Span], None]] | None = None,
+        search_url: str = SEARCH_URL,
+        fetcher: TieredFetcher | None = None,
+        hedge: int = 0,
+        domain_health: DomainHealth | None = None,
+        single_flight: SingleFlight | None = None,
+    ) -> None:
         """
         Initializes the GoogleIt instance with the provided API key and a specified language model.
 
         Args:
             api_key (str): The API key for initializing the underlying language model.
-            model (str): The backend language model to use, either "Palm2" or "GeminiPro" (default is "Palm2").
+            model (str | Palm2Model | GeminiModel): The backend language model to use, either "Palm2" or "GeminiPro"
+                (default is "Palm2"), or a model instance, such as a subclass with a custom backend. An instance is
+                initialized with `api_key` and used as is: `response_cache` and `generation` do not apply to it.
+            browser_pool (converter.BrowserPool | None): A pool of warm browser sessions used to render pages.
+                When None (default), a new browser is launched for every page.
+            max_workers (int): The number of URLs fetched concurrently (default is 5).
+            page_timeout (float | None): The maximum time in seconds a single page may take to load (default is 15).
+            deadline (float | None): The overall time in seconds to wait for sources (default is 30). Sources that are
+                still loading when it expires are dropped and the answer is built from the rest. None waits for all of them.
+                Dropped renders are not interrupted: they hold their browser tab until `page_timeout` at most.
+            extraction (str): How sources are read, either "pdf" to render pages to PDF and read them back through DOCX,
+                "html" to extract paragraphs straight from the downloaded HTML, or "tiered" to extract them from the
+                HTML and render only the pages whose HTML lacks their content (default is "pdf").
+            workspace_root (str | None): The directory in which each request creates its private workspace for
+                intermediate files (default is None, the system temporary directory).
+            content_cache (ContentCache | None): A cache of the paragraphs of each source URL and extraction mode.
+                Sources found fresh in the cache skip the download, browser and PDF steps entirely (default is None,
+                no caching).
+            search_cache (SearchCache | None): A cache of search results. Repeated queries, including ones that differ
+                only in case, punctuation or spacing, skip the search request and parse (default is None, no caching).
+            response_cache (ResponseCache | None): A cache of model responses, such as `models.MemoryResponseCache` or
+                `models.SQLiteResponseCache`. Identical prompts are answered without a remote call (default is None).
+            generation (str): The generation strategy of the model: "redraft" sends every answer back to be redrafted,
+                "single" returns the first answer with one model call, and "auto" redrafts only the answers that fail
+                the local `models.is_readable` check (default is "redraft").
+            preprocessor (Preprocessor | None): The pipeline that normalizes text before relevance scoring. When None
+                (default), a `Preprocessor` with NLTK's English stopwords and a memo cache is created.
+            context_tokens (int | None): The token budget of the context sent to the model. The chunks that best match
+                the query are packed into it. When None (default), the `context_tokens` of the model is used.
+            index_cache (IndexCache | None): The cache of the BM25 indexes used to rank chunks against the query. When
+                None (default), a private `retrieval.IndexCache` is created.
+            http_client (HttpClient | None): The client that sends the search requests and page downloads, with pooled
+                connections, timeouts and retries. When None (default), one is created whose read timeout is
+                `page_timeout`.
+            blocking (converter.BlockingPolicy | None): The requests blocked while pages are rendered in "pdf" mode.
+                When None (default), `converter.DEFAULT_BLOCKING` blocks images, fonts, media and ad and tracking
+                domains.
+            hooks (Iterable[Callable[[Span], None]] | None): Callables receiving the `instrumentation.Span` of every
+                pipeline stage, such as an `instrumentation.StatsAggregator` (default is None, no instrumentation).
+            search_url (str): The template of the search request, with `{query}` and `{num}` placeholders for the
+                quoted query and the number of results. The result page must use Google's "/url?q=" links
+                (default is Google search).
+            fetcher (TieredFetcher | None): The per-host fetch decisions of the "tiered" extraction mode. Pass one with
+                a path to keep the learned decisions across runs. When None (default), an in-memory one is created.
+            hedge (int): The number of extra search results fetched by `get`, `aget` and `stream`. With a hedge of `k`,
+                `urls_count + k` sources are read at once and the first `urls_count` to return paragraphs are kept,
+                so a slow or failing site no longer holds up the query (default is 0, no hedging).
+            domain_health (DomainHealth | None): The registry recording the outcome of every source read per domain.
+                Search results from domains whose circuit is open are skipped, and degraded domains are read last.
+                Pass one with a path to keep it across runs. When None (default), an in-memory one is created.
+            single_flight (SingleFlight | None): The coalescing of concurrent identical requests: calls of `get` or
+                `aget` with the same normalized query, PDF document content and `urls_count`, and reads of the same
+                URL, share one execution while it is in flight. Share one only between instances with the same
+                model and settings. When None (default), a private one is created.
         
         Raises:
-            ValueError: If an invalid value for `model` is provided.
+            ValueError: If an invalid value for `model`, `extraction`, `generation` or `hedge` is provided.
 
         Returns:
             None
         """
         # Validate and set the language model
-        if model == "Palm2":
-            self.model = Palm2Model()
+        if isinstance(model, (Palm2Model, GeminiModel)):
+            self.model = model
+        elif model == "Palm2":
+            self.model = Palm2Model(cache=response_cache, strategy=generation)
         elif model == "GeminiPro":
-            self.model = GeminiModel()
+            self.model = GeminiModel(cache=response_cache, strategy=generation)
         else:
             raise ValueError("Invalid value for `model`. Available models are: [Palm2, GeminiPro]")
 
+        if extraction not in ("pdf", "html", "tiered"):
+            raise ValueError("Invalid value for `extraction`. Available modes are: [pdf, html, tiered]")
+
+        if hedge < 0:
+            raise ValueError("Invalid value for `hedge`. It must be 0 or more.")
+
         # Initialize the language model with the provided API key
         self.model.init(api_key=api_key)
 
-    def save_url_to_pdf(self, url: str, pdf_path: str) -> None:
+        self.browser_pool = browser_pool
+        self.max_workers = max_workers
+        self.page_timeout = page_timeout
+        self.deadline = deadline
+        self.extraction = extraction
+        self.workspace_root = workspace_root
+        self.content_cache = content_cache
+        self.search_cache = search_cache
+        self.preprocessor = preprocessor if preprocessor is not None else Preprocessor()
+        self.context_tokens = context_tokens if context_tokens is not None else self.model.context_tokens
+        self.index_cache = index_cache if index_cache is not None else IndexCache()
+        self.http_client = http_client if http_client is not None else HttpClient(read_timeout=page_timeout)
+        self.blocking = blocking
+        self.tracer = Tracer(hooks or ())
+        self.model.tracer = self.tracer
+        self.search_url = search_url
+        self.fetcher = fetcher if fetcher is not None else TieredFetcher()
+        self.hedge = hedge
+        self.domain_health = domain_health if domain_health is not None else DomainHealth()
+        self.single_flight = single_flight if single_flight is not None else SingleFlight()
+        self._hedge_counters = dict.fromkeys(
+            ("fetches", "candidates", "kept", "hedge_wins", "fetches_won_by_hedges", "short_fetches"), 0)
+        self._hedge_lock = threading.Lock()
+
+    def save_url_to_pdf(self, url: str, pdf_path: str) -> "converter.PageStats":
         """
         Downloads content from a URL and saves it as a PDF file.
 
         Parameters:
             url (str): The URL to download content from.
             pdf_path (str): The path to save the resulting PDF file.
+
+        Returns:
+            converter.PageStats: The requests made, bytes downloaded and requests blocked while loading the page.
+        """
+        from GoogleIt import converter
+
+        return converter.convert(url, pdf_path, pool=self.browser_pool, page_load_timeout=self.page_timeout,
+                                 blocking=self.blocking)
+
+    def fetch_sources(self, urls: list[str], domains: list[str], folder_path: str) -> list[str]:
+        """
+        Concurrently saves the given URLs as PDF files in a folder.
+
+        Up to `max_workers` URLs are rendered at once. Sources that fail, or that are still loading
+        when `deadline` expires, are dropped; stragglers are abandoned rather than awaited.
+
+        Parameters:
+            urls (list[str]): The URLs to save.
+            domains (list[str]): The domain name of each URL, used as the PDF file name.
+            folder_path (str): The folder to save the PDF files in.
+
+        Returns:
+            list[str]: The names of the PDF files that were saved in time, in the order of `urls`.
+        """
+        pdf_files = [domain + ".pdf" for domain in domains]
+        saved = self._run_concurrently(
+            lambda url, pdf_file: self.save_url_to_pdf(url=url, pdf_path=os.path.join(folder_path, pdf_file)),
+            list(zip(urls, pdf_files)),
+        )
+
+        return [pdf_file for (_, pdf_file), _ in saved]
+
+    def read_url(self, url: str) -> list[str]:
+        """
+        Downloads a URL and extracts its readable paragraphs from the HTML.
+
+        Parameters:
+            url (str): The URL to read.
+
+        Returns:
+            list[str]: The paragraphs of the page, with boilerplate removed.
+        """
+        page = self.http_client.get(url)
+        page.raise_for_status()
+        return extract_paragraphs_from_html(page.text)
+
+    async def aread_url(self, url: str, session) -> list[str]:
+        """
+        Asynchronous version of `read_url`. The paragraphs are extracted in an executor.
+
+        Parameters:
+            url (str): The URL to read.
+            session (aiohttp.ClientSession): The session to send the request with.
+
+        Returns:
+            list[str]: The paragraphs of the page, with boilerplate removed.
+        """
+        page = await self.http_client.aget(session, url)
+        page.raise_for_status()
+        html = await page.text(errors="replace")
+
+        return await self._in_executor(extract_paragraphs_from_html, html)
+
+    def render_url(self, url: str, domain: str, workspace: Workspace | None = None) -> list[str]:
+        """
+        Renders a URL to PDF in a browser and reads its paragraphs back through DOCX.
+
+        Parameters:
+            url (str): The URL to render.
+            domain (str): The domain name of the URL, used to name the intermediate files.
+            workspace (Workspace | None): The workspace to keep the intermediate files in. A temporary one is used when None.
+
+        Returns:
+            list[str]: The paragraphs of the page.
+        """
+        if workspace is None:
+            with Workspace(root=self.workspace_root) as workspace:
+                return self.render_url(url, domain, workspace)
+
+        pdf_path = workspace.file(domain + ".pdf")
+        with self.tracer.span("render", url=url) as span:
+            stats = self.save_url_to_pdf(url=url, pdf_path=pdf_path)
+            span.set(requests=stats.requests, bytes=stats.bytes_downloaded, blocked_requests=stats.blocked_requests,
+                     estimated_bytes_saved=stats.estimated_bytes_saved)
+
+        with self.tracer.span("extract_pdf", bytes=os.path.getsize(pdf_path)) as span:
+            paragraphs = extract_text_from_pdf(pdf_path=pdf_path, docx_path=domain + ".docx", workspace=workspace)[1]
+            span.set(paragraphs=len(paragraphs))
+
+        return paragraphs
+
+    def read_source(self, url: str, domain: str) -> list[str]:
+        """
+        Reads the paragraphs of a source with the configured extraction mode.
+
+        When a content cache is set, a fresh cache entry is returned without touching the network. An expired
+        entry carrying an ETag or Last-Modified header is revalidated with a conditional request, and kept when
+        the source answers 304 Not Modified. Newly read paragraphs are stored in the cache.
+
+        Concurrent reads of the same URL share one read through `single_flight`. Since the read may outlive the caller
+        that started it, pages are rendered in a temporary workspace owned by the read.
+
+        Parameters:
+            url (str): The URL of the source.
+            domain (str): The domain name of the URL.
+
+        Returns:
+            list[str]: The paragraphs of the source.
+        """
+        return self.single_flight.do(("source", url), self._read_source, url, domain)
+
+    def _read_source(self, url: str, domain: str) -> list[str]:
+        """Reads the paragraphs of a source, as `read_source` does, without coalescing."""
+        with self.tracer.span("read_source", url=url) as span:
+            entry = self.content_cache.lookup(url, mode=self.extraction) if self.content_cache is not None else None
+            if entry is not None and entry.fresh:
+                span.set(source="cache", paragraphs=len(entry.value))
+                return entry.value
+
+            etag = last_modified = None
+            start = time.perf_counter()
+
+            try:
+                if self.extraction == "pdf" or self.extraction == "tiered" and self.fetcher.prefers_browser(url):
+                    paragraphs = self.render_url(url, domain)
+                    span.set(source="render")
+                else:
+                    validators = entry.validators() if entry is not None else None
+                    page = self.http_client.get(url, headers=validators)
+
+                    if page.status_code == 304 and entry is not None:
+                        self.content_cache.revalidated(url, mode=self.extraction)
+                        span.set(source="revalidated", paragraphs=len(entry.value))
+                        self._record_health(url, start, entry.value)
+                        return entry.value
+
+                    reason = None
+                    if self.extraction == "tiered" and page.status_code in BLOCKED_STATUSES:
+                        paragraphs, reason = [], "blocked"
+                    else:
+                        page.raise_for_status()
+                        paragraphs = extract_paragraphs_from_html(page.text)
+                        etag, last_modified = page.headers.get("ETag"), page.headers.get("Last-Modified")
+                        if self.extraction == "tiered":
+                            reason = self.fetcher.needs_rendering(url, page.text, paragraphs)
+                    span.set(source="html", bytes=len(page.content))
+
+                    if self.extraction == "tiered":
+                        paragraphs = self._escalate(url, domain, paragraphs, reason, span)
+            except Exception:
+                self._record_health(url, start)
+                raise
+
+            self._record_health(url, start, paragraphs)
+            span.set(paragraphs=len(paragraphs))
+
+            if self.content_cache is not None and paragraphs:
+                self.content_cache.store(url, paragraphs, etag=etag, last_modified=last_modified,
+                                         mode=self.extraction)
+
+            return paragraphs
+
+    async def aread_source(self, url: str, domain: str, session) -> list[str]:
+        """
+        Asynchronous version of `read_source`. The browser work, in "pdf" mode and for the sources that "tiered" mode
+        renders, runs in an executor. Concurrent reads of the same URL in one event loop share one read, which renders
+        pages in a temporary workspace of its own.
+
+        Parameters:
+            url (str): The URL of the source.
+            domain (str): The domain name of the URL.
+            session (aiohttp.ClientSession): The session to send the request with.
+
+        Returns:
+            list[str]: The paragraphs of the source.
+        """
+        if self.extraction == "pdf":
+            return await self._in_executor(self.read_source, url, domain)
+
+        return await self.single_flight.ado(("source", url), self._aread_source, url, domain, session)
+
+    async def _aread_source(self, url: str, domain: str, session) -> list[str]:
+        """
+        Downloads and extracts the paragraphs of a source, as `aread_source` does, without coalescing. The content
+        cache and the domain health registry may write to disk, so they are called in the executor.
+        """
+        with self.tracer.span("read_source", url=url) as span:
+            entry = None
+            if self.content_cache is not None:
+                entry = await self._in_executor(self.content_cache.lookup, url, self.extraction)
+            if entry is not None and entry.fresh:
+                span.set(source="cache", paragraphs=len(entry.value))
+                return entry.value
+
+            etag = last_modified = None
+            start = time.perf_counter()
+
+            try:
+                if self.extraction == "tiered" and self.fetcher.prefers_browser(url):
+                    paragraphs = await self._in_executor(self.render_url, url, domain)
+                    span.set(source="render")
+                else:
+                    validators = entry.validators() if entry is not None else None
+                    page = await self.http_client.aget(session, url, headers=validators)
+                    if page.status == 304 and entry is not None:
+                        await self._in_executor(self.content_cache.revalidated, url, self.extraction)
+                        span.set(source="revalidated", paragraphs=len(entry.value))
+                        await self._in_executor(self._record_health, url, start, entry.value)
+                        return entry.value
+
+                    reason = None
+                    if self.extraction == "tiered" and page.status in BLOCKED_STATUSES:
+                        paragraphs, reason = [], "blocked"
+                    else:
+                        page.raise_for_status()
+                        html = await page.text(errors="replace")
+                        etag, last_modified = page.headers.get("ETag"), page.headers.get("Last-Modified")
+
+                        paragraphs = await self._in_executor(extract_paragraphs_from_html, html)
+                        if self.extraction == "tiered":
+                            reason = self.fetcher.needs_rendering(url, html, paragraphs)
+                    content = await page.read()
+                    span.set(source="html", bytes=len(content))
+
+                    if self.extraction == "tiered":
+                        paragraphs = await self._in_executor(self._escalate, url, domain, paragraphs, reason, span)
+            except Exception:
+                await self._in_executor(self._record_health, url, start)
+                raise
+
+            await self._in_executor(self._record_health, url, start, paragraphs)
+            span.set(paragraphs=len(paragraphs))
+
+            if self.content_cache is not None and paragraphs:
+                await self._in_executor(self.content_cache.store, url, paragraphs, etag, last_modified,
+                                        self.extraction)
+
+            return paragraphs
+
+    def _record_health(self, url: str, start: float, paragraphs: list[str] | None = None) -> None:
+        """
+        Records a source read that started at `start` with the domain health registry, under the host name of its URL.
+        None means it failed.
+        """
+        self.domain_health.record(host_of(url), time.perf_counter() - start, paragraphs is not None,
+                                  count_words(paragraphs or []))
+
+    def _escalate(self, url: str, domain: str, paragraphs: list[str], reason: str | None, span) -> list[str]:
+        """
+        In "tiered" mode, renders a downloaded source when `reason` says its HTML lacks the content, keeps whichever
+        paragraphs hold more words, and lets the fetcher learn the outcome. A failed rendering keeps the downloaded
+        paragraphs, unless there are none.
+        """
+        if reason is None:
+            self.fetcher.record(url, "http")
+            return paragraphs
+
+        try:
+            rendered = self.render_url(url, domain)
+        except Exception:
+            if not paragraphs:
+                raise
+            rendered = []
+
+        helped = count_words(rendered) > count_words(paragraphs)
+        self.fetcher.record(url, "rendered" if helped else "unhelpful")
+        span.set(escalated=reason, source="render" if helped else "html")
+        return rendered if helped else paragraphs
+
+    def fetch_paragraphs(self, urls: list[str], domains: list[str], keep: int | None = None) -> list[str]:
+        """
+        Concurrently reads the given sources with `read_source` and collects their paragraphs.
+
+        Like `fetch_sources`, up to `max_workers` sources are read at once and sources that fail or miss
+        the `deadline` are dropped.
+
+        With `keep`, the fetch is hedged: all the sources are read at once, and reading stops as soon as `keep` of them
+        have returned paragraphs. The other sources are cancelled, or abandoned if they are already being read.
+
+        Parameters:
+            urls (list[str]): The URLs to read.
+            domains (list[str]): The domain name of each URL.
+            keep (int | None): The number of sources to keep, or None to wait for all of them (default is None).
+
+        Returns:
+            list[str]: The paragraphs of the sources that were read in time, in the order of `urls`.
+        """
+        arguments = list(zip(urls, domains))
+        read = sorted(self._iter_sources(arguments, keep), key=lambda item: item[0])
+
+        return [paragraph for _, _, paragraphs in read for paragraph in paragraphs]
+
+    async def afetch_paragraphs(self, urls: list[str], domains: list[str], session,
+                                keep: int | None = None) -> list[str]:
+        """
+        Asynchronous version of `fetch_paragraphs`, with the same worker limit, deadline and hedging.
+
+        Parameters:
+            urls (list[str]): The URLs to read.
+            domains (list[str]): The domain name of each URL.
+            session (aiohttp.ClientSession): The session to send the requests with.
+            keep (int | None): The number of sources to keep, or None to wait for all of them (default is None).
+
+        Returns:
+            list[str]: The paragraphs of the sources that were read in time, in the order of `urls`.
+        """
+        if not urls:
+            return []
+
+        hedged = keep is not None and keep < len(urls)
+        workers = asyncio.Semaphore(max(self.max_workers, len(urls)) if hedged else self.max_workers)
+
+        async def read(url: str, domain: str) -> list[str]:
+            async with workers:
+                return await self.aread_source(url, domain, session)
+
+        tasks = [asyncio.ensure_future(read(url, domain)) for url, domain in zip(urls, domains)]
+
+        if not hedged:
+            done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+            for task in pending:
+                task.cancel()
+            return [paragraph for task in tasks if task in done and task.exception() is None
+                    for paragraph in task.result()]
+
+        loop = asyncio.get_running_loop()
+        end = None if self.deadline is None else loop.time() + self.deadline
+        pending, kept = set(tasks), []
+        while pending and len(kept) < keep:
+            timeout = None if end is None else max(end - loop.time(), 0)
+            done, pending = await asyncio.wait(pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            kept.extend(sorted(index for index, task in enumerate(tasks)
+                               if task in done and task.exception() is None and task.result()))
+        for task in pending:
+            task.cancel()
+
+        kept = kept[:keep]
+        self._record_hedge(keep, len(tasks), kept)
+        return [paragraph for index in sorted(kept) for paragraph in tasks[index].result()]
+
+    def _in_executor(self, function, *args) -> asyncio.Future:
+        """
+        Calls `function(*args)` in the default executor of the running event loop, in a copy of the current context,
+        so that the spans it opens are children of the span of the caller, as in `_run_concurrently`.
+        """
+        loop = asyncio.get_running_loop()
+        return loop.run_in_executor(None, contextvars.copy_context().run, function, *args)
+
+    def _run_concurrently(self, function, arguments: list[tuple]) -> list[tuple]:
+        """
+        Calls `function` with each tuple of `arguments` on up to `max_workers` threads.
+
+        Returns the (arguments, result) pairs of the calls that succeeded before `deadline`, in input order.
+        Calls still running at the deadline are abandoned rather than awaited.
+        """
+        completed = sorted(self._iter_concurrently(function, arguments), key=lambda item: item[0])
+
+        return [(args, result) for _, args, result in completed]
+
+    def _iter_concurrently(self, function, arguments: list[tuple], workers: int | None = None) -> Iterator[tuple]:
+        """
+        Like `_run_concurrently`, but yields the (index, arguments, result) triples as the calls complete.
+        `workers` overrides `max_workers`. Calls not yet started when the iteration stops are cancelled. Calls already
+        running cannot be interrupted: a render keeps its browser tab until its page loads or `page_timeout` expires.
+        """
+        executor = ThreadPoolExecutor(max_workers=workers or self.max_workers)
+        # Each call runs in a copy of the caller's context, so its spans are nested in the caller's span
+        futures = {executor.submit(contextvars.copy_context().run, function, *args): index
+                   for index, args in enumerate(arguments)}
+
+        try:
+            for future in as_completed(futures, timeout=self.deadline):
+                if future.exception() is None:
+                    index = futures[future]
+                    yield index, arguments[index], future.result()
+        except FuturesTimeoutError:
+            pass
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _iter_sources(self, arguments: list[tuple], keep: int | None = None) -> Iterator[tuple]:
+        """
+        Reads sources with `read_source` and yields the (index, arguments, paragraphs) triples as they complete.
+
+        With `keep` smaller than the number of sources, the read is hedged: every source is read at once, only sources
+        with paragraphs are yielded, and the iteration stops after `keep` of them.
+        """
+        if keep is None or keep >= len(arguments):
+            yield from self._iter_concurrently(self.read_source, arguments)
+            return
+
+        kept = []
+        with closing(self._iter_concurrently(self.read_source, arguments,
+                                             workers=max(self.max_workers, len(arguments)))) as completed:
+            for index, args, paragraphs in completed:
+                if not paragraphs:
+                    continue
+                kept.append(index)
+                yield index, args, paragraphs
+                if len(kept) == keep:
+                    break
+
+        self._record_hedge(keep, len(arguments), kept)
+
+    def _record_hedge(self, keep: int, candidates: int, kept: list[int]) -> None:
+        """Counts a hedged fetch in `hedge_stats`. `kept` holds the positions of the kept sources in the search results."""
+        wins = sum(index >= keep for index in kept)
+        with self._hedge_lock:
+            self._hedge_counters["fetches"] += 1
+            self._hedge_counters["candidates"] += candidates
+            self._hedge_counters["kept"] += len(kept)
+            self._hedge_counters["hedge_wins"] += wins
+            self._hedge_counters["fetches_won_by_hedges"] += wins > 0
+            self._hedge_counters["short_fetches"] += len(kept) < keep
+
+    def hedge_stats(self) -> dict:
         """
-        converter.convert(url, pdf_path)
+        Returns the counters of the hedged fetches.
+
+        Returns:
+            dict: The number of hedged fetches, of candidate sources started, of sources kept, of kept sources that were
+            hedges (ranked after the first `urls_count` search results), of fetches in which at least one hedge was
+            kept, and of fetches that ended with fewer than `urls_count` sources, with the share of fetches won by
+            hedges as "win_rate".
+        """
+        with self._hedge_lock:
+            stats = dict(self._hedge_counters)
+        stats["win_rate"] = stats["fetches_won_by_hedges"] / stats["fetches"] if stats["fetches"] else 0.0
+        return stats
 
     def preprocess_text(self, text: str) -> str:
         """
@@ -123,10 +814,7 @@ class GoogleIt:
         Returns:
             str: The preprocessed text.
         """
-        tokens = word_tokenize(text.lower())
-        stop_words = set(stopwords.words('english'))
-        tokens = [token for token in tokens if token.isalnum() and token not in stop_words]
-        return ' '.join(tokens)
+        return self.preprocessor.preprocess(text)
 
     def get_domain_name(self, url: str) -> str:
         """
@@ -148,23 +836,111 @@ class GoogleIt:
         """
         Retrieves top URLs from Google search results based on a given query.
 
+        All the results of the page are parsed and cached, and `urls_count` of them are picked with the domain health
+        registry: results from domains whose circuit is open are skipped, and degraded domains are ranked last.
+
+        Parameters:
+            query (str): The search query.
+            urls_count (int): The number of URLs to retrieve (default is 5).
+
+        Returns:
+            tuple[list[str], list[str]]: A tuple containing lists of URLs and corresponding domain names.
+        """
+        cached = self.search_cache.get(query, urls_count) if self.search_cache is not None else None
+        if cached is not None:
+            return self._pick_sources(*cached, urls_count)
+
+        with self.tracer.span("search", urls_count=urls_count) as span:
+            page = self.http_client.get(self._search_url(query, urls_count))
+            page.raise_for_status()
+            urls, domains = self.parse_search_results(page.content, self._candidates_count(urls_count))
+            span.set(bytes=len(page.content), urls=len(urls))
+
+        if self.search_cache is not None and urls:
+            self.search_cache.put(query, urls_count, urls, domains)
+
+        return self._pick_sources(urls, domains, urls_count)
+
+    async def aget_top_urls(self, query: str, urls_count: int = 5, session=None) -> tuple[list[str], list[str]]:
+        """
+        Asynchronous version of `get_top_urls`. The result page is parsed, and the search cache read and written, in an
+        executor.
+
         Parameters:
             query (str): The search query.
             urls_count (int): The number of URLs to retrieve (default is 5).
+            session (aiohttp.ClientSession | None): The session to send the request with. A new one is opened when None.
 
         Returns:
             tuple[list[str], list[str]]: A tuple containing lists of URLs and corresponding domain names.
         """
-        results = 5 * urls_count
-        page = requests.get(f"https://www.google.com/search?q={query}&num={results}")
-        soup = BeautifulSoup(page.content, "lxml")
+        cached = None
+        if self.search_cache is not None:
+            cached = await self._in_executor(self.search_cache.get, query, urls_count)
+        if cached is not None:
+            return self._pick_sources(*cached, urls_count)
+
+        if session is None:
+            async with self._client_session() as session:
+                return await self._asearch(query, urls_count, session)
+
+        return await self._asearch(query, urls_count, session)
+
+    async def _asearch(self, query: str, urls_count: int, session) -> tuple[list[str], list[str]]:
+        """Sends the search request of `aget_top_urls`, after its cache lookup missed, and caches the results."""
+        with self.tracer.span("search", urls_count=urls_count) as span:
+            page = await self.http_client.aget(session, self._search_url(query, urls_count))
+            page.raise_for_status()
+            content = await page.read()
+
+            urls, domains = await self._in_executor(self.parse_search_results, content,
+                                                    self._candidates_count(urls_count))
+            span.set(bytes=len(content), urls=len(urls))
+
+        if self.search_cache is not None and urls:
+            await self._in_executor(self.search_cache.put, query, urls_count, urls, domains)
+
+        return self._pick_sources(urls, domains, urls_count)
+
+    def _search_url(self, query: str, urls_count: int) -> str:
+        """Builds the search URL, asking for more results than needed so domains can be de-duplicated."""
+        return self.search_url.format(query=quote_plus(query), num=self._candidates_count(urls_count))
+
+    def _candidates_count(self, urls_count: int) -> int:
+        """The number of search results requested and parsed, leaving room for duplicate and unhealthy domains."""
+        return 5 * urls_count
+
+    def _pick_sources(self, urls: list[str], domains: list[str], urls_count: int) -> tuple[list[str], list[str]]:
+        """
+        Picks the `urls_count` search results to read with the domain health registry, skipping the domains whose
+        circuit is open and ranking degraded ones last. When every domain is skipped, the top results are read anyway.
+        """
+        picked = self.domain_health.rank(urls, domains, urls_count)
+        if not picked[0] and urls:
+            return urls[:urls_count], domains[:urls_count]
+        return picked
+
+    def parse_search_results(self, content: bytes | str, urls_count: int = 5) -> tuple[list[str], list[str]]:
+        """
+        Extracts the top result URLs from a Google search result page, keeping one URL per domain.
+
+        Parameters:
+            content (bytes | str): The HTML of the search result page.
+            urls_count (int): The number of URLs to extract (default is 5).
+
+        Returns:
+            tuple[list[str], list[str]]: A tuple containing lists of URLs and corresponding domain names.
+        """
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, "lxml")
         links = soup.findAll("a")
         c = 0
 
         urls: list[str] = []
         domain_list: list[str] = []
         for link in links:
-            link_href = link.get('href')
+            link_href = link.get('href') or ""
             if "url?q=" in link_href and not "webcache" in link_href:
                 l = link.get('href').split("?q=")[1].split("&sa=U")[0]
                 domain = self.get_domain_name(l)
@@ -179,24 +955,35 @@ class GoogleIt:
 
         return urls, domain_list
 
-    def combine_pdf(self, folder_path: str) -> str:
+    def combine_pdf(self, folder_path: str, pdf_files: list[str] | None = None, workspace: Workspace | None = None) -> str:
         """
         Combines multiple PDF files into a single merged PDF.
 
         Parameters:
             folder_path (str): The path to the folder containing PDF files.
+            pdf_files (list[str] | None): The names of the PDF files in the folder to combine, in order.
+                When None (default), every PDF file in the folder is combined.
+            workspace (Workspace | None): The workspace to write the merged PDF in. When None (default),
+                it is written to "merged.pdf" in the current directory.
 
         Returns:
             str: The path to the merged PDF file.
         """
-        merged_pdf_path = "merged.pdf"
+        from PyPDF2 import PdfMerger
+
+        merged_pdf_path = workspace.file("merged.pdf") if workspace is not None else "merged.pdf"
         merger = PdfMerger()
 
-        for pdf_file in os.listdir(folder_path):
-            if pdf_file.endswith(".pdf"):
+        if pdf_files is None:
+            pdf_files = [pdf_file for pdf_file in os.listdir(folder_path) if pdf_file.endswith(".pdf")]
+
+        with self.tracer.span("combine_pdf", files=len(pdf_files)) as span:
+            for pdf_file in pdf_files:
                 merger.append(os.path.join(folder_path, pdf_file))
 
-        merger.write(merged_pdf_path)
+            merger.write(merged_pdf_path)
+            span.set(bytes=os.path.getsize(merged_pdf_path))
+
         return merged_pdf_path
 
     def extract_relevant_content(self, input_text: str, main_document: str, threshold: float = 0.2) -> str:
@@ -211,6 +998,9 @@ class GoogleIt:
         Returns:
             str: The relevant content if similarity is above the threshold; otherwise, None.
         """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        from sklearn.metrics.pairwise import cosine_similarity
+
         preprocessed_input = self.preprocess_text(input_text)
         preprocessed_main_doc = self.preprocess_text(main_document)
 
@@ -227,33 +1017,141 @@ class GoogleIt:
         else:
             return None
 
-    def with_document(self, query: str, google_doc: str, pdf_path: str) -> str:
+    def score_relevance(self, chunks: list[str], main_document: str) -> "np.ndarray":
+        """
+        Computes the cosine similarity of every chunk with the main document.
+
+        The scores are identical to those of `extract_relevant_content`, which fits a TF-IDF vectorizer on each
+        (chunk, main document) pair. In a two-document fit a term found in both documents gets an idf of 1 and
+        a term found in only one gets 1 + ln(3/2), so every pairwise score can be derived from raw term counts.
+        The main document is preprocessed once, the terms of all chunks are counted in a single pass, and all
+        scores come out of a few sparse matrix products.
+
+        Parameters:
+            chunks (list[str]): The chunks to score.
+            main_document (str): The main document for comparison.
+
+        Returns:
+            numpy.ndarray: The similarity score of each chunk, in the order of `chunks`.
+        """
+        import numpy as np
+        from sklearn.feature_extraction.text import CountVectorizer
+
+        preprocessed_chunks = self.preprocessor.preprocess_many(chunks)
+        preprocessed_main_doc = self.preprocess_text(main_document)
+
+        try:
+            counts = CountVectorizer().fit_transform(preprocessed_chunks + [preprocessed_main_doc])
+        except ValueError:
+            # No chunk and not the main document contain a single term
+            return np.zeros(len(chunks))
+
+        counts = counts.astype(np.float64).tocsr()
+        chunk_counts = counts[:-1]
+        doc_counts = counts[-1].toarray().ravel()
+
+        shared_idf = 1.0
+        unique_idf = 1.0 + np.log(1.5)
+
+        # Only terms present in both documents contribute to the dot product
+        dot = chunk_counts @ doc_counts
+
+        # Squared norms of the TF-IDF vectors: a term's idf depends on whether the other document has it
+        chunk_idf = np.where(doc_counts > 0, shared_idf, unique_idf)
+        chunk_norms = chunk_counts.multiply(chunk_counts) @ (chunk_idf ** 2)
+
+        squared_doc_counts = doc_counts ** 2
+        shared_doc_mass = (chunk_counts > 0).astype(np.float64) @ squared_doc_counts
+        doc_norms = unique_idf ** 2 * squared_doc_counts.sum() - (unique_idf ** 2 - shared_idf ** 2) * shared_doc_mass
+
+        norms = np.sqrt(chunk_norms * doc_norms)
+        scores = np.zeros(len(chunks))
+        np.divide(dot, norms, out=scores, where=norms > 0)
+
+        return scores
+
+    def extract_relevant_chunks(self, chunks: list[str], main_document: str, threshold: float = 0.2) -> list[str]:
+        """
+        Extracts the chunks that are relevant to the main document.
+
+        Returns the same chunks as calling `extract_relevant_content` on every chunk, but scores them all at once
+        with `score_relevance`.
+
+        Parameters:
+            chunks (list[str]): The chunks to filter.
+            main_document (str): The main document for comparison.
+            threshold (float): The similarity threshold (default is 0.2).
+
+        Returns:
+            list[str]: The chunks whose similarity is at or above the threshold, in their original order.
+        """
+        scores = self.score_relevance(chunks, main_document)
+        return [chunk for chunk, score in zip(chunks, scores) if chunk and score >= threshold]
+
+    def retrieve_chunks(self, query: str, chunks: list[str], k: int = 5) -> list[str]:
+        """
+        Retrieves the chunks that best match a query, ranked with BM25.
+
+        The index of the chunks is kept in `index_cache`, so follow-up queries on the same chunks only score the query.
+
+        Parameters:
+            query (str): The query.
+            chunks (list[str]): The chunks to search, such as the output of `text_processor.get_chunks`.
+            k (int): The maximum number of chunks to return (default is 5).
+
+        Returns:
+            list[str]: The best chunks, from the most relevant to the least.
+        """
+        index = self.index_cache.get_or_build(chunks, self.preprocessor)
+        return [chunks[position] for position in index.top_k(query, k)]
+
+    def with_document(self, query: str, google_doc: str, pdf_path: str, workspace: Workspace | None = None) -> str:
         """
         Processes a query using a provided PDF document and a Google document.
 
         Parameters:
             query (str): The query to process.
-            google_doc (str): The Google document content.
+            google_doc (str): The Google document content, one paragraph per line. Each line is a chunk that is
+                ranked and packed on its own.
             pdf_path (str): The path to the PDF document.
+            workspace (Workspace | None): The workspace to convert the PDF document in. A temporary one is used when
+                None.
 
         Returns:
             str: The response to the query.
         """
-        input_doc = extract_text_from_pdf(pdf_path=pdf_path)[0]
+        docs = self._with_document_context(google_doc=google_doc, pdf_path=pdf_path, workspace=workspace, query=query)
+
+        response = self.model.query(document=docs, question=query)
+
+        return response
+
+    def _with_document_context(self, google_doc: str, pdf_path: str, workspace: Workspace | None = None,
+                               input_doc: str | None = None, query: str | None = None) -> str:
+        """
+        Builds the model context from the parts of the Google document relevant to the PDF document.
+        `input_doc` is the text of the PDF document when it has already been extracted.
+        """
+        if input_doc is None:
+            input_doc = self._extract_document(pdf_path, workspace)
         chunks = google_doc.split("\n")
-        docs = ""
-        relevant_chunks: list[str] = []
 
-        for chunk in chunks:
-            relevant_content = self.extract_relevant_content(chunk, input_doc, threshold=0.2)
-            if relevant_content:
-                relevant_chunks.append(relevant_content)
+        with self.tracer.span("relevance", chunks=len(chunks)) as span:
+            relevant_chunks = self.extract_relevant_chunks(chunks, input_doc, threshold=0.2)
+            span.set(relevant_chunks=len(relevant_chunks))
 
-        docs = "".join(relevant_chunks)[:49000]
+        return self._pack_context(relevant_chunks, query)
 
-        response = self.model.query(document=docs, question=query)
+    def _extract_document(self, pdf_path: str, workspace: Workspace | None = None) -> str:
+        """Extracts the text of the PDF document of a query, in a temporary workspace when none is given."""
+        if workspace is None:
+            with Workspace(root=self.workspace_root) as workspace:
+                return self._extract_document(pdf_path, workspace)
 
-        return response
+        with self.tracer.span("extract_pdf", bytes=os.path.getsize(pdf_path)) as span:
+            text = extract_text_from_pdf(pdf_path=pdf_path, docx_path="document.docx", workspace=workspace)[0]
+            span.set(characters=len(text))
+        return text
 
     def without_document(self, query: str, paragraphs: list[str]) -> str:
         """
@@ -266,15 +1164,30 @@ class GoogleIt:
         Returns:
             str: The response to the query.
         """
-        chunks = get_chunks(paragraphs=paragraphs)
-        document = "".join(chunks)[:49000]
+        document = self._without_document_context(paragraphs=paragraphs, query=query)
         response = self.model.query(document=document, question=query)
         return response
 
+    def _without_document_context(self, paragraphs: list[str], query: str | None = None) -> str:
+        """Builds the model context from the source paragraphs alone."""
+        chunks = get_chunks(paragraphs=paragraphs)
+        return self._pack_context(chunks, query)
+
+    def _pack_context(self, chunks: list[str], query: str | None = None) -> str:
+        """Packs the chunks that best match the query into `context_tokens` tokens."""
+        with self.tracer.span("pack_context", chunks=len(chunks), token_budget=self.context_tokens) as span:
+            scores = self.index_cache.get_or_build(chunks, self.preprocessor).scores(query) if query else None
+            context = pack_context(chunks, token_budget=self.context_tokens, scores=scores)
+            span.set(tokens=estimate_tokens(context))
+        return context
+
     def get(self, query: str, pdf_path: str | None = None, urls_count: int = 5) -> str:
         """
         Main function to retrieve information based on a query, optionally using a PDF document.
 
+        Concurrent calls with the same normalized query, PDF document content and `urls_count` share one execution
+        through `single_flight`, and all receive its answer.
+
         Parameters:
             query (str): The query to process.
             pdf_path (str | None): The path to the PDF document (optional).
@@ -283,28 +1196,173 @@ class GoogleIt:
         Returns:
             str: The response to the query.
         """
-        urls, domains = self.get_top_urls(query=query, urls_count=urls_count)
-        folder_path = "PDFFiles"
+        key = self._query_key(query, file_digest(pdf_path) if pdf_path is not None else None, urls_count)
+        return self.single_flight.do(key, self._get, query, pdf_path, urls_count)
 
-        try:
-            shutil.rmtree(folder_path, ignore_errors=True)
-        except FileNotFoundError:
-            pass
+    def _get(self, query: str, pdf_path: str | None = None, urls_count: int = 5) -> str:
+        """Answers a query, as `get` does, without coalescing."""
+        with self.tracer.span("query", urls_count=urls_count, with_document=pdf_path is not None):
+            urls, domains = self.get_top_urls(query=query, urls_count=urls_count + self.hedge)
+
+            paragraphs = self.fetch_paragraphs(urls=urls, domains=domains, keep=urls_count if self.hedge else None)
+
+            if pdf_path is not None:
+                response = self.with_document(query=query, google_doc="\n".join(paragraphs), pdf_path=pdf_path)
+            else:
+                response = self.without_document(query=query, paragraphs=paragraphs)
+
+            return response
+
+    def get_many(self, queries: list[str], pdf_path: str | None = None, urls_count: int = 5,
+                 model_workers: int = 2) -> list:
+        """
+        Answers many queries at once, sharing the work they have in common.
+
+        The searches run concurrently on up to `max_workers` threads. The URLs found for all queries are then
+        de-duplicated, so a page that several queries share is fetched and extracted once, and read in a single
+        fetch stage bounded by `deadline`. Finally the model is queried for up to `model_workers` queries at a time.
+        The PDF document, when given, is extracted once for the whole batch.
+
+        A query whose search or model call fails does not affect the others: its exception is returned in place
+        of its answer.
+
+        Parameters:
+            queries (list[str]): The queries to process.
+            pdf_path (str | None): The path to a PDF document used for every query (optional).
+            urls_count (int): The number of URLs to consider per query (default is 5).
+            model_workers (int): The maximum number of concurrent model calls (default is 2).
+
+        Returns:
+            list[str | Exception]: The response to each query, or the exception it raised, in the order of `queries`.
+        """
+        if not queries:
+            return []
 
-        # Create an empty folder with the same name
-        os.mkdir(folder_path)
+        results: list = [None] * len(queries)
 
-        for url, domain in zip(urls, domains):
-            pdf_path = "PDFFiles/" + domain + ".pdf"
-            self.save_url_to_pdf(url=url, pdf_path=pdf_path)
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            searches = [executor.submit(self.get_top_urls, query=query, urls_count=urls_count) for query in queries]
 
-        combined_path = self.combine_pdf("PDFFiles")
+        sources: dict[str, str] = {}
+        for index, search in enumerate(searches):
+            if search.exception() is not None:
+                results[index] = search.exception()
+                continue
+            for url, domain in zip(*search.result()):
+                sources.setdefault(url, domain)
 
-        pdf_text, paragraphs = extract_text_from_pdf(pdf_path=combined_path)
+        arguments = list(sources.items())
+        read = {url: paragraphs for (url, _), paragraphs in self._run_concurrently(self.read_source, arguments)}
+
+        input_doc = self._extract_document(pdf_path) if pdf_path is not None else None
+
+        def answer(query: str, urls: list[str]) -> str:
+            with self.tracer.span("query", urls_count=urls_count, with_document=input_doc is not None):
+                paragraphs = [paragraph for url in urls for paragraph in read.get(url, [])]
+                if input_doc is not None:
+                    document = self._with_document_context("\n".join(paragraphs), pdf_path, input_doc=input_doc,
+                                                           query=query)
+                else:
+                    document = self._without_document_context(paragraphs, query=query)
+                return self.model.query(document=document, question=query)
+
+        with ThreadPoolExecutor(max_workers=model_workers) as executor:
+            answers = {index: executor.submit(answer, query, search.result()[0])
+                       for index, (query, search) in enumerate(zip(queries, searches)) if results[index] is None}
+
+        for index, future in answers.items():
+            results[index] = future.exception() if future.exception() is not None else future.result()
+
+        return results
+
+    def stream(self, query: str, pdf_path: str | None = None, urls_count: int = 5) -> Iterator:
+        """
+        Streaming version of `get`, yielding an event from the `events` module as each step completes.
+
+        The events are, in order: one `UrlsFound`, one `SourceReady` per source read before the deadline (in the order
+        the sources finish), one `RelevanceFiltered`, an `AnswerToken` per piece of the answer streamed by the model,
+        and a final `AnswerDone` holding the full answer. The model streams its first answer and does not redraft it,
+        so the answer is the one `get` returns with the "single" generation strategy.
+
+        Parameters:
+            query (str): The query to process.
+            pdf_path (str | None): The path to the PDF document (optional).
+            urls_count (int): The number of URLs to consider (default is 5).
+
+        Yields:
+            UrlsFound | SourceReady | RelevanceFiltered | AnswerToken | AnswerDone: The next event.
+        """
+        urls, domains = self.get_top_urls(query=query, urls_count=urls_count + self.hedge)
+        yield UrlsFound(urls=urls, domains=domains)
+
+        read = {}
+        keep = urls_count if self.hedge else None
+        for index, (url, domain), source_paragraphs in self._iter_sources(list(zip(urls, domains)), keep):
+            read[index] = source_paragraphs
+            yield SourceReady(url=url, domain=domain, paragraphs=source_paragraphs)
+
+        paragraphs = [paragraph for index in sorted(read) for paragraph in read[index]]
 
         if pdf_path is not None:
-            response = self.with_document(query=query, google_doc=pdf_text, pdf_path=pdf_path)
+            document = self._with_document_context("\n".join(paragraphs), pdf_path, query=query)
         else:
-            response = self.without_document(query=query, paragraphs=paragraphs)
+            document = self._without_document_context(paragraphs, query=query)
+
+        yield RelevanceFiltered(sources=len(read), context_length=len(document))
+
+        pieces = []
+        for piece in self.model.stream_query(document=document, question=query):
+            pieces.append(piece)
+            yield AnswerToken(text=piece)
+
+        yield AnswerDone(answer="".join(pieces))
+
+    async def aget(self, query: str, pdf_path: str | None = None, urls_count: int = 5) -> str:
+        """
+        Asynchronous version of `get`, for serving many queries from one event loop.
+
+        The search and, in "html" and "tiered" extraction modes, the page downloads go through aiohttp, and the model is
+        queried through its async API. Blocking or CPU-bound steps (parsing, PDF rendering and conversion,
+        relevance scoring) run in the event loop's default executor, so the loop itself never blocks. Concurrent calls
+        in one event loop with the same normalized query, PDF document content and `urls_count` share one execution.
+
+        Parameters:
+            query (str): The query to process.
+            pdf_path (str | None): The path to the PDF document (optional).
+            urls_count (int): The number of URLs to consider (default is 5).
+
+        Returns:
+            str: The response to the query.
+
+        Raises:
+            ImportError: If aiohttp is not installed.
+        """
+        digest = await self._in_executor(file_digest, pdf_path) if pdf_path is not None else None
+        return await self.single_flight.ado(self._query_key(query, digest, urls_count), self._aget, query, pdf_path,
+                                            urls_count)
+
+    async def _aget(self, query: str, pdf_path: str | None = None, urls_count: int = 5) -> str:
+        """Answers a query, as `aget` does, without coalescing."""
+        with self.tracer.span("query", urls_count=urls_count, with_document=pdf_path is not None):
+            async with self._client_session() as session:
+                urls, domains = await self.aget_top_urls(query=query, urls_count=urls_count + self.hedge,
+                                                         session=session)
+
+                paragraphs = await self.afetch_paragraphs(urls=urls, domains=domains, session=session,
+                                                          keep=urls_count if self.hedge else None)
+
+                if pdf_path is not None:
+                    document = await self._in_executor(self._with_document_context, "\n".join(paragraphs), pdf_path,
+                                                       None, None, query)
+                else:
+                    document = await self._in_executor(self._without_document_context, paragraphs, query)
+
+            return await self.model.aquery(document=document, question=query)
+
+    def _query_key(self, query: str, pdf_digest: str | None, urls_count: int) -> tuple:
+        """The key under which identical concurrent queries are coalesced."""
+        return "query", normalize_query(query), pdf_digest, urls_count
 
-        return response
\ No newline at end of file
+    def _client_session(self):
+        """Opens an aiohttp session with the connection limits and timeouts of `http_client`."""
+        return self.http_client.async_session()
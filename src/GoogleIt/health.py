@@ -0,0 +1,327 @@
+"""
+GoogleIt Health Module
+
+This module keeps track of how well each domain serves its pages, so that `GoogleIt` stops picking sources that
+always time out, fail or return a paywall or CAPTCHA page instead of content.
+
+`DomainHealth` records the outcome of every source read: its latency, whether it failed, and how many words of
+content it yielded. A read that fails or yields fewer than `min_words` words, as paywalls, CAPTCHAs and cookie walls
+do, counts as a failure. Each domain keeps its latest `window` outcomes, and behind them a circuit breaker:
+    - closed: the domain is used. Once it has `min_samples` outcomes of which `failure_threshold` or more failed, the
+      circuit opens.
+    - open: the domain is skipped by `get_top_urls`. After `cooldown` seconds, one query may use it again as a probe.
+    - half-open: a successful probe closes the circuit and clears the outcomes, a failed one opens it again.
+Domains whose failure rate is half the threshold or more, or whose mean latency exceeds `slow_latency`, are
+degraded: they are kept, but ranked after the healthy ones.
+
+Domains are keyed by host name, as returned by `fetcher.host_of`, such as "en.wikipedia.org": sites sharing a first
+label, like "en.wikipedia.org" and "en.example.com", have separate circuits. `GoogleIt.get_domain_name` only names the
+files of the sources. When a path is given, the outcomes and circuits are saved to a JSON file and loaded by the next
+run.
+
+Usage:
+    - Import the module: `from GoogleIt.health import DomainHealth`
+    - Pass a `DomainHealth` to `GoogleIt`, or let it create one in memory.
+
+Example:
+    ```python
+    health = DomainHealth(failure_threshold=0.5, cooldown=3600, path=".googleit-health.json")
+    google_it = GoogleIt(api_key='your_api_key_here', domain_health=health)
+    google_it.get(query="How does photosynthesis work?")
+    print(health.report())  # {'example.com': {'samples': 1, 'failure_rate': 0.0, 'state': 'closed', ...}, ...}
+    ```
+
+Classes:
+    - `DomainHealth(window: int = 20, min_samples: int = 3, failure_threshold: float = 0.5, cooldown: float = 600, min_words: int = 50, slow_latency: float = 10, path: str | None = None)`:
+        - Rolling per-domain source statistics with a circuit breaker.
+        - Methods:
+            - `record(self, domain: str, latency: float, ok: bool, words: int = 0) -> None`: Records the outcome of a source read.
+            - `allows(self, domain: str) -> bool`: Whether the domain may be used, letting one probe through an open circuit after the cooldown.
+            - `is_degraded(self, domain: str) -> bool`: Whether the domain should be ranked after the healthy ones.
+            - `rank(self, urls: list[str], domains: list[str], count: int) -> tuple[list[str], list[str]]`: Drops the sources of open circuits and ranks degraded ones last, keeping `count` of them. URLs are matched to their domain by host name.
+            - `state(self, domain: str) -> str`: Returns "closed", "open" or "half-open".
+            - `report(self) -> dict`: Returns the statistics and circuit state of every domain.
+            - `stats(self) -> dict`: Returns the number of sources skipped and deprioritized, and of circuits opened.
+            - `save(self) -> None`: Writes the outcomes and circuits to the JSON file.
+"""
+
+
+import json
+import os
+import threading
+import time
+from collections import deque
+from GoogleIt.fetcher import host_of
+
+
+class _Domain:
+    """The latest outcomes and the circuit of a domain."""
+
+    __slots__ = ("outcomes", "opened_at", "probing_since")
+
+    def __init__(self, window: int) -> None:
+        # (latency, ok, words) of the latest reads
+        self.outcomes: deque = deque(maxlen=window)
+        self.opened_at = None
+        self.probing_since = None
+
+    def failure_rate(self) -> float:
+        return sum(not ok for _, ok, _ in self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+    def mean_latency(self) -> float:
+        return sum(latency for latency, _, _ in self.outcomes) / len(self.outcomes) if self.outcomes else 0.0
+
+
+class DomainHealth:
+    """
+    Rolling per-domain source statistics with a circuit breaker.
+
+    Instances are thread-safe and meant to be shared.
+
+    Attributes:
+        window: The number of latest outcomes kept per domain.
+        min_samples: The number of outcomes a domain needs before its circuit can open.
+        failure_threshold: The share of failed outcomes at which the circuit of a domain opens.
+        cooldown: The time in seconds an open circuit skips its domain before letting a probe through.
+        min_words: The number of words below which a source counts as failed, as paywalls and CAPTCHAs do.
+        slow_latency: The mean latency in seconds above which a domain is degraded.
+        path: The JSON file the outcomes and circuits are saved to, or None to keep them in memory.
+    """
+
+    def __init__(self, window: int = 20, min_samples: int = 3, failure_threshold: float = 0.5, cooldown: float = 600,
+                 min_words: int = 50, slow_latency: float = 10, path: str | None = None) -> None:
+        """
+        Initializes the registry, loading the state saved at `path` if there is one.
+
+        Parameters:
+            window (int): The number of latest outcomes kept per domain (default is 20).
+            min_samples (int): The number of outcomes a domain needs before its circuit can open (default is 3).
+            failure_threshold (float): The share of failed outcomes at which a circuit opens (default is 0.5).
+            cooldown (float): The time in seconds an open circuit skips its domain (default is 600).
+            min_words (int): The number of words below which a source counts as failed (default is 50).
+            slow_latency (float): The mean latency in seconds above which a domain is degraded (default is 10).
+            path (str | None): The JSON file to save the state to (default is None, in memory only).
+        """
+        self.window = window
+        self.min_samples = min_samples
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.min_words = min_words
+        self.slow_latency = slow_latency
+        self.path = path
+        self._domains: dict[str, _Domain] = {}
+        self._stats = {"skipped": 0, "deprioritized": 0, "opened": 0, "probes": 0}
+        self._lock = threading.Lock()
+
+        if path is not None:
+            self._load()
+
+    def record(self, domain: str, latency: float, ok: bool, words: int = 0) -> None:
+        """
+        Records the outcome of a source read, and opens or closes the circuit of its domain.
+
+        Parameters:
+            domain (str): The host name of the source, as returned by `fetcher.host_of`.
+            latency (float): The time in seconds the read took.
+            ok (bool): Whether the read succeeded.
+            words (int): The number of words of content the read yielded (default is 0).
+        """
+        ok = ok and words >= self.min_words
+        changed = False
+
+        with self._lock:
+            state = self._domains.get(domain)
+            if state is None:
+                state = self._domains[domain] = _Domain(self.window)
+
+            if state.opened_at is not None:
+                # The outcome of a probe, or of a read started before the circuit opened
+                if ok:
+                    state.outcomes.clear()
+                    state.opened_at = state.probing_since = None
+                elif state.probing_since is not None:
+                    state.opened_at, state.probing_since = time.time(), None
+                state.outcomes.append((latency, ok, words))
+                changed = True
+            else:
+                state.outcomes.append((latency, ok, words))
+                if len(state.outcomes) >= self.min_samples and state.failure_rate() >= self.failure_threshold:
+                    state.opened_at = time.time()
+                    self._stats["opened"] += 1
+                    changed = True
+
+        if self.path is not None and changed:
+            self.save()
+
+    def allows(self, domain: str) -> bool:
+        """
+        Whether a domain may be used. An open circuit lets one probe through per `cooldown` once it has cooled down.
+
+        Parameters:
+            domain (str): The domain.
+
+        Returns:
+            bool: True when the circuit of the domain is closed, or when this call is its probe.
+        """
+        with self._lock:
+            state = self._domains.get(domain)
+            if state is None or state.opened_at is None:
+                return True
+
+            now = time.time()
+            if now - state.opened_at < self.cooldown:
+                return False
+            if state.probing_since is not None and now - state.probing_since < self.cooldown:
+                return False
+
+            state.probing_since = now
+            self._stats["probes"] += 1
+            return True
+
+    def is_degraded(self, domain: str) -> bool:
+        """
+        Whether a domain should be ranked after the healthy ones: half or more of the failure threshold of its
+        latest outcomes failed, or its mean latency exceeds `slow_latency`.
+
+        Parameters:
+            domain (str): The domain.
+
+        Returns:
+            bool: True when the domain is degraded.
+        """
+        with self._lock:
+            state = self._domains.get(domain)
+            if state is None or not state.outcomes:
+                return False
+            return state.failure_rate() >= self.failure_threshold / 2 or state.mean_latency() > self.slow_latency
+
+    def rank(self, urls: list[str], domains: list[str], count: int) -> tuple[list[str], list[str]]:
+        """
+        Picks the sources to read among the search results: the sources of domains whose circuit is open are
+        dropped, degraded domains are ranked after healthy ones, and the search order is kept otherwise.
+
+        The health of each source is looked up by the host name of its URL; `domains` are only returned with the
+        URLs they belong to.
+
+        Parameters:
+            urls (list[str]): The URLs of the search results, best first.
+            domains (list[str]): The domain name of each URL, such as the file names of `GoogleIt.get_domain_name`.
+            count (int): The number of sources to keep.
+
+        Returns:
+            tuple[list[str], list[str]]: The URLs and domains of up to `count` sources.
+        """
+        healthy, degraded = [], []
+        skipped = 0
+        for url, domain in zip(urls, domains):
+            if len(healthy) == count:
+                break
+            host = host_of(url)
+            if self._cooling_down(host):
+                skipped += 1
+            elif self.is_degraded(host):
+                degraded.append((url, domain))
+            elif self.allows(host):
+                healthy.append((url, domain))
+            else:
+                skipped += 1
+
+        picked = healthy[:count]
+        for url, domain in degraded:
+            if len(picked) == count:
+                break
+            if self.allows(host_of(url)):
+                picked.append((url, domain))
+            else:
+                skipped += 1
+
+        with self._lock:
+            self._stats["skipped"] += skipped
+            self._stats["deprioritized"] += len(degraded)
+
+        return [url for url, _ in picked], [domain for _, domain in picked]
+
+    def state(self, domain: str) -> str:
+        """Returns the circuit state of a domain: "closed", "open" or "half-open" while a probe is in flight."""
+        with self._lock:
+            state = self._domains.get(domain)
+            if state is None or state.opened_at is None:
+                return "closed"
+            return "half-open" if state.probing_since is not None else "open"
+
+    def report(self) -> dict:
+        """
+        Returns the statistics of every domain.
+
+        Returns:
+            dict: For each domain, the number of outcomes kept, the failure rate, the mean latency in seconds, the
+            mean number of words of content, and the circuit state.
+        """
+        with self._lock:
+            domains = list(self._domains)
+
+        report = {}
+        for domain in domains:
+            with self._lock:
+                outcomes = list(self._domains[domain].outcomes)
+                failure_rate = self._domains[domain].failure_rate()
+                mean_latency = self._domains[domain].mean_latency()
+            report[domain] = {
+                "samples": len(outcomes),
+                "failure_rate": failure_rate,
+                "mean_latency": mean_latency,
+                "mean_words": sum(words for _, _, words in outcomes) / len(outcomes) if outcomes else 0.0,
+                "state": self.state(domain),
+            }
+        return report
+
+    def stats(self) -> dict:
+        """
+        Returns the number of search results skipped for an open circuit and ranked last for a degraded domain, of
+        circuits opened, of probes let through, and of circuits open now.
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats["open"] = sum(state.opened_at is not None for state in self._domains.values())
+        return stats
+
+    def _cooling_down(self, domain: str) -> bool:
+        """Whether the circuit of a domain is open and may not let a probe through yet, without taking the probe."""
+        with self._lock:
+            state = self._domains.get(domain)
+            if state is None or state.opened_at is None:
+                return False
+            now = time.time()
+            return now - state.opened_at < self.cooldown or \
+                state.probing_since is not None and now - state.probing_since < self.cooldown
+
+    def save(self) -> None:
+        """Writes the outcomes and circuits to the JSON file at `path`, replacing it atomically."""
+        with self._lock:
+            encoded = json.dumps({
+                domain: {"outcomes": list(state.outcomes), "opened_at": state.opened_at}
+                for domain, state in self._domains.items()
+            })
+            temporary_path = f"{self.path}.{threading.get_ident()}.tmp"
+            with open(temporary_path, "w", encoding="utf-8") as file:
+                file.write(encoded)
+            os.replace(temporary_path, self.path)
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                domains = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        if not isinstance(domains, dict):
+            return
+
+        for domain, saved in domains.items():
+            try:
+                state = _Domain(self.window)
+                state.outcomes.extend((float(latency), bool(ok), int(words)) for latency, ok, words in saved["outcomes"])
+                state.opened_at = float(saved["opened_at"]) if saved["opened_at"] is not None else None
+            except (KeyError, TypeError, ValueError):
+                continue
+            self._domains[domain] = state
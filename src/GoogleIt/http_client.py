@@ -0,0 +1,264 @@
+"""
+GoogleIt HTTP Client Module
+
+This module provides the `HttpClient` class, through which `GoogleIt` sends its search requests and page downloads.
+
+A single `requests.Session` is shared by every request, so connections to a host are kept alive and reused instead of
+being opened for each page. Every request has a connect and a read timeout, so a host that stops answering cannot
+stall a query, and requests answered with 429 or a 5xx status, or that fail to connect, are retried with exponential
+backoff, honouring the Retry-After header. No wait between attempts exceeds the read timeout, however long the
+Retry-After header asks for. Read timeouts are not retried, so the read timeout bounds the time a host may stay silent
+over the whole request. Responses are requested compressed with gzip, and with brotli when the
+`brotli` package is installed.
+
+The async API gets the same limits, timeouts and retries from `HttpClient.async_session` and `HttpClient.aget`.
+
+Usage:
+    - Import the module: `from GoogleIt.http_client import HttpClient`
+    - Pass an `HttpClient` to `GoogleIt`, or let it create one.
+
+Example:
+    ```python
+    client = HttpClient(connections_per_host=4, connect_timeout=3, read_timeout=10, retries=2)
+    google_it = GoogleIt(api_key='your_api_key_here', http_client=client)
+
+    page = client.get("https://example.com")
+    ```
+
+Classes:
+    - `HttpClient(max_connections: int = 100, connections_per_host: int = 10, connect_timeout: float | None = 5, read_timeout: float | None = 15, retries: int = 3, backoff_factor: float = 0.5, retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504), headers: dict | None = None, proxy: str | None = None)`:
+        - A pooled HTTP client with timeouts and retries.
+        - Methods:
+            - `get(self, url: str, headers: dict | None = None) -> requests.Response`: Sends a GET request, retrying failed attempts.
+            - `close(self) -> None`: Closes the pooled connections.
+            - `async_session(self) -> aiohttp.ClientSession`: Opens an aiohttp session with the same connection limits and timeouts.
+            - `aget(self, session: aiohttp.ClientSession, url: str, headers: dict | None = None) -> aiohttp.ClientResponse`: Sends a GET request with the session, retrying failed attempts, and returns the response with its body read.
+"""
+
+
+import asyncio
+import importlib.util
+import threading
+
+
+# The longest wait between two attempts when the client has no read timeout
+MAX_RETRY_WAIT = 30.0
+
+
+def _accept_encoding() -> str:
+    """Returns the content codings the installed decoders support."""
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        return "gzip, deflate, br"
+    return "gzip, deflate"
+
+
+class HttpClient:
+    """
+    A pooled HTTP client with connect and read timeouts and retries with exponential backoff.
+
+    Instances are thread-safe and meant to be shared.
+
+    Attributes:
+        max_connections: The maximum number of open connections of an async session.
+        connections_per_host: The maximum number of connections kept open to a single host.
+        connect_timeout: The time in seconds to wait for a connection, or None to wait indefinitely.
+        read_timeout: The time in seconds to wait for data from the server, or None to wait indefinitely.
+        retries: The number of times a request that failed to connect or got a retryable status is retried. Read
+            timeouts are not retried.
+        backoff_factor: The delay before the first retry in seconds, doubled for every further retry.
+        retry_statuses: The response statuses that are retried.
+        headers: The headers sent with every request.
+        proxy: The URL of the HTTP proxy every request is sent through, or None.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        connections_per_host: int = 10,
+        connect_timeout: float | None = 5,
+        read_timeout: float | None = 15,
+        retries: int = 3,
+        backoff_factor: float = 0.5,
+        retry_statuses: tuple[int, ...] = (429, 500, 502, 503, 504),
+        headers: dict | None = None,
+        proxy: str | None = None,
+    ) -> None:
+        """
+        Initializes the client. Connections are opened on first use.
+
+        Parameters:
+            max_connections (int): The maximum number of open connections of an async session (default is 100).
+            connections_per_host (int): The maximum number of connections kept open to a single host (default is 10).
+            connect_timeout (float | None): The time in seconds to wait for a connection (default is 5).
+            read_timeout (float | None): The time in seconds to wait for data from the server (default is 15). It also
+                caps the wait between two attempts, including the one asked for by a Retry-After header.
+            retries (int): The number of times a request that failed to connect or got a retryable status is retried
+                (default is 3). Read timeouts are not retried.
+            backoff_factor (float): The delay before the first retry in seconds, doubled for every further retry
+                (default is 0.5).
+            retry_statuses (tuple[int, ...]): The response statuses that are retried (default is 429 and the
+                transient 5xx statuses).
+            headers (dict | None): Extra headers sent with every request (optional).
+            proxy (str | None): The URL of an HTTP proxy to send every request through, such as
+                "http://127.0.0.1:3128" (default is None, the proxy settings of the environment).
+        """
+        self.max_connections = max_connections
+        self.connections_per_host = connections_per_host
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.retry_statuses = tuple(retry_statuses)
+        self.headers = {"Accept-Encoding": _accept_encoding(), **(headers or {})}
+        self.proxy = proxy
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The shared `requests.Session`, created on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self):
+        """Creates a session whose adapters pool connections per host and retry failed requests."""
+        import requests
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        max_wait = self._max_wait()
+
+        class CappedRetry(Retry):
+            """
+            Waits at most `max_wait` seconds between two attempts, for a Retry-After header as for the backoff. The cap
+            is applied here rather than with `backoff_max`, which urllib3 1.x does not accept.
+            """
+
+            def get_retry_after(self, response):
+                retry_after = super().get_retry_after(response)
+                return min(retry_after, max_wait) if retry_after is not None else None
+
+            def get_backoff_time(self):
+                return min(super().get_backoff_time(), max_wait)
+
+        retry = CappedRetry(
+            total=self.retries,
+            # A read timeout already waited the whole read timeout: retrying it would multiply the time of a page
+            read=0,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=self.retry_statuses,
+            allowed_methods=frozenset(["GET", "HEAD"]),
+            respect_retry_after_header=True,
+            # The last response is returned so callers can inspect its status
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_maxsize=self.connections_per_host, pool_block=True, max_retries=retry)
+
+        session = requests.Session()
+        session.headers.update(self.headers)
+        if self.proxy is not None:
+            session.proxies = {"http": self.proxy, "https": self.proxy}
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        return session
+
+    def get(self, url: str, headers: dict | None = None):
+        """
+        Sends a GET request, retrying connection errors and retryable statuses.
+
+        Parameters:
+            url (str): The URL to request.
+            headers (dict | None): Extra headers of this request (optional).
+
+        Returns:
+            requests.Response: The response. When every attempt got a retryable status, the last response is returned.
+
+        Raises:
+            requests.RequestException: If the request failed after all retries, for example on a timeout.
+        """
+        return self.session.get(url, headers=headers, timeout=(self.connect_timeout, self.read_timeout))
+
+    def close(self) -> None:
+        """Closes the pooled connections. The client opens new ones if it is used again."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def async_session(self):
+        """
+        Opens an aiohttp session with the connection limits, timeouts and headers of the client.
+
+        Returns:
+            aiohttp.ClientSession: The session, to be used as an async context manager.
+
+        Raises:
+            ImportError: If aiohttp is not installed.
+        """
+        try:
+            import aiohttp
+        except ImportError:
+            raise ImportError("The async API requires aiohttp. Install it with `pip install GoogleIt[async]`.") from None
+
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.max_connections, limit_per_host=self.connections_per_host),
+            timeout=aiohttp.ClientTimeout(connect=self.connect_timeout, sock_read=self.read_timeout),
+            headers=self.headers,
+            trust_env=self.proxy is None,
+        )
+
+    async def aget(self, session, url: str, headers: dict | None = None):
+        """
+        Asynchronous version of `get`, sent with a session from `async_session`.
+
+        Parameters:
+            session (aiohttp.ClientSession): The session to send the request with.
+            url (str): The URL to request.
+            headers (dict | None): Extra headers of this request (optional).
+
+        Returns:
+            aiohttp.ClientResponse: The response, with its body already read and its connection released.
+
+        Raises:
+            aiohttp.ClientError | asyncio.TimeoutError: If the request failed after all retries.
+        """
+        import aiohttp
+
+        for attempt in range(self.retries + 1):
+            last_attempt = attempt == self.retries
+            try:
+                response = await session.get(url, headers=headers, proxy=self.proxy)
+                # Reading the whole body releases the connection; an explicit release would make later reads fail
+                await response.read()
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+                if last_attempt or _is_read_timeout(error):
+                    raise
+                await asyncio.sleep(self._backoff(attempt))
+                continue
+
+            if response.status not in self.retry_statuses or last_attempt:
+                return response
+            await asyncio.sleep(self._backoff(attempt, response.headers.get("Retry-After")))
+
+    def _backoff(self, attempt: int, retry_after: str | None = None) -> float:
+        """
+        Returns the delay before a retry: the Retry-After seconds if given, otherwise exponential backoff, at most
+        the read timeout.
+        """
+        if retry_after is not None and retry_after.isdigit():
+            return min(float(retry_after), self._max_wait())
+        return min(self.backoff_factor * (2 ** attempt), self._max_wait())
+
+    def _max_wait(self) -> float:
+        """The longest wait between two attempts: the read timeout, or `MAX_RETRY_WAIT` without one."""
+        return self.read_timeout if self.read_timeout is not None else MAX_RETRY_WAIT
+
+
+def _is_read_timeout(error: Exception) -> bool:
+    """Whether an aiohttp error is a timeout waiting for data, as opposed to one waiting for a connection."""
+    import aiohttp
+
+    return isinstance(error, asyncio.TimeoutError) and not isinstance(error, aiohttp.ConnectionTimeoutError)
@@ -0,0 +1,300 @@
+"""
+GoogleIt Instrumentation Module
+
+This module times the stages of the GoogleIt pipeline, so that a slow query can be traced to the search, the page
+rendering, the PDF and DOCX conversions, the relevance scoring or the model calls.
+
+Each stage runs inside a `Span`, which records its duration and counts such as bytes, chunks and tokens. Finished
+spans are passed to the hooks registered on the `Tracer` of `GoogleIt`. A hook is any callable taking a `Span`; this
+module provides `StatsAggregator`, which keeps the durations in memory and reports percentiles per stage, and
+`OpenTelemetryExporter`, which forwards the spans to OpenTelemetry. When no hook is registered, spans are not even
+created: each stage only pays for a check of the hook list.
+
+Stages:
+    - `query`: A whole call of `get` or `aget`, or one query of `get_many`.
+    - `search`: The search request and the parse of the result page.
+    - `read_source`: Reading the paragraphs of one source, from the cache, the HTML or the browser.
+    - `render`: Rendering a page to PDF in the browser.
+    - `extract_pdf`: Reading a PDF back through DOCX.
+    - `combine_pdf`: Merging PDF files with `GoogleIt.combine_pdf`, which `get` does not call.
+    - `relevance`: Keeping the chunks relevant to the PDF document of the query.
+    - `pack_context`: Ranking the chunks against the query and packing them into the token budget.
+    - `generate`, `redraft`: The first model call and the redraft of its answer.
+
+Usage:
+    - Import the module: `from GoogleIt.instrumentation import StatsAggregator`
+    - Register hooks on `google_it.tracer`, or pass them to `GoogleIt` with `hooks`.
+
+Example:
+    ```python
+    stats = StatsAggregator()
+    google_it = GoogleIt(api_key='your_api_key_here', hooks=[stats])
+    google_it.get(query="How does photosynthesis work?")
+    print(stats.report())  # {'search': {'count': 1, 'p50': 0.41, 'p95': 0.41, 'p99': 0.41, ...}, ...}
+
+    google_it.tracer.add_hook(lambda span: print(span.name, span.duration, span.attributes))
+    ```
+
+Classes:
+    - `Span(name: str, attributes: dict)`:
+        - A timed stage with its attributes. `set(**attributes)` adds attributes while the stage runs.
+    - `Tracer(hooks: Iterable[Callable[[Span], None]] = ())`:
+        - Creates spans and passes them to its hooks when they finish.
+        - Methods:
+            - `span(self, name: str, **attributes)`: Returns a context manager timing a stage and yielding its `Span`.
+            - `add_hook(self, hook: Callable[[Span], None]) -> None`: Registers a hook.
+            - `remove_hook(self, hook: Callable[[Span], None]) -> None`: Unregisters a hook.
+    - `StatsAggregator(max_samples: int = 10000)`:
+        - A hook keeping the latest durations of each stage in memory.
+        - Methods:
+            - `report(self) -> dict`: Returns the count, mean, p50, p95, p99 and max duration in seconds of each stage.
+            - `reset(self) -> None`: Forgets every sample.
+    - `OpenTelemetryExporter(tracer_provider=None)`:
+        - A hook recording every span as an OpenTelemetry span. Requires `opentelemetry-api`.
+
+Note:
+    Hooks run synchronously in the thread that finished the span, so they should be fast. An exception raised by a hook
+    is not caught.
+"""
+
+
+import itertools
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterable
+
+
+_span_ids = itertools.count(1)
+_current_span: ContextVar = ContextVar("googleit_span", default=None)
+
+
+class Span:
+    """
+    A timed stage of the pipeline.
+
+    Attributes:
+        name: The name of the stage.
+        attributes: Counts and labels of the stage, such as "bytes", "chunks" or "tokens".
+        span_id: The identifier of the span, unique in the process.
+        parent_id: The identifier of the span this one started in, or None.
+        start_time_ns: The wall-clock time the stage started, in nanoseconds since the epoch.
+        duration: The duration of the stage in seconds, set when it finishes.
+        error: The name of the exception the stage raised, or None.
+    """
+
+    __slots__ = ("name", "attributes", "span_id", "parent_id", "start_time_ns", "duration", "error", "_start")
+
+    def __init__(self, name: str, attributes: dict, parent_id: int | None = None) -> None:
+        self.name = name
+        self.attributes = attributes
+        self.span_id = next(_span_ids)
+        self.parent_id = parent_id
+        self.start_time_ns = time.time_ns()
+        self.duration = None
+        self.error = None
+        self._start = time.perf_counter()
+
+    def set(self, **attributes) -> None:
+        """Adds or replaces attributes of the span."""
+        self.attributes.update(attributes)
+
+    def __repr__(self) -> str:
+        return f"Span(name={self.name!r}, duration={self.duration!r}, attributes={self.attributes!r})"
+
+
+class _NullSpan:
+    """The span handed out when no hook is registered. It records nothing."""
+
+    __slots__ = ()
+
+    def set(self, **attributes) -> None:
+        pass
+
+
+class _NullSpanContext:
+    """A reusable context manager yielding the null span."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> _NullSpan:
+        return _NULL_SPAN
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+_NULL_SPAN = _NullSpan()
+_NULL_SPAN_CONTEXT = _NullSpanContext()
+
+
+class Tracer:
+    """
+    Creates the spans of the pipeline stages and passes them to its hooks when they finish.
+
+    Attributes:
+        hooks: The callables that receive every finished `Span`.
+    """
+
+    def __init__(self, hooks: Iterable[Callable[[Span], None]] = ()) -> None:
+        """
+        Initializes the tracer.
+
+        Parameters:
+            hooks (Iterable[Callable[[Span], None]]): The hooks to register (default is none).
+        """
+        self.hooks = list(hooks)
+
+    def add_hook(self, hook: Callable[[Span], None]) -> None:
+        """Registers a hook."""
+        self.hooks = self.hooks + [hook]
+
+    def remove_hook(self, hook: Callable[[Span], None]) -> None:
+        """Unregisters a hook."""
+        self.hooks = [registered for registered in self.hooks if registered is not hook]
+
+    def span(self, name: str, **attributes):
+        """
+        Times a stage.
+
+        Parameters:
+            name (str): The name of the stage.
+            **attributes: The initial attributes of the span.
+
+        Returns:
+            A context manager yielding the `Span` of the stage. Without hooks, it yields a span that records nothing.
+        """
+        if not self.hooks:
+            return _NULL_SPAN_CONTEXT
+        return self._span(name, attributes)
+
+    @contextmanager
+    def _span(self, name: str, attributes: dict):
+        parent = _current_span.get()
+        span = Span(name, attributes, parent.span_id if parent is not None else None)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as error:
+            span.error = type(error).__name__
+            raise
+        finally:
+            span.duration = time.perf_counter() - span._start
+            _current_span.reset(token)
+            for hook in self.hooks:
+                hook(span)
+
+
+NULL_TRACER = Tracer()
+
+
+class StatsAggregator:
+    """
+    A hook that keeps the latest durations of each stage and reports their percentiles.
+
+    Attributes:
+        max_samples: The number of durations kept per stage; older ones are dropped.
+    """
+
+    def __init__(self, max_samples: int = 10000) -> None:
+        """
+        Initializes the aggregator.
+
+        Parameters:
+            max_samples (int): The number of durations kept per stage (default is 10000).
+        """
+        self.max_samples = max_samples
+        self._samples: dict[str, deque] = {}
+        self._errors: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, span: Span) -> None:
+        with self._lock:
+            samples = self._samples.get(span.name)
+            if samples is None:
+                samples = self._samples[span.name] = deque(maxlen=self.max_samples)
+            samples.append(span.duration)
+            if span.error is not None:
+                self._errors[span.name] = self._errors.get(span.name, 0) + 1
+
+    def report(self) -> dict:
+        """
+        Summarizes the durations of each stage.
+
+        Returns:
+            dict: For each stage, the number of samples, the number of errors, and the mean, p50, p95, p99 and
+            maximum duration in seconds.
+        """
+        with self._lock:
+            samples = {name: sorted(durations) for name, durations in self._samples.items()}
+            errors = dict(self._errors)
+
+        return {
+            name: {
+                "count": len(durations),
+                "errors": errors.get(name, 0),
+                "mean": sum(durations) / len(durations),
+                "p50": _percentile(durations, 50),
+                "p95": _percentile(durations, 95),
+                "p99": _percentile(durations, 99),
+                "max": durations[-1],
+            }
+            for name, durations in samples.items()
+        }
+
+    def reset(self) -> None:
+        """Forgets every sample."""
+        with self._lock:
+            self._samples.clear()
+            self._errors.clear()
+
+
+class OpenTelemetryExporter:
+    """
+    A hook that records every span as an OpenTelemetry span, with the same name, times and attributes.
+
+    Span attributes are prefixed with "googleit.". Spans are exported when they finish, so the nesting of the stages is
+    kept in the `googleit.span_id` and `googleit.parent_id` attributes.
+    """
+
+    def __init__(self, tracer_provider=None) -> None:
+        """
+        Initializes the exporter.
+
+        Parameters:
+            tracer_provider (opentelemetry.trace.TracerProvider | None): The provider to create spans with. When None
+                (default), the global provider is used.
+
+        Raises:
+            ImportError: If opentelemetry-api is not installed.
+        """
+        try:
+            from opentelemetry import trace
+        except ImportError:
+            raise ImportError(
+                "The OpenTelemetry exporter requires opentelemetry-api. Install it with `pip install GoogleIt[otel]`."
+            ) from None
+
+        self._status = trace.Status
+        self._status_error = trace.StatusCode.ERROR
+        self._tracer = trace.get_tracer("GoogleIt", tracer_provider=tracer_provider)
+
+    def __call__(self, span: Span) -> None:
+        attributes = {f"googleit.{key}": value for key, value in span.attributes.items() if value is not None}
+        attributes["googleit.span_id"] = span.span_id
+        if span.parent_id is not None:
+            attributes["googleit.parent_id"] = span.parent_id
+
+        exported = self._tracer.start_span(span.name, start_time=span.start_time_ns, attributes=attributes)
+        if span.error is not None:
+            exported.set_status(self._status(self._status_error, span.error))
+        exported.end(end_time=span.start_time_ns + int(span.duration * 1e9))
+
+
+def _percentile(sorted_values: list[float], percent: float) -> float:
+    """Returns the nearest-rank percentile of sorted values."""
+    rank = max(math.ceil(percent / 100 * len(sorted_values)), 1)
+    return sorted_values[rank - 1]
@@ -1,16 +1,57 @@
 """
 This module provides wrapper classes for interacting with Google's language models, including Palm 2 and Gemini.
 
+Both wrappers accept an optional response cache. Every remote generation call is keyed on a hash of the model name,
+the prompt and the generation config, so asking the same question over the same sources again is answered from the
+cache without any remote call.
+
+Answers are produced with one of three generation strategies:
+- "redraft" (default): the answer is sent back to the model once more to be redrafted for readability.
+- "single": the first answer is returned as is, halving latency and token cost.
+- "auto": the answer is redrafted only when the local `is_readable` check fails.
+
+Example:
+    ```python
+    model = GeminiModel(cache=SQLiteResponseCache("responses.sqlite3"), strategy="auto")
+    model.init(api_key='your_api_key_here')
+    answer = model.query(document, question)
+    ```
+
+Functions:
+----------
+- is_readable(text: str, max_sentence_words: int = 35) -> bool:
+    A cheap local check of whether a generated answer reads well, used by the "auto" strategy.
+
+Response Caches:
+----------------
+- response_cache_key(model_name: str, prompt: str, generation_config: dict) -> str:
+    Returns the SHA-256 hash identifying a generation request.
+
+- ResponseCache:
+    Abstract base class of response caches. `get(self, key: str) -> str | None` looks a response up and `set(self, key: str, response: str) -> None`
+    stores one; subclasses implement the abstract methods `_get` and `set`.
+    `stats(self) -> dict` reports the hit and miss counters.
+
+- MemoryResponseCache(max_entries: int = 1024):
+    An in-memory least recently used cache of up to `max_entries` responses.
+
+- SQLiteResponseCache(path: str):
+    A cache persisted in a SQLite database, shared by processes that use the same file.
+
 Palm2Model Class:
 -----------------
 This class serves as a wrapper for the Google Palm 2 language model.
 
 Attributes:
 - model: The initialized Palm 2 language model.
+- cache: The response cache, or None.
+- strategy: The generation strategy, one of "redraft", "single" or "auto".
+- tracer: The `instrumentation.Tracer` timing the model calls as "generate" and "redraft" spans.
+- context_tokens: The default token budget of the context of a query (7500).
 
 Methods:
-- __init__(self) -> None:
-    Initializes the Palm2Model instance.
+- __init__(self, cache: ResponseCache | None = None, strategy: str = "redraft") -> None:
+    Initializes the Palm2Model instance, optionally with a response cache and a generation strategy.
 
 - init(self, api_key: str) -> None:
     Initializes the Palm 2 language model using the provided API key.
@@ -28,6 +69,16 @@ Methods:
     Returns:
     str: The formatted prompt for the language model.
 
+- make_redraft_prompt(self, query: str, response: str) -> str:
+    Generates the prompt asking the Palm 2 language model to redraft a response.
+
+    Parameters:
+    - query (str): The user's question.
+    - response (str): The generated response.
+
+    Returns:
+    str: The formatted prompt for the language model.
+
 - redraft_response(self, query: str, response: str) -> str:
     Redrafts the response generated by the Palm 2 language model.
 
@@ -48,6 +99,14 @@ Methods:
     Returns:
     str: The generated answer from the language model.
 
+- aredraft_response(self, query: str, response: str) -> str:
+- aquery(self, document: str, question: str) -> str:
+    Asynchronous versions of `redraft_response` and `query`, for use with `GoogleIt.aget`.
+
+- stream_query(self, document: str, question: str) -> Iterator[str]:
+    Queries the language model and yields the answer in pieces, for use with `GoogleIt.stream`.
+    The first answer is streamed and never redrafted, whatever the generation strategy.
+
 
 GeminiModel Class:
 -------------------
@@ -55,10 +114,14 @@ This class serves as a wrapper for the Google Gemini language model.
 
 Attributes:
 - model: The initialized Gemini language model.
+- cache: The response cache, or None.
+- strategy: The generation strategy, one of "redraft", "single" or "auto".
+- tracer: The `instrumentation.Tracer` timing the model calls as "generate" and "redraft" spans.
+- context_tokens: The default token budget of the context of a query (12000).
 
 Methods:
-- __init__(self) -> None:
-    Initializes the GeminiModel instance.
+- __init__(self, cache: ResponseCache | None = None, strategy: str = "redraft") -> None:
+    Initializes the GeminiModel instance, optionally with a response cache and a generation strategy.
 
 - init(self, api_key: str) -> None:
     Initializes the Gemini language model using the provided API key.
@@ -76,6 +139,16 @@ Methods:
     Returns:
     str: The formatted prompt for the language model.
 
+- make_redraft_prompt(self, query: str, response: str) -> str:
+    Generates the prompt asking the Gemini language model to redraft a response.
+
+    Parameters:
+    - query (str): The user's question.
+    - response (str): The generated response.
+
+    Returns:
+    str: The formatted prompt for the language model.
+
 - redraft_response(self, query: str, response: str) -> str:
     Redrafts the response generated by the Gemini language model.
 
@@ -95,11 +168,229 @@ Methods:
 
     Returns:
     str: The generated answer from the language model.
+
+- aredraft_response(self, query: str, response: str) -> str:
+- aquery(self, document: str, question: str) -> str:
+    Asynchronous versions of `redraft_response` and `query`, for use with `GoogleIt.aget`.
+
+- stream_query(self, document: str, question: str) -> Iterator[str]:
+    Queries the language model and yields the answer in pieces, for use with `GoogleIt.stream`.
+    The first answer is streamed and never redrafted, whatever the generation strategy.
 """
 
-import google.generativeai as genai
+import abc
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Iterator
 import textwrap
 
+from GoogleIt.context import estimate_tokens
+from GoogleIt.instrumentation import NULL_TRACER
+
+
+GENERATION_STRATEGIES = ("redraft", "single", "auto")
+
+
+def is_readable(text: str, max_sentence_words: int = 35) -> bool:
+    """
+    Check whether a generated answer is readable enough to skip the redraft call.
+
+    An answer fails the check when it is empty, when its sentences are longer than `max_sentence_words` words
+    on average, when it is mostly symbols or digits, when it stops mid-sentence (as truncated output does), or
+    when a single word makes up a fifth or more of a longer answer (as degenerate repetition does).
+
+    Parameters:
+    - text (str): The generated answer.
+    - max_sentence_words (int): The maximum average number of words per sentence (default is 35).
+
+    Returns:
+    bool: True if the answer can be returned as is.
+    """
+    text = text.strip()
+    if not text:
+        return False
+
+    words = text.split()
+    sentences = [sentence for sentence in re.split(r"(?<=[.!?])\s+|\n+", text) if sentence.strip()]
+    if len(words) / len(sentences) > max_sentence_words:
+        return False
+
+    letters = sum(character.isalpha() for character in text)
+    visible = sum(not character.isspace() for character in text)
+    if letters < 0.6 * visible:
+        return False
+
+    last_line = text.splitlines()[-1].lstrip()
+    is_list_item = re.match(r"([-*\u2022]|\d+[.)])\s", last_line) is not None
+    if text[-1].isalnum() and not is_list_item:
+        return False
+
+    if len(words) >= 20:
+        counts: dict = {}
+        for word in words:
+            word = word.lower().strip(".,;:!?\"'()")
+            if len(word) > 3:
+                counts[word] = counts.get(word, 0) + 1
+        if counts and max(counts.values()) >= 0.2 * len(words):
+            return False
+
+    return True
+
+
+def response_cache_key(model_name: str, prompt: str, generation_config: dict) -> str:
+    """
+    Compute the key identifying a generation request.
+
+    Parameters:
+    - model_name (str): The name of the model.
+    - prompt (str): The prompt sent to the model.
+    - generation_config (dict): The generation settings of the request.
+
+    Returns:
+    str: The hex SHA-256 digest of the request.
+    """
+    payload = json.dumps([model_name, prompt, generation_config], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache(abc.ABC):
+    """
+    Abstract base class of the response caches used by the model wrappers. Subclasses implement `_get` and `set`.
+
+    Attributes:
+    - hits: The number of lookups answered by the cache.
+    - misses: The number of lookups that found nothing.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the counters of the cache."""
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        """
+        Return the cached response of a request and count a hit or a miss.
+
+        Parameters:
+        - key (str): The key of the request, from `response_cache_key`.
+
+        Returns:
+        str | None: The cached response, or None if there is none.
+        """
+        response = self._get(key)
+
+        with self._counter_lock:
+            if response is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return response
+
+    @abc.abstractmethod
+    def set(self, key: str, response: str) -> None:
+        """
+        Store the response of a request.
+
+        Parameters:
+        - key (str): The key of the request, from `response_cache_key`.
+        - response (str): The generated response.
+        """
+
+    def stats(self) -> dict:
+        """
+        Return the counters of the cache.
+
+        Returns:
+        dict: The hits and misses of the cache.
+        """
+        with self._counter_lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+    @abc.abstractmethod
+    def _get(self, key: str) -> str | None:
+        """Return the stored response of a request, or None, without counting a hit or a miss."""
+
+
+class MemoryResponseCache(ResponseCache):
+    """
+    In-memory least recently used response cache.
+
+    Attributes:
+    - max_entries: The maximum number of responses kept.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        """
+        Initialize the cache.
+
+        Parameters:
+        - max_entries (int): The maximum number of responses kept (default is 1024).
+        """
+        super().__init__()
+        self.max_entries = max_entries
+        self._responses: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def set(self, key: str, response: str) -> None:
+        with self._lock:
+            self._responses[key] = response
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.max_entries:
+                self._responses.popitem(last=False)
+
+    def _get(self, key: str) -> str | None:
+        with self._lock:
+            response = self._responses.get(key)
+            if response is not None:
+                self._responses.move_to_end(key)
+            return response
+
+
+class SQLiteResponseCache(ResponseCache):
+    """
+    Response cache persisted in a SQLite database.
+
+    Attributes:
+    - path: The path of the database file.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Open, and if needed create, the cache database.
+
+        Parameters:
+        - path (str): The path of the database file.
+        """
+        super().__init__()
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT NOT NULL)")
+
+    def set(self, key: str, response: str) -> None:
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, response) VALUES (?, ?)", (key, response))
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    def _get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._connection.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
 
 class Palm2Model:
     """
@@ -107,11 +398,34 @@ class Palm2Model:
 
     Attributes:
     - model: The initialized Palm 2 language model.
+    - cache: The response cache, or None.
+    - strategy: The generation strategy, one of "redraft", "single" or "auto".
+    - tracer: The `instrumentation.Tracer` timing the model calls as "generate" and "redraft" spans.
+    - context_tokens: The default token budget of the context of a query.
     """
 
-    def __init__(self) -> None:
-        """Initialize the Palm2Model instance."""
+    context_tokens = 7500
+
+    def __init__(self, cache: ResponseCache | None = None, strategy: str = "redraft") -> None:
+        """
+        Initialize the Palm2Model instance.
+
+        Parameters:
+        - cache (ResponseCache | None): A cache of generated responses, keyed on the model name, prompt and
+          generation config. Identical requests are answered from it without a remote call (optional).
+        - strategy (str): How answers are generated: "redraft" always redrafts the first answer, "single" returns
+          it as is, and "auto" redrafts it only when `is_readable` fails (default is "redraft").
+
+        Raises:
+        - ValueError: If an invalid value for `strategy` is provided.
+        """
+        if strategy not in GENERATION_STRATEGIES:
+            raise ValueError("Invalid value for `strategy`. Available strategies are: [redraft, single, auto]")
+
         self.model = None
+        self.cache = cache
+        self.strategy = strategy
+        self.tracer = NULL_TRACER
 
     def init(self, api_key: str) -> None:
         """
@@ -120,6 +434,8 @@ class Palm2Model:
         Parameters:
         - api_key (str): The API key for authentication.
         """
+        import google.generativeai as genai
+
         genai.configure(api_key=api_key)
         models = [m for m in genai.list_models() if 'generateText' in m.supported_generation_methods]
 
@@ -155,16 +471,16 @@ class Palm2Model:
 
         return prompt
 
-    def redraft_response(self, query: str, response: str) -> str:
+    def make_redraft_prompt(self, query: str, response: str) -> str:
         """
-        Redraft the response generated by the Palm 2 language model.
+        Generate the prompt asking the Palm 2 language model to redraft a response.
 
         Parameters:
         - query (str): The user's question.
         - response (str): The generated response.
 
         Returns:
-        str: The redrafted response.
+        str: The formatted prompt for the language model.
         """
         prompt = textwrap.dedent(f"""The following passage is the Response generated to answer the question provided below \
                                  Redraft the passage if it is not readable. If it is already readable provide me the same passage as a response \
@@ -175,13 +491,33 @@ class Palm2Model:
             ANSWER:
             """)
 
-        temperature = 0.2
-        answer = genai.generate_text(prompt=prompt,
-                                      model=self.model,
-                                      candidate_count=3,
-                                      temperature=temperature,
-                                      max_output_tokens=1500)
-        return answer.candidates[0]['output']
+        return prompt
+
+    def redraft_response(self, query: str, response: str) -> str:
+        """
+        Redraft the response generated by the Palm 2 language model.
+
+        Parameters:
+        - query (str): The user's question.
+        - response (str): The generated response.
+
+        Returns:
+        str: The redrafted response.
+        """
+        return self._generate(self.make_redraft_prompt(query, response))
+
+    async def aredraft_response(self, query: str, response: str) -> str:
+        """
+        Asynchronous version of `redraft_response`.
+
+        Parameters:
+        - query (str): The user's question.
+        - response (str): The generated response.
+
+        Returns:
+        str: The redrafted response.
+        """
+        return await self._agenerate(self.make_redraft_prompt(query, response))
 
     def query(self, document: str, question: str) -> str:
         """
@@ -198,15 +534,116 @@ class Palm2Model:
             raise ValueError("The language model is not initialized. Call init() with the API key first.")
 
         prompt = self.make_prompt(question, document)
+        with self.tracer.span("generate", prompt_tokens=estimate_tokens(prompt)) as span:
+            answer = self._generate(prompt)
+            span.set(answer_tokens=estimate_tokens(answer))
+
+        if not self._needs_redraft(answer):
+            return answer
+
+        with self.tracer.span("redraft", answer_tokens=estimate_tokens(answer)) as span:
+            redraft = self.redraft_response(question, answer)
+            span.set(redraft_tokens=estimate_tokens(redraft))
+        return redraft
 
+    async def aquery(self, document: str, question: str) -> str:
+        """
+        Asynchronous version of `query`.
+
+        Parameters:
+        - document (str): The reference document for context.
+        - question (str): The user's question.
+
+        Returns:
+        str: The generated answer from the language model.
+        """
+        if self.model is None:
+            raise ValueError("The language model is not initialized. Call init() with the API key first.")
+
+        prompt = self.make_prompt(question, document)
+        with self.tracer.span("generate", prompt_tokens=estimate_tokens(prompt)) as span:
+            answer = await self._agenerate(prompt)
+            span.set(answer_tokens=estimate_tokens(answer))
+
+        if not self._needs_redraft(answer):
+            return answer
+
+        with self.tracer.span("redraft", answer_tokens=estimate_tokens(answer)) as span:
+            redraft = await self.aredraft_response(question, answer)
+            span.set(redraft_tokens=estimate_tokens(redraft))
+        return redraft
+
+    def stream_query(self, document: str, question: str) -> Iterator[str]:
+        """
+        Query the Palm 2 language model and yield the answer in pieces as they are generated.
+
+        The first answer is streamed whatever the generation strategy, so the first pieces arrive as soon as the model
+        produces them. It is never redrafted, since a redraft would replace text the caller has already shown.
+
+        Parameters:
+        - document (str): The reference document for context.
+        - question (str): The user's question.
+
+        Yields:
+        str: The next piece of the generated answer.
+        """
+        if self.model is None:
+            raise ValueError("The language model is not initialized. Call init() with the API key first.")
+
+        prompt = self.make_prompt(question, document)
+
+        with self.tracer.span("generate", prompt_tokens=estimate_tokens(prompt)) as span:
+            pieces = []
+            for piece in self._stream(prompt):
+                pieces.append(piece)
+                yield piece
+            span.set(answer_tokens=estimate_tokens("".join(pieces)))
+
+    def _needs_redraft(self, answer: str) -> bool:
+        """Whether the generation strategy asks for the answer to be redrafted."""
+        if self.strategy == "single":
+            return False
+        if self.strategy == "auto":
+            return not is_readable(answer)
+        return True
+
+    def _generation_config(self) -> dict:
+        """The generation settings shared by every request."""
         temperature = 0.2
-        answer = genai.generate_text(prompt=prompt,
-                                      model=self.model,
-                                      candidate_count=3,
-                                      temperature=temperature,
-                                      max_output_tokens=1500)
+        return {
+            "candidate_count": 1,
+            "temperature": temperature,
+            "max_output_tokens": 1500,
+        }
+
+    def _generate(self, prompt: str) -> str:
+        """Send a prompt to the model, or answer it from the cache, and return the text of the first candidate."""
+        config = self._generation_config()
+        key = response_cache_key(self.model.name, prompt, config)
+
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        import google.generativeai as genai
 
-        return self.redraft_response(question, answer.candidates[0]['output'])
+        answer = genai.generate_text(prompt=prompt, model=self.model, **config)
+        response = answer.candidates[0]['output']
+
+        if self.cache is not None:
+            self.cache.set(key, response)
+
+        return response
+
+    async def _agenerate(self, prompt: str) -> str:
+        """Asynchronous version of `_generate`. The text API has no async client, so the call runs in an executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._generate, prompt)
+
+    def _stream(self, prompt: str) -> Iterator[str]:
+        """The text API has no streaming endpoint, so the whole answer is yielded as a single piece."""
+        yield self._generate(prompt)
 
 
 class GeminiModel:
@@ -215,11 +652,34 @@ class GeminiModel:
 
     Attributes:
     - model: The initialized Gemini language model.
+    - cache: The response cache, or None.
+    - strategy: The generation strategy, one of "redraft", "single" or "auto".
+    - tracer: The `instrumentation.Tracer` timing the model calls as "generate" and "redraft" spans.
+    - context_tokens: The default token budget of the context of a query.
     """
 
-    def __init__(self) -> None:
-        """Initialize the GeminiModel instance."""
+    context_tokens = 12000
+
+    def __init__(self, cache: ResponseCache | None = None, strategy: str = "redraft") -> None:
+        """
+        Initialize the GeminiModel instance.
+
+        Parameters:
+        - cache (ResponseCache | None): A cache of generated responses, keyed on the model name, prompt and
+          generation config. Identical requests are answered from it without a remote call (optional).
+        - strategy (str): How answers are generated: "redraft" always redrafts the first answer, "single" returns
+          it as is, and "auto" redrafts it only when `is_readable` fails (default is "redraft").
+
+        Raises:
+        - ValueError: If an invalid value for `strategy` is provided.
+        """
+        if strategy not in GENERATION_STRATEGIES:
+            raise ValueError("Invalid value for `strategy`. Available strategies are: [redraft, single, auto]")
+
         self.model = None
+        self.cache = cache
+        self.strategy = strategy
+        self.tracer = NULL_TRACER
 
     def init(self, api_key: str) -> None:
         """
@@ -228,6 +688,8 @@ class GeminiModel:
         Parameters:
         - api_key (str): The API key for authentication.
         """
+        import google.generativeai as genai
+
         genai.configure(api_key=api_key)
         self.model = genai.GenerativeModel('gemini-pro')
 
@@ -258,16 +720,16 @@ class GeminiModel:
 
         return prompt
 
-    def redraft_response(self, query: str, response: str) -> str:
+    def make_redraft_prompt(self, query: str, response: str) -> str:
         """
-        Redraft the response generated by the Gemini language model.
+        Generate the prompt asking the Gemini language model to redraft a response.
 
         Parameters:
         - query (str): The user's question.
         - response (str): The generated response.
 
         Returns:
-        str: The redrafted response.
+        str: The formatted prompt for the language model.
         """
         prompt = textwrap.dedent(f"""The following passage is the Response generated to answer the question provided below \
                                  Redraft the passage if it is not readable. If it is already readable provide me the same passage as a response \
@@ -279,16 +741,33 @@ class GeminiModel:
             ANSWER:
             """)
 
-        temperature = 0.2
-        answer = self.model.generate_content(prompt,
-                                             generation_config=genai.types.GenerationConfig(
-                                                 candidate_count=1,
-                                                 max_output_tokens=1500,
-                                                 temperature=temperature
-                                             )
-                                             )
+        return prompt
 
-        return answer.text
+    def redraft_response(self, query: str, response: str) -> str:
+        """
+        Redraft the response generated by the Gemini language model.
+
+        Parameters:
+        - query (str): The user's question.
+        - response (str): The generated response.
+
+        Returns:
+        str: The redrafted response.
+        """
+        return self._generate(self.make_redraft_prompt(query, response))
+
+    async def aredraft_response(self, query: str, response: str) -> str:
+        """
+        Asynchronous version of `redraft_response`.
+
+        Parameters:
+        - query (str): The user's question.
+        - response (str): The generated response.
+
+        Returns:
+        str: The redrafted response.
+        """
+        return await self._agenerate(self.make_redraft_prompt(query, response))
 
     def query(self, document: str, question: str) -> str:
         """
@@ -305,14 +784,149 @@ class GeminiModel:
             raise ValueError("The language model is not initialized. Call init() with the API key first.")
 
         prompt = self.make_prompt(question, document)
+        with self.tracer.span("generate", prompt_tokens=estimate_tokens(prompt)) as span:
+            answer = self._generate(prompt)
+            span.set(answer_tokens=estimate_tokens(answer))
+
+        if not self._needs_redraft(answer):
+            return answer
+
+        with self.tracer.span("redraft", answer_tokens=estimate_tokens(answer)) as span:
+            redraft = self.redraft_response(question, answer)
+            span.set(redraft_tokens=estimate_tokens(redraft))
+        return redraft
+
+    async def aquery(self, document: str, question: str) -> str:
+        """
+        Asynchronous version of `query`.
+
+        Parameters:
+        - document (str): The reference document for context.
+        - question (str): The user's question.
+
+        Returns:
+        str: The generated answer from the language model.
+        """
+        if self.model is None:
+            raise ValueError("The language model is not initialized. Call init() with the API key first.")
+
+        prompt = self.make_prompt(question, document)
+        with self.tracer.span("generate", prompt_tokens=estimate_tokens(prompt)) as span:
+            answer = await self._agenerate(prompt)
+            span.set(answer_tokens=estimate_tokens(answer))
+
+        if not self._needs_redraft(answer):
+            return answer
+
+        with self.tracer.span("redraft", answer_tokens=estimate_tokens(answer)) as span:
+            redraft = await self.aredraft_response(question, answer)
+            span.set(redraft_tokens=estimate_tokens(redraft))
+        return redraft
 
+    def stream_query(self, document: str, question: str) -> Iterator[str]:
+        """
+        Query the Gemini language model and yield the answer in pieces as they are generated.
+
+        The first answer is streamed whatever the generation strategy, so the first pieces arrive as soon as the model
+        produces them. It is never redrafted, since a redraft would replace text the caller has already shown.
+
+        Parameters:
+        - document (str): The reference document for context.
+        - question (str): The user's question.
+
+        Yields:
+        str: The next piece of the generated answer.
+        """
+        if self.model is None:
+            raise ValueError("The language model is not initialized. Call init() with the API key first.")
+
+        prompt = self.make_prompt(question, document)
+
+        with self.tracer.span("generate", prompt_tokens=estimate_tokens(prompt)) as span:
+            pieces = []
+            for piece in self._stream(prompt):
+                pieces.append(piece)
+                yield piece
+            span.set(answer_tokens=estimate_tokens("".join(pieces)))
+
+    def _needs_redraft(self, answer: str) -> bool:
+        """Whether the generation strategy asks for the answer to be redrafted."""
+        if self.strategy == "single":
+            return False
+        if self.strategy == "auto":
+            return not is_readable(answer)
+        return True
+
+    def _generation_config(self) -> dict:
+        """The generation settings shared by every request."""
         temperature = 0.2
-        answer = self.model.generate_content(prompt,
-                                             generation_config=genai.types.GenerationConfig(
-                                                 candidate_count=1,
-                                                 max_output_tokens=1500,
-                                                 temperature=temperature
-                                             )
-                                             )
-
-        return self.redraft_response(question, answer.text)
\ No newline at end of file
+        return {
+            "candidate_count": 1,
+            "max_output_tokens": 1500,
+            "temperature": temperature,
+        }
+
+    def _generate(self, prompt: str) -> str:
+        """Send a prompt to the model, or answer it from the cache, and return the generated text."""
+        config = self._generation_config()
+        key = response_cache_key(self.model.model_name, prompt, config)
+
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        import google.generativeai as genai
+
+        answer = self.model.generate_content(prompt, generation_config=genai.types.GenerationConfig(**config))
+
+        if self.cache is not None:
+            self.cache.set(key, answer.text)
+
+        return answer.text
+
+    async def _agenerate(self, prompt: str) -> str:
+        """
+        Asynchronous version of `_generate`. The cache is read and written in an executor, since a cache such as
+        `SQLiteResponseCache` blocks on disk I/O.
+        """
+        config = self._generation_config()
+        key = response_cache_key(self.model.model_name, prompt, config)
+        loop = asyncio.get_running_loop()
+
+        if self.cache is not None:
+            cached = await loop.run_in_executor(None, self.cache.get, key)
+            if cached is not None:
+                return cached
+
+        import google.generativeai as genai
+
+        answer = await self.model.generate_content_async(prompt, generation_config=genai.types.GenerationConfig(**config))
+
+        if self.cache is not None:
+            await loop.run_in_executor(None, self.cache.set, key, answer.text)
+
+        return answer.text
+
+    def _stream(self, prompt: str) -> Iterator[str]:
+        """Streaming version of `_generate`. The full text is cached once the stream is complete."""
+        config = self._generation_config()
+        key = response_cache_key(self.model.model_name, prompt, config)
+
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                yield cached
+                return
+
+        import google.generativeai as genai
+
+        answer = self.model.generate_content(prompt, generation_config=genai.types.GenerationConfig(**config), stream=True)
+
+        pieces = []
+        for chunk in answer:
+            pieces.append(chunk.text)
+            yield chunk.text
+
+        if self.cache is not None:
+            self.cache.set(key, "".join(pieces))
\ No newline at end of file
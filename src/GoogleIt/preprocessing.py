@@ -0,0 +1,141 @@
+"""
+GoogleIt Preprocessing Module
+
+This module provides the `Preprocessor` class, which turns text into the normalized form used to score its relevance:
+lowercased, tokenized, and stripped of stopwords and punctuation.
+
+`Preprocessor` tokenizes with NLTK's `word_tokenize` followed by the stopword and punctuation filter, the same tokens
+`GoogleIt.preprocess_text` always produced. The stopword set is built once, and results are memoized for repeated
+inputs, such as the chunks of a page that several queries read.
+
+Usage:
+    - Import the module: `from GoogleIt.preprocessing import Preprocessor`
+    - Create a `Preprocessor` once and reuse it for every text.
+
+Example:
+    ```python
+    preprocessor = Preprocessor(cache_size=4096)
+    preprocessor.preprocess("Plants can't grow without light.")  # 'plants grow without light'
+    preprocessor.preprocess_many(chunks)
+    ```
+
+Classes:
+    - `Preprocessor(stop_words: Iterable[str] | None = None, cache_size: int = 1024)`:
+        - Lowercases, tokenizes and filters text. The English stopwords of NLTK are used when `stop_words` is None.
+        - Methods:
+            - `tokenize(self, text: str) -> list[str]`: Splits lowercased text into tokens with `nltk.word_tokenize`.
+            - `preprocess(self, text: str) -> str`: Returns the space-separated tokens of a text that are alphanumeric and not stopwords.
+            - `preprocess_many(self, texts: Iterable[str]) -> list[str]`: Preprocesses many texts.
+            - `stats(self) -> dict`: Returns the hit and miss counters of the memo cache.
+"""
+
+
+import threading
+from collections import OrderedDict
+from typing import Iterable
+
+from GoogleIt.resources import ensure_nltk_resource, tokenizer_resource
+
+
+class Preprocessor:
+    """
+    Reusable text preprocessing pipeline: lowercase, tokenize, and remove stopwords and punctuation.
+
+    Instances are thread-safe and meant to be shared.
+
+    Attributes:
+        cache_size: The number of results kept in the memo cache, 0 to disable it.
+        hits: The number of texts answered from the memo cache.
+        misses: The number of texts that had to be preprocessed.
+    """
+
+    def __init__(self, stop_words: Iterable[str] | None = None, cache_size: int = 1024) -> None:
+        """
+        Initializes the preprocessor.
+
+        Parameters:
+            stop_words (Iterable[str] | None): The words to remove. When None (default), NLTK's English stopwords are
+                loaded on first use.
+            cache_size (int): The number of results kept in the memo cache, 0 to disable it (default is 1024).
+        """
+        self.cache_size = cache_size
+        self.hits = 0
+        self.misses = 0
+        self._stop_words = frozenset(stop_words) if stop_words is not None else None
+        self._cache: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def stop_words(self) -> frozenset:
+        """The frozen set of words to remove."""
+        if self._stop_words is None:
+            from nltk.corpus import stopwords
+
+            ensure_nltk_resource("stopwords")
+            self._stop_words = frozenset(stopwords.words('english'))
+        return self._stop_words
+
+    def tokenize(self, text: str) -> list[str]:
+        """
+        Lowercases a text and splits it into tokens with `nltk.word_tokenize(text.lower())`.
+
+        Parameters:
+            text (str): The text to tokenize.
+
+        Returns:
+            list[str]: The tokens, including punctuation.
+        """
+        from nltk.tokenize import word_tokenize
+
+        ensure_nltk_resource(tokenizer_resource())
+        return word_tokenize(text.lower())
+
+    def preprocess(self, text: str) -> str:
+        """
+        Preprocesses a text by converting it to lowercase, tokenizing, and removing stopwords and punctuation.
+
+        Parameters:
+            text (str): The input text to preprocess.
+
+        Returns:
+            str: The preprocessed text.
+        """
+        if self.cache_size > 0:
+            with self._lock:
+                cached = self._cache.get(text)
+                if cached is not None:
+                    self._cache.move_to_end(text)
+                    self.hits += 1
+                    return cached
+                self.misses += 1
+
+        stop_words = self.stop_words
+        result = ' '.join(token for token in self.tokenize(text) if token.isalnum() and token not in stop_words)
+
+        if self.cache_size > 0:
+            with self._lock:
+                self._cache[text] = result
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return result
+
+    def preprocess_many(self, texts: Iterable[str]) -> list[str]:
+        """
+        Preprocesses many texts. Repeated texts are preprocessed once.
+
+        Parameters:
+            texts (Iterable[str]): The texts to preprocess.
+
+        Returns:
+            list[str]: The preprocessed texts, in the order of `texts`.
+        """
+        texts = list(texts)
+        results = {text: self.preprocess(text) for text in dict.fromkeys(texts)}
+        return [results[text] for text in texts]
+
+    def stats(self) -> dict:
+        """Returns the hit and miss counters of the memo cache."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses}
+
@@ -0,0 +1,84 @@
+"""
+GoogleIt Resources Module
+
+This module loads the NLTK data used by GoogleIt on first use, instead of downloading it every time the package is imported.
+
+Each resource is looked up in the local NLTK data directories (see `NLTK_DATA`) and downloaded only when it is missing,
+so once the resources are installed GoogleIt works fully offline. A resource is checked at most once per process.
+
+Usage:
+    - Import the module: `from GoogleIt.resources import ensure_nltk_resource`
+    - Call `ensure_nltk_resource` before the first use of a corpus or model from NLTK.
+
+Example:
+    ```python
+    ensure_nltk_resource("stopwords")
+    ensure_nltk_resource(tokenizer_resource())
+    ```
+
+    Installing the resources ahead of time, for example when building an image for offline workers:
+    ```
+    python -c "from GoogleIt.resources import ensure_nltk_resource, tokenizer_resource; ensure_nltk_resource('stopwords'); ensure_nltk_resource(tokenizer_resource())"
+    ```
+
+Functions:
+    - `ensure_nltk_resource(name: str) -> None`:
+        Makes sure an NLTK resource is installed, downloading it once if it is missing.
+    - `tokenizer_resource() -> str`:
+        Returns the name of the Punkt resource `nltk.word_tokenize` needs with the installed version of NLTK.
+"""
+
+
+import threading
+
+
+NLTK_RESOURCE_PATHS = {
+    "stopwords": "corpora/stopwords",
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+}
+
+_loaded: set[str] = set()
+_lock = threading.Lock()
+
+
+def ensure_nltk_resource(name: str) -> None:
+    """
+    Makes sure an NLTK resource is installed, downloading it once if it is missing.
+
+    Parameters:
+        name (str): The name of the resource, one of the keys of `NLTK_RESOURCE_PATHS`.
+
+    Raises:
+        LookupError: If the resource is missing and could not be downloaded, for example when offline.
+    """
+    if name in _loaded:
+        return
+
+    import nltk
+
+    with _lock:
+        if name in _loaded:
+            return
+
+        path = NLTK_RESOURCE_PATHS[name]
+        try:
+            nltk.data.find(path)
+        except LookupError:
+            nltk.download(name, quiet=True)
+            # Raises a LookupError with NLTK's installation instructions if the download failed
+            nltk.data.find(path)
+
+        _loaded.add(name)
+
+
+def tokenizer_resource() -> str:
+    """
+    Returns the name of the Punkt resource `nltk.word_tokenize` needs: "punkt_tab" since NLTK 3.8.2, "punkt" before.
+
+    Returns:
+        str: The name of the resource.
+    """
+    from nltk.tokenize import punkt
+
+    return "punkt_tab" if hasattr(punkt, "PunktTokenizer") else "punkt"
@@ -0,0 +1,221 @@
+"""
+GoogleIt Retrieval Module
+
+This module provides an in-memory BM25 index over the chunks of the sources, so the chunks that best answer a query
+can be picked without comparing the query to every chunk one by one.
+
+`ChunkIndex` preprocesses the chunks once and stores their BM25 term weights in a compressed sparse column matrix.
+Scoring a query only reads the columns of its terms, and the best `k` chunks are selected with a partial sort, so a
+lookup over a few hundred chunks takes well under a millisecond. `IndexCache` keeps the indexes of recently seen
+chunk lists, keyed by a hash of the chunks, so follow-up questions on the same sources reuse the index.
+
+Everything runs in process on the CPU, with NumPy and SciPy.
+
+Usage:
+    - Import the module: `from GoogleIt.retrieval import ChunkIndex, IndexCache`
+    - Build a `ChunkIndex` over the chunks, or get one from an `IndexCache`, and query it.
+
+Example:
+    ```python
+    index = ChunkIndex(chunks, preprocessor=Preprocessor())
+    for position in index.top_k("How does photosynthesis work?", k=3):
+        print(chunks[position])
+
+    cache = IndexCache(max_size=16)
+    index = cache.get_or_build(chunks, preprocessor)  # the same index for the same chunks
+    ```
+
+Classes:
+    - `ChunkIndex(chunks: list[str], preprocessor: Preprocessor, k1: float = 1.5, b: float = 0.75)`:
+        - A BM25 index over a list of chunks.
+        - Methods:
+            - `scores(self, query: str) -> numpy.ndarray`: Returns the BM25 score of every chunk for a query.
+            - `top_k(self, query: str, k: int) -> list[int]`: Returns the positions of the `k` best chunks, best first.
+    - `IndexCache(max_size: int = 16)`:
+        - A thread-safe LRU cache of `ChunkIndex` instances keyed by a hash of their chunks.
+        - Methods:
+            - `get_or_build(self, chunks: list[str], preprocessor: Preprocessor) -> ChunkIndex`: Returns the index of the chunks, building it on a miss.
+            - `stats(self) -> dict`: Returns the hit and miss counters and the number of cached indexes.
+"""
+
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING
+
+from GoogleIt.preprocessing import Preprocessor
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+class ChunkIndex:
+    """
+    A BM25 index over a list of chunks.
+
+    Attributes:
+        size: The number of chunks.
+        vocabulary: The column of each term in the weight matrix.
+        weights: The BM25 weight of each (chunk, term) pair, as a `scipy.sparse.csc_matrix` of float32.
+    """
+
+    def __init__(self, chunks: list[str], preprocessor: Preprocessor, k1: float = 1.5, b: float = 0.75) -> None:
+        """
+        Builds the index.
+
+        Parameters:
+            chunks (list[str]): The chunks to index.
+            preprocessor (Preprocessor): The pipeline that normalizes the chunks and the queries.
+            k1 (float): The term frequency saturation of BM25 (default is 1.5).
+            b (float): The document length normalization of BM25 (default is 0.75).
+        """
+        import numpy as np
+        from scipy.sparse import csr_matrix
+
+        self.size = len(chunks)
+        self.vocabulary: dict[str, int] = {}
+        self._preprocessor = preprocessor
+
+        term_ids: list[int] = []
+        counts: list[int] = []
+        indptr = [0]
+        for text in preprocessor.preprocess_many(chunks):
+            frequencies: dict[int, int] = {}
+            for term in text.split():
+                term_id = self.vocabulary.setdefault(term, len(self.vocabulary))
+                frequencies[term_id] = frequencies.get(term_id, 0) + 1
+            term_ids.extend(frequencies)
+            counts.extend(frequencies.values())
+            indptr.append(len(term_ids))
+
+        tf = np.asarray(counts, dtype=np.float32)
+        term_ids = np.asarray(term_ids, dtype=np.int32)
+        indptr = np.asarray(indptr, dtype=np.int32)
+
+        rows = np.repeat(np.arange(self.size, dtype=np.int32), np.diff(indptr))
+        lengths = np.bincount(rows, weights=tf, minlength=self.size).astype(np.float32)
+        average_length = lengths.mean() if lengths.any() else 1.0
+
+        document_frequency = np.bincount(term_ids, minlength=len(self.vocabulary))
+        idf = np.log1p((self.size - document_frequency + 0.5) / (document_frequency + 0.5)).astype(np.float32)
+
+        # The BM25 weight of each stored (chunk, term) pair, so that a query score is a sum of weights
+        norm = k1 * (1 - b + b * lengths[rows] / average_length)
+        data = idf[term_ids] * tf * (k1 + 1) / (tf + norm)
+
+        self.weights = csr_matrix((data, term_ids, indptr), shape=(self.size, len(self.vocabulary))).tocsc()
+
+    def scores(self, query: str) -> "np.ndarray":
+        """
+        Computes the BM25 score of every chunk for a query.
+
+        Parameters:
+            query (str): The query.
+
+        Returns:
+            numpy.ndarray: The score of each chunk, in the order of the indexed chunks. Chunks that share no term
+            with the query score 0.
+        """
+        import numpy as np
+
+        query_terms = self._preprocessor.preprocess(query).split()
+        terms = {self.vocabulary[term] for term in query_terms if term in self.vocabulary}
+        if not terms:
+            return np.zeros(self.size, dtype=np.float32)
+
+        return np.asarray(self.weights[:, sorted(terms)].sum(axis=1), dtype=np.float32).ravel()
+
+    def top_k(self, query: str, k: int) -> list[int]:
+        """
+        Selects the chunks that best match a query.
+
+        Parameters:
+            query (str): The query.
+            k (int): The maximum number of chunks to return.
+
+        Returns:
+            list[int]: The positions of the best chunks, from the highest score to the lowest. Ties keep the order of
+            the indexed chunks.
+        """
+        import numpy as np
+
+        scores = self.scores(query)
+        k = min(k, self.size)
+        if k <= 0:
+            return []
+
+        candidates = np.arange(self.size) if k == self.size else np.argpartition(-scores, k - 1)[:k]
+        order = np.lexsort((candidates, -scores[candidates]))
+        return candidates[order].tolist()
+
+
+class IndexCache:
+    """
+    A thread-safe LRU cache of `ChunkIndex` instances, keyed by a hash of their chunks.
+
+    An index depends on the preprocessor it was built with, so a cache should only be shared by `GoogleIt` instances
+    that use the same preprocessing.
+
+    Attributes:
+        max_size: The maximum number of indexes kept.
+        hits: The number of lookups answered from the cache.
+        misses: The number of indexes built.
+    """
+
+    def __init__(self, max_size: int = 16) -> None:
+        """
+        Initializes the cache.
+
+        Parameters:
+            max_size (int): The maximum number of indexes kept (default is 16).
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._indexes: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_build(self, chunks: list[str], preprocessor: Preprocessor) -> ChunkIndex:
+        """
+        Returns the index of a list of chunks, building it on a miss.
+
+        Parameters:
+            chunks (list[str]): The chunks.
+            preprocessor (Preprocessor): The pipeline used to build a missing index.
+
+        Returns:
+            ChunkIndex: The index of the chunks.
+        """
+        key = _chunks_key(chunks)
+
+        with self._lock:
+            index = self._indexes.get(key)
+            if index is not None:
+                self._indexes.move_to_end(key)
+                self.hits += 1
+                return index
+            self.misses += 1
+
+        index = ChunkIndex(chunks, preprocessor)
+
+        with self._lock:
+            self._indexes[key] = index
+            while len(self._indexes) > self.max_size:
+                self._indexes.popitem(last=False)
+
+        return index
+
+    def stats(self) -> dict:
+        """Returns the hit and miss counters and the number of cached indexes."""
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._indexes)}
+
+
+def _chunks_key(chunks: list[str]) -> str:
+    """Hashes a list of chunks into a cache key."""
+    digest = hashlib.sha1()
+    for chunk in chunks:
+        digest.update(chunk.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
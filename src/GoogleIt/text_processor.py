@@ -1,7 +1,7 @@
 """
 GoogleIt Text Processor Module
 
-This module provides functions for processing text documents, including converting PDF to DOCX, reading paragraphs from DOCX, dividing paragraphs into chunks, and extracting text and paragraphs from PDF.
+This module provides functions for processing text documents, including converting PDF to DOCX, reading paragraphs from DOCX, dividing paragraphs into chunks, extracting text and paragraphs from PDF, and extracting readable paragraphs directly from HTML.
 
 Usage:
     - Import the module: `from GoogleIt import text_processor`
@@ -23,6 +23,9 @@ Example:
 
     # Extract text and paragraphs from PDF
     pdf_text, pdf_paragraphs = text_processor.extract_text_from_pdf(pdf_path=pdf_path, docx_path=docx_path)
+
+    # Extract readable paragraphs from HTML, skipping the PDF and DOCX round-trips
+    html_paragraphs = text_processor.extract_paragraphs_from_html(html="<html>...</html>")
     ```
 
 Functions:
@@ -35,32 +38,66 @@ Functions:
     - `get_chunks(paragraphs: List[str], chunk_size: int = 10, overlap_size: int = 2) -> List[str]`:
         Divides a list of paragraphs into chunks.
 
-    - `extract_text_from_pdf(pdf_path: str, docx_path: str = "converted_document.docx") -> Tuple[str, List[str]]`:
-        Extracts text and paragraphs from a PDF file.
+    - `extract_text_from_pdf(pdf_path: str, docx_path: str = "converted_document.docx", workspace: Workspace | None = None) -> Tuple[str, List[str]]`:
+        Extracts text and paragraphs from a PDF file. When a workspace is given, the intermediate DOCX file is written inside it.
 
         Returns a tuple containing the extracted text and a list of paragraphs.
 
+    - `extract_paragraphs_from_html(html: str, min_words: int = 5) -> List[str]`:
+        Extracts readable paragraphs from an HTML document, removing navigation, scripts and other boilerplate.
+
 Note:
     - The `get_chunks` function requires passing the list of paragraphs to the function.
     - The module includes an example at the end demonstrating the use of the `extract_text_from_pdf` function.
+    - `pdf_to_docx`, and so `extract_text_from_pdf`, convert one PDF at a time across threads, since PyMuPDF is not thread-safe.
 
 """
 
 
-import pdf2docx
-from docx import Document as Docs
+import os
+import re
+import threading
 from typing import List, Tuple
+from GoogleIt.workspace import Workspace
+
+
+# Elements that never hold readable content
+BOILERPLATE_TAGS = ["script", "style", "noscript", "template", "svg", "canvas", "iframe",
+                    "nav", "header", "footer", "aside", "form", "button", "select"]
+
+# Elements whose text forms a paragraph
+PARAGRAPH_TAGS = ["p", "li", "blockquote", "pre", "dd", "figcaption", "h1", "h2", "h3", "h4", "h5", "h6"]
+
+HEADING_TAGS = ["h1", "h2", "h3", "h4", "h5", "h6"]
+
+# Elements that hold the content of a page, kept whatever their class or id, e.g. <body class="has-sidebar">
+CONTAINER_TAGS = ["html", "body", "main", "article"]
+
+# pdf2docx reads PDFs with PyMuPDF, which is not thread-safe: conversions run one at a time
+_PDF_LOCK = threading.Lock()
+
+# class or id names marking page chrome rather than content, e.g. "site-nav" or "cookie_banner"
+BOILERPLATE_NAME = re.compile(
+    r"(^|[-_])(nav|navbar|menu|footer|header|sidebar|cookie|cookies|banner|advert|ads|promo|share|social|"
+    r"comments?|related|breadcrumbs?|subscribe|newsletter|popup|modal)($|[-_])",
+    re.IGNORECASE,
+)
 
 
 def pdf_to_docx(pdf_file: str, docx_file: str) -> None:
     """
     Convert a PDF file to a DOCX file.
 
+    Conversions are serialized across threads, since PyMuPDF, which pdf2docx reads the PDF with, is not thread-safe.
+
     Parameters:
     - pdf_file (str): The path to the input PDF file.
     - docx_file (str): The path to the output DOCX file.
     """
-    pdf2docx.parse(pdf_file, docx_file)
+    import pdf2docx
+
+    with _PDF_LOCK:
+        pdf2docx.parse(pdf_file, docx_file)
 
 
 def read_document_paragraphs(filename: str) -> List[str]:
@@ -73,6 +110,8 @@ def read_document_paragraphs(filename: str) -> List[str]:
     Returns:
     List[str]: A list of paragraphs.
     """
+    from docx import Document as Docs
+
     document = Docs(filename)
     paragraphs: List[str] = []
     for paragraph in document.paragraphs:
@@ -109,19 +148,84 @@ def get_chunks(paragraphs: List[str], chunk_size: int = 10, overlap_size: int =
     return chunked_paragraphs
 
 
-def extract_text_from_pdf(pdf_path: str, docx_path: str = "converted_document.docx") -> Tuple[str, List[str]]:
+def extract_text_from_pdf(pdf_path: str, docx_path: str = "converted_document.docx",
+                          workspace: Workspace | None = None) -> Tuple[str, List[str]]:
     """
     Extract text and paragraphs from a PDF file.
 
     Parameters:
     - pdf_path (str): The path to the input PDF file.
     - docx_path (str): The path to the output DOCX file (default is "converted_document.docx").
+    - workspace (Workspace | None): The workspace of the current request. When given, the DOCX file is
+      written inside it under the file name of `docx_path`, so concurrent requests never share it.
 
     Returns:
     Tuple[str, List[str]]: A tuple containing the extracted text and a list of paragraphs.
     """
+    if workspace is not None:
+        docx_path = workspace.file(os.path.basename(docx_path))
+
     pdf_to_docx(pdf_path, docx_path)
     paragraphs = read_document_paragraphs(docx_path)
     pdf_text = " ".join(paragraphs)
 
     return pdf_text, paragraphs
+
+
+
+def extract_paragraphs_from_html(html: str, min_words: int = 5) -> List[str]:
+    """
+    Extract readable paragraphs from an HTML document.
+
+    Scripts, navigation, headers, footers, forms and elements whose class or id mark them as page chrome
+    are removed. When the page has an <article> or <main> element only its content is used. The class or id
+    of the content containers themselves (html, body, main and article) never gets them removed. Paragraphs
+    made up mostly of links (menus, tag clouds) and repeated paragraphs are dropped.
+
+    Parameters:
+    - html (str): The HTML document.
+    - min_words (int): The minimum number of words of a paragraph; shorter ones are dropped, except headings (default is 5).
+
+    Returns:
+    List[str]: A list of paragraphs in document order.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+
+    for element in soup(BOILERPLATE_TAGS):
+        element.decompose()
+
+    root = soup.find("article") or soup.find("main") or soup.body or soup
+
+    # Only elements below the root are filtered by name, so the root and its ancestors are always kept
+    for element in root.find_all(True):
+        if element.decomposed or element.attrs is None or element.name in CONTAINER_TAGS:
+            continue
+        names = element.get("class", []) + [element.get("id") or ""]
+        if any(BOILERPLATE_NAME.search(name) for name in names):
+            element.decompose()
+    paragraphs: List[str] = []
+    seen = set()
+
+    for element in root.find_all(PARAGRAPH_TAGS):
+        # Nested paragraph elements are collected on their own
+        if element.find(PARAGRAPH_TAGS):
+            continue
+
+        text = " ".join(element.get_text(" ", strip=True).split())
+        if not text or text in seen:
+            continue
+
+        if element.name not in HEADING_TAGS:
+            if len(text.split()) < min_words:
+                continue
+
+            link_text = sum(len(link.get_text(strip=True)) for link in element.find_all("a"))
+            if link_text > 0.5 * len(text):
+                continue
+
+        seen.add(text)
+        paragraphs.append(text)
+
+    return paragraphs
@@ -0,0 +1,88 @@
+"""
+GoogleIt Workspace Module
+
+This module provides the `Workspace` class, a private scratch directory for the intermediate files of a single request.
+
+`GoogleIt.get` creates a workspace for every page it renders and for the conversion of the PDF document of the query,
+and removes it when done. Concurrent requests in one process therefore never read, overwrite or delete each
+other's files.
+
+Usage:
+    - Import the module: `from GoogleIt.workspace import Workspace`
+    - Use a `Workspace` as a context manager and build file paths with `file`.
+
+Example:
+    ```python
+    with Workspace() as workspace:
+        pdf_path = workspace.file("merged.pdf")
+        ...
+    # The directory and everything in it is removed here
+    ```
+
+Classes:
+    - `Workspace(root: str | None = None)`:
+        - A temporary directory that is removed on `cleanup` or when the `with` block exits.
+        - Methods:
+            - `file(self, *names: str) -> str`: Returns the path of a file inside the workspace.
+            - `folder(self, name: str) -> str`: Creates a sub folder inside the workspace and returns its path.
+            - `cleanup(self) -> None`: Removes the workspace and all its files.
+"""
+
+
+import os
+import shutil
+import tempfile
+
+
+class Workspace:
+    """
+    A private temporary directory holding the intermediate files of one request.
+
+    Attributes:
+        path: The absolute path of the workspace directory.
+    """
+
+    def __init__(self, root: str | None = None) -> None:
+        """
+        Creates a new, empty workspace directory.
+
+        Parameters:
+            root (str | None): The directory to create the workspace in. Defaults to the system temporary directory.
+        """
+        self.path = tempfile.mkdtemp(prefix="googleit-", dir=root)
+
+    def __enter__(self) -> "Workspace":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.cleanup()
+
+    def file(self, *names: str) -> str:
+        """
+        Returns the path of a file inside the workspace. The file itself is not created.
+
+        Parameters:
+            names (str): The path components of the file, relative to the workspace.
+
+        Returns:
+            str: The absolute path of the file.
+        """
+        return os.path.join(self.path, *names)
+
+    def folder(self, name: str) -> str:
+        """
+        Creates a sub folder inside the workspace.
+
+        Parameters:
+            name (str): The name of the folder.
+
+        Returns:
+            str: The absolute path of the folder.
+        """
+        folder_path = self.file(name)
+        os.makedirs(folder_path, exist_ok=True)
+        return folder_path
+
+    def cleanup(self) -> None:
+        """Removes the workspace and all its files."""
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -0,0 +1,53 @@
+import re
+
+from GoogleIt.googleit import GoogleIt
+from GoogleIt.models import Palm2Model
+from GoogleIt.preprocessing import Preprocessor
+
+
+STOP_WORDS = ["the", "of", "in", "a", "is", "by", "and", "to", "on", "it"]
+
+QUERY = "How do chloroplasts capture light energy?"
+
+INPUT_DOC = "Chloroplasts capture light energy and store it in glucose during photosynthesis."
+
+RELEVANT = "Chloroplasts capture light energy with chlorophyll, the green pigment of photosynthesis."
+
+
+class RecordingModel(Palm2Model):
+    """A model that records the context of each query instead of calling the API."""
+
+    def init(self, api_key: str) -> None:
+        self.documents = []
+
+    def query(self, document: str, question: str) -> str:
+        self.documents.append(document)
+        return "answer"
+
+
+class WordPreprocessor(Preprocessor):
+    """Splits words with a regular expression, so the tests need no NLTK data."""
+
+    def tokenize(self, text: str) -> list[str]:
+        return re.findall(r"\w+", text.lower())
+
+
+def test_relevant_paragraph_after_budget_is_packed(tmp_path, monkeypatch):
+    # Each filler paragraph shares a term with the input document, so it passes the relevance filter
+    filler = [f"Glucose stores energy number {index} in a long sentence about nothing else." for index in range(40)]
+    paragraphs = filler + [RELEVANT]
+    pdf_path = tmp_path / "query.pdf"
+    pdf_path.write_bytes(b"%PDF-1.4")
+
+    model = RecordingModel()
+    googleit = GoogleIt(api_key="key", model=model, preprocessor=WordPreprocessor(stop_words=STOP_WORDS),
+                        context_tokens=100)
+    monkeypatch.setattr(googleit, "get_top_urls", lambda query, urls_count: (["https://example.com"], ["example.com"]))
+    monkeypatch.setattr(googleit, "fetch_paragraphs", lambda urls, domains, **kwargs: paragraphs)
+    monkeypatch.setattr(googleit, "_extract_document", lambda pdf_path, workspace=None: INPUT_DOC)
+
+    assert googleit.get(QUERY, pdf_path=str(pdf_path), urls_count=1) == "answer"
+
+    context = model.documents[0]
+    assert RELEVANT in context
+    assert len(context) < len("\n".join(paragraphs))
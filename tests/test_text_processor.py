@@ -0,0 +1,27 @@
+from GoogleIt.text_processor import extract_paragraphs_from_html
+
+
+ARTICLE = (
+    "<p>Photosynthesis turns light energy into chemical energy stored in glucose.</p>"
+    "<p>It takes place in the chloroplasts of the cells of green plants.</p>"
+)
+
+
+def test_body_with_boilerplate_class_is_kept():
+    html = (f'<html><body class="post-template has-sidebar">{ARTICLE}'
+            '<div class="sidebar"><p>Popular posts you may also like to read today.</p></div></body></html>')
+
+    assert extract_paragraphs_from_html(html) == [
+        "Photosynthesis turns light energy into chemical energy stored in glucose.",
+        "It takes place in the chloroplasts of the cells of green plants.",
+    ]
+
+
+def test_main_with_boilerplate_class_is_kept():
+    html = (f'<html><body><main class="main-content has-sidebar">{ARTICLE}'
+            '<div id="comments"><p>Great article, thanks for sharing it with us.</p></div></main></body></html>')
+
+    assert extract_paragraphs_from_html(html) == [
+        "Photosynthesis turns light energy into chemical energy stored in glucose.",
+        "It takes place in the chloroplasts of the cells of green plants.",
+    ]